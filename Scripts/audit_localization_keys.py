@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Localization Key Audit
+Cross-references Localizable.xcstrings with the keys the Swift code uses.
+
+Every Swift file is tokenized once into a key index (explicit lookups,
+SwiftUI implicit LocalizedStringKey literals, interpolated key patterns and
+plain string literals); the report is then a handful of set operations:
+
+- dead keys:      in the catalog, never referenced from Swift
+- missing keys:   looked up explicitly in Swift, absent from the catalog
+- value drift:    NSLocalizedString(value:) default differs from the catalog's English
+
+Usage:
+    python3 Scripts/audit_localization_keys.py
+    python3 Scripts/audit_localization_keys.py --json report.json
+    python3 Scripts/audit_localization_keys.py --prune   # drop dead keys before translating
+
+Exit codes:
+    0 - No missing keys or value drift
+    1 - Missing keys or value drift found
+"""
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from swift_lexer import (
+    IDENT, PUNCT, STRING, LineIndex, SwiftLexError, decode_string, replace_interpolations,
+    tokenize,
+)
+from xcstrings_catalog import DEFAULT_CATALOG, CatalogIndex
+
+ROOT = Path(__file__).parent.parent
+
+# Directories compiled into the app targets
+SOURCE_DIRS = ['Platforms', 'SharedCore', 'Shared', 'ItoriTimerWidget', 'ItoriWatch Watch App']
+
+# SwiftUI initializers and modifiers whose first string literal is a LocalizedStringKey
+IMPLICIT_KEY_CALLS = {
+    'Text', 'Button', 'Label', 'Toggle', 'Section', 'Picker', 'TextField', 'SecureField',
+    'Menu', 'Link', 'NavigationLink', 'DatePicker', 'Stepper', 'ColorPicker',
+    'LabeledContent', 'ContentUnavailableView', 'Tab',
+    'navigationTitle', 'help', 'accessibilityLabel', 'accessibilityHint', 'alert',
+    'confirmationDialog',
+}
+
+# printf-style specifiers, normalized so `Text("\(n) items")` matches "%lld items"
+FORMAT_SPECIFIER = re.compile(r"%(?:\d+\$)?[-+ #0']*\d*(?:\.\d+)?(?:hh|h|ll|l|q|z|t|j|L)?[@dDiuUxXoOfFeEgGcCsSpaA]")
+FORMAT_PLACEHOLDER = '%@'
+PATTERN_HOLE = '\x00'
+
+
+@dataclass
+class KeyReference:
+    path: str
+    line: int
+    value: Optional[str] = None
+
+
+@dataclass
+class SwiftKeyIndex:
+    explicit: Dict[str, List[KeyReference]] = field(default_factory=dict)
+    implicit: Set[str] = field(default_factory=set)
+    patterns: Set[str] = field(default_factory=set)
+    literals: Set[str] = field(default_factory=set)
+    dynamic_lookups: int = 0
+    files: int = 0
+
+    def pattern_regex(self) -> Optional['re.Pattern']:
+        """One alternation matching every interpolated key, e.g. `settings.\\(id).title`"""
+        alternatives = list(
+            '.+'.join(re.escape(part) for part in pattern.split(PATTERN_HOLE))
+            for pattern in sorted(self.patterns)
+            # A bare "\(key)" carries no literal text and would match everything
+            if pattern.replace(PATTERN_HOLE, '')
+        )
+        if not alternatives:
+            return None
+        return re.compile('|'.join(f'(?:{alt})' for alt in alternatives))
+
+
+def normalize_format(text: str) -> str:
+    return FORMAT_SPECIFIER.sub(FORMAT_PLACEHOLDER, text)
+
+
+def _token_is(tokens, i, kind, text=None) -> bool:
+    if i >= len(tokens) or tokens[i].kind != kind:
+        return False
+    return text is None or tokens[i].text == text
+
+
+def _explicit_key_index(tokens, i) -> Optional[int]:
+    """
+    Index of the key argument for explicit lookups starting at tokens[i], or -1
+    when the call takes a non-literal key. Returns None when tokens[i] is not a lookup.
+
+    NSLocalizedString("key"   String(localized: "key")   Text(localizedKey: "key")
+    LocalizationManager.string("key")
+    """
+    name = tokens[i].text
+    if name == 'NSLocalizedString' and _token_is(tokens, i + 1, PUNCT, '('):
+        arg = i + 2
+    elif name in ('String', 'Text') and _token_is(tokens, i + 1, PUNCT, '(') \
+            and _token_is(tokens, i + 2, IDENT, 'localized' if name == 'String' else 'localizedKey') \
+            and _token_is(tokens, i + 3, PUNCT, ':'):
+        arg = i + 4
+    elif name == 'LocalizationManager' and _token_is(tokens, i + 1, PUNCT, '.') \
+            and _token_is(tokens, i + 2, IDENT, 'string') and _token_is(tokens, i + 3, PUNCT, '('):
+        arg = i + 4
+    else:
+        return None
+    return arg if _token_is(tokens, arg, STRING) else -1
+
+
+def _value_argument(tokens, key_index) -> Optional[str]:
+    """The `value:` default following an NSLocalizedString key, if given as a literal"""
+    if (_token_is(tokens, key_index + 1, PUNCT, ',')
+            and _token_is(tokens, key_index + 2, IDENT, 'value')
+            and _token_is(tokens, key_index + 3, PUNCT, ':')
+            and _token_is(tokens, key_index + 4, STRING)
+            and not tokens[key_index + 4].interpolated):
+        return decode_string(tokens[key_index + 4])
+    return None
+
+
+def index_source(index: SwiftKeyIndex, content: str, path: str):
+    """Add one Swift file's key references to the index"""
+    tokens = list(tokenize(content))
+    lines = LineIndex(content)
+    explicit_literals = set()
+
+    for i, token in enumerate(tokens):
+        if token.kind == IDENT:
+            key_index = _explicit_key_index(tokens, i)
+            if key_index == -1:
+                index.dynamic_lookups += 1
+            elif key_index is not None:
+                explicit_literals.add(key_index)
+                literal = tokens[key_index]
+                if literal.interpolated:
+                    index.patterns.add(replace_interpolations(literal, PATTERN_HOLE))
+                    continue
+                ref = KeyReference(path, lines.line_of(literal.start), _value_argument(tokens, key_index))
+                index.explicit.setdefault(decode_string(literal), []).append(ref)
+            elif token.text in IMPLICIT_KEY_CALLS and _token_is(tokens, i + 1, PUNCT, '(') \
+                    and _token_is(tokens, i + 2, STRING):
+                literal = tokens[i + 2]
+                index.implicit.add(normalize_format(replace_interpolations(literal, FORMAT_PLACEHOLDER)))
+
+        elif token.kind == STRING and i not in explicit_literals:
+            # "key".localized / "key".localized(comment:)
+            if _token_is(tokens, i + 1, PUNCT, '.') and _token_is(tokens, i + 2, IDENT, 'localized'):
+                if token.interpolated:
+                    index.patterns.add(replace_interpolations(token, PATTERN_HOLE))
+                else:
+                    ref = KeyReference(path, lines.line_of(token.start))
+                    index.explicit.setdefault(decode_string(token), []).append(ref)
+            elif not token.interpolated:
+                index.literals.add(decode_string(token))
+
+
+def build_swift_key_index(paths: List[Path]) -> SwiftKeyIndex:
+    index = SwiftKeyIndex()
+    for path in paths:
+        try:
+            content = path.read_text(encoding='utf-8')
+            index_source(index, content, str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path))
+            index.files += 1
+        except (OSError, UnicodeDecodeError, SwiftLexError) as e:
+            print(f"Error scanning {path}: {e}", file=sys.stderr)
+    return index
+
+
+def find_swift_files(source_dirs: List[Path]) -> List[Path]:
+    files = []
+    for source_dir in source_dirs:
+        files.extend(sorted(source_dir.rglob('*.swift')))
+    return files
+
+
+def analyze(catalog: CatalogIndex, index: SwiftKeyIndex, keep_prefixes=()) -> Dict:
+    """Compute dead, missing and drifted keys with set operations"""
+    catalog_keys = set(catalog.values)
+
+    referenced = catalog_keys & (set(index.explicit) | index.literals)
+    unresolved = catalog_keys - referenced
+    referenced |= {k for k in unresolved if normalize_format(k) in index.implicit}
+    unresolved -= referenced
+
+    pattern = index.pattern_regex()
+    if pattern is not None:
+        referenced |= {k for k in unresolved if pattern.fullmatch(k)}
+    dead = sorted(k for k in catalog_keys - referenced if not k.startswith(tuple(keep_prefixes)))
+
+    missing = {
+        key: refs for key, refs in sorted(index.explicit.items()) if key not in catalog_keys
+    }
+
+    drift = []
+    for key, refs in sorted(index.explicit.items()):
+        if key not in catalog_keys or not catalog.has_english_unit(key):
+            continue
+        catalog_value = catalog.values[key]
+        for ref in refs:
+            if ref.value is not None and ref.value != catalog_value:
+                drift.append({
+                    'key': key,
+                    'code_value': ref.value,
+                    'catalog_value': catalog_value,
+                    'location': f"{ref.path}:{ref.line}",
+                })
+
+    return {'dead': dead, 'missing': missing, 'drift': drift}
+
+
+def print_report(report: Dict, catalog: CatalogIndex, index: SwiftKeyIndex, limit: int):
+    print("🔑 Localization Key Audit")
+    print(f"📁 {index.files} Swift files, {len(catalog)} catalog keys")
+    print(f"   {len(index.explicit)} explicit keys, {len(index.implicit)} SwiftUI literal keys, "
+          f"{len(index.patterns)} interpolated key patterns, {index.dynamic_lookups} dynamic lookups")
+    print("=" * 70)
+
+    def section(title, rows):
+        print(f"\n{title}")
+        print("-" * 70)
+        for row in rows[:limit]:
+            print(f"  {row}")
+        if len(rows) > limit:
+            print(f"  ... and {len(rows) - limit} more")
+
+    section(f"💀 Dead keys (in catalog, unused in Swift): {len(report['dead'])}",
+            [repr(k) for k in report['dead']])
+    section(f"❓ Missing keys (used in Swift, not in catalog): {len(report['missing'])}",
+            [f"{k!r}  ({refs[0].path}:{refs[0].line})" for k, refs in report['missing'].items()])
+    section(f"↔️  Value drift (value: default ≠ catalog English): {len(report['drift'])}",
+            [f"{d['key']!r}: {d['code_value']!r} vs {d['catalog_value']!r}  ({d['location']})"
+             for d in report['drift']])
+
+    if index.dynamic_lookups:
+        print(f"\n⚠️  {index.dynamic_lookups} lookups use non-literal keys; review dead keys "
+              f"(or use --keep-prefix) before pruning")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find dead, missing and drifted localization keys")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--source', type=Path, action='append',
+                        help="Swift source directory (repeatable, defaults to the app targets)")
+    parser.add_argument('--keep-prefix', action='append', default=[],
+                        help="Never report keys with this prefix as dead (repeatable)")
+    parser.add_argument('--json', type=Path, help="Write the full report as JSON")
+    parser.add_argument('--limit', type=int, default=25, help="Rows shown per section")
+    parser.add_argument('--prune', action='store_true',
+                        help="Remove dead keys from the catalog (one write)")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+
+    source_dirs = args.source or [ROOT / d for d in SOURCE_DIRS]
+    catalog = CatalogIndex.load(args.catalog)
+    index = build_swift_key_index(find_swift_files([d for d in source_dirs if d.exists()]))
+    report = analyze(catalog, index, keep_prefixes=args.keep_prefix)
+
+    print_report(report, catalog, index, args.limit)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'dead': report['dead'],
+                'missing': {k: [f"{r.path}:{r.line}" for r in refs] for k, refs in report['missing'].items()},
+                'drift': report['drift'],
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved to: {args.json}")
+
+    if args.prune and report['dead']:
+        catalog.drop(report['dead'])
+        catalog.save()
+        print(f"\n✂️  Pruned {len(report['dead'])} dead keys from {args.catalog}")
+
+    print("=" * 70)
+    return 1 if report['missing'] or report['drift'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
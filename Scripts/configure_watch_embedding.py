@@ -1,98 +1,147 @@
 #!/usr/bin/env python3
-import re
-import uuid
+"""
+Configure the watchOS companion app to be embedded in the iOS app.
+
+Edits ItoriApp.xcodeproj/project.pbxproj through the pbxproj object graph:
+- deployment targets that were bumped by mistake are reset
+- the iOS target gets an "Embed Watch Content" copy-files phase holding the
+  watch app product, and a target dependency on the watch target
+
+Every step looks for what it would add before adding it (new objects get
+UUIDs derived from stable seeds), so running the script again changes nothing.
+
+Usage:
+    python3 Scripts/configure_watch_embedding.py
+    python3 Scripts/configure_watch_embedding.py --dry-run
+"""
+
+import argparse
 import sys
+from pathlib import Path
+
+from pbxproj import PBXProject, Ref
+
+ROOT = Path(__file__).parent.parent
+PBXPROJ_PATH = ROOT / "ItoriApp.xcodeproj" / "project.pbxproj"
+
+IOS_TARGET = "Itori"
+WATCH_TARGET = "ItoriWatch Watch App"
+PHASE_NAME = "Embed Watch Content"
+WATCH_DST_PATH = "$(CONTENTS_FOLDER_PATH)/Watch"
+PRODUCTS_DIRECTORY = "16"   # dstSubfolderSpec for the products directory
+
+# Build setting -> (wrong value, fixed value)
+DEPLOYMENT_FIXES = {
+    'IPHONEOS_DEPLOYMENT_TARGET': ('26.1', '17.0'),
+    'WATCHOS_DEPLOYMENT_TARGET': ('26.0', '10.0'),
+}
+
+
+def fix_deployment_targets(project: PBXProject) -> list:
+    changes = []
+    for _, config in project.objects_of('XCBuildConfiguration'):
+        settings = config.get('buildSettings', {})
+        for key, (wrong, fixed) in DEPLOYMENT_FIXES.items():
+            if settings.get(key) == wrong:
+                settings[key] = Ref(fixed)
+                changes.append(f"{key}: {wrong} → {fixed} ({config.get('name')})")
+    return changes
+
+
+def ensure_embed_phase(project: PBXProject, ios_uuid: str, watch_uuid: str) -> list:
+    """Copy-files phase embedding the watch app product in the iOS target"""
+    changes = []
+    ios, watch = project.objects[ios_uuid], project.objects[watch_uuid]
+    product = watch['productReference']
+
+    phase_uuid = next((uuid for uuid in ios.get('buildPhases', [])
+                       if project.objects[uuid].get('isa') == 'PBXCopyFilesBuildPhase'
+                       and project.objects[uuid].get('dstPath') == WATCH_DST_PATH), None)
+    if phase_uuid is None:
+        phase_uuid = project.ensure_object(f"{ios_uuid}:{PHASE_NAME}", {
+            'isa': 'PBXCopyFilesBuildPhase',
+            'buildActionMask': Ref('2147483647'),
+            'dstPath': Ref(WATCH_DST_PATH),
+            'dstSubfolderSpec': Ref(PRODUCTS_DIRECTORY),
+            'files': [],
+            'name': Ref(PHASE_NAME),
+            'runOnlyForDeploymentPostprocessing': Ref('0'),
+        }, PHASE_NAME)
+    resources = next((uuid for uuid in ios.get('buildPhases', [])
+                      if project.objects[uuid].get('isa') == 'PBXResourcesBuildPhase'), None)
+    if project.ensure_in_list(ios, 'buildPhases', phase_uuid, after=resources):
+        changes.append(f"Added {PHASE_NAME} phase to {IOS_TARGET}")
+
+    phase = project.objects[phase_uuid]
+    if not any(project.objects[uuid].get('fileRef') == product for uuid in phase.get('files', [])):
+        product_name = project.comments.get(product, watch.get('name'))
+        build_file = project.ensure_object(f"{phase_uuid}:{product}", {
+            'isa': 'PBXBuildFile',
+            'fileRef': project.ref(product),
+            'settings': {'ATTRIBUTES': [Ref('RemoveHeadersOnCopy')]},
+        }, f"{product_name} in {PHASE_NAME}")
+        project.ensure_in_list(phase, 'files', build_file)
+        changes.append(f"Embedded {product_name} in {PHASE_NAME}")
+    return changes
+
+
+def ensure_dependency(project: PBXProject, ios_uuid: str, watch_uuid: str) -> list:
+    """Target dependency so the watch app builds before the iOS app"""
+    ios, watch = project.objects[ios_uuid], project.objects[watch_uuid]
+    if any(project.objects[uuid].get('target') == watch_uuid for uuid in ios.get('dependencies', [])):
+        return []
+    proxy = project.ensure_object(f"{ios_uuid}:{watch_uuid}:proxy", {
+        'isa': 'PBXContainerItemProxy',
+        'containerPortal': project.ref(project.data['rootObject']),
+        'proxyType': Ref('1'),
+        'remoteGlobalIDString': Ref(watch_uuid),
+        'remoteInfo': Ref(watch['name']),
+    }, 'PBXContainerItemProxy')
+    dependency = project.ensure_object(f"{ios_uuid}:{watch_uuid}:dependency", {
+        'isa': 'PBXTargetDependency',
+        'target': project.ref(watch_uuid),
+        'targetProxy': proxy,
+    }, 'PBXTargetDependency')
+    project.ensure_in_list(ios, 'dependencies', dependency)
+    return [f"Added {IOS_TARGET} → {watch['name']} target dependency"]
+
 
 def main():
-    pbxproj_path = 'ItoriApp.xcodeproj/project.pbxproj'
-    
-    with open(pbxproj_path, 'r') as f:
-        content = f.read()
-    
-    # Known UUIDs
-    IOS_TARGET_UUID = "1AD7D4332EDD328800D403F3"
-    WATCH_TARGET_UUID = "A3D4E93275A547E499CA3B3E"
-    WATCH_PRODUCT_UUID = "9BBB386A3C3046FCA7A3D6DB"
-    PROJECT_UUID = "1AD7D42C2EDD328800D403F3"
-    
-    # Generate new UUIDs
-    COPY_FILES_UUID = uuid.uuid4().hex[:24].upper()
-    TARGET_DEP_UUID = uuid.uuid4().hex[:24].upper()
-    CONTAINER_PROXY_UUID = uuid.uuid4().hex[:24].upper()
-    BUILD_FILE_UUID = uuid.uuid4().hex[:24].upper()
-    
-    # Fix 1: Deployment targets
-    content = content.replace('IPHONEOS_DEPLOYMENT_TARGET = 26.1;', 'IPHONEOS_DEPLOYMENT_TARGET = 17.0;')
-    content = content.replace('WATCHOS_DEPLOYMENT_TARGET = 26.0;', 'WATCHOS_DEPLOYMENT_TARGET = 10.0;')
-    
-    # Fix 2: Add PBXBuildFile
-    build_file = f"\t\t{BUILD_FILE_UUID} /* ItoriWatch.app in Embed Watch Content */ = {{isa = PBXBuildFile; fileRef = {WATCH_PRODUCT_UUID} /* ItoriWatch.app */; settings = {{ATTRIBUTES = (RemoveHeadersOnCopy, ); }}; }};\n"
-    content = content.replace(
-        '/* Begin PBXBuildFile section */\n',
-        f'/* Begin PBXBuildFile section */\n{build_file}'
-    )
-    
-    # Fix 3: Add PBXContainerItemProxy
-    container_proxy = f"\t\t{CONTAINER_PROXY_UUID} /* PBXContainerItemProxy */ = {{\n\t\t\tisa = PBXContainerItemProxy;\n\t\t\tcontainerPortal = {PROJECT_UUID} /* Project object */;\n\t\t\tproxyType = 1;\n\t\t\tremoteGlobalIDString = {WATCH_TARGET_UUID};\n\t\t\tremoteInfo = ItoriWatch;\n\t\t}};\n"
-    
-    if '/* Begin PBXContainerItemProxy section */' in content:
-        content = content.replace(
-            '/* Begin PBXContainerItemProxy section */\n',
-            f'/* Begin PBXContainerItemProxy section */\n{container_proxy}'
-        )
-    else:
-        content = content.replace(
-            '/* Begin PBXCopyFilesBuildPhase section */',
-            f'/* Begin PBXContainerItemProxy section */\n{container_proxy}/* End PBXContainerItemProxy section */\n\n/* Begin PBXCopyFilesBuildPhase section */'
-        )
-    
-    # Fix 4: Add PBXCopyFilesBuildPhase
-    copy_files_phase = f"\t\t{COPY_FILES_UUID} /* Embed Watch Content */ = {{\n\t\t\tisa = PBXCopyFilesBuildPhase;\n\t\t\tbuildActionMask = 2147483647;\n\t\t\tdstPath = \"$(CONTENTS_FOLDER_PATH)/Watch\";\n\t\t\tdstSubfolderSpec = 16;\n\t\t\tfiles = (\n\t\t\t\t{BUILD_FILE_UUID} /* ItoriWatch.app in Embed Watch Content */,\n\t\t\t);\n\t\t\tname = \"Embed Watch Content\";\n\t\t\trunOnlyForDeploymentPostprocessing = 0;\n\t\t}};\n"
-    
-    if '/* Begin PBXCopyFilesBuildPhase section */' in content:
-        content = content.replace(
-            '/* Begin PBXCopyFilesBuildPhase section */\n',
-            f'/* Begin PBXCopyFilesBuildPhase section */\n{copy_files_phase}'
-        )
-    else:
-        content = content.replace(
-            '/* Begin PBXFileReference section */',
-            f'/* Begin PBXCopyFilesBuildPhase section */\n{copy_files_phase}/* End PBXCopyFilesBuildPhase section */\n\n/* Begin PBXFileReference section */'
-        )
-    
-    # Fix 5: Add PBXTargetDependency
-    target_dependency = f"\t\t{TARGET_DEP_UUID} /* PBXTargetDependency */ = {{\n\t\t\tisa = PBXTargetDependency;\n\t\t\ttarget = {WATCH_TARGET_UUID} /* ItoriWatch */;\n\t\t\ttargetProxy = {CONTAINER_PROXY_UUID} /* PBXContainerItemProxy */;\n\t\t}};\n"
-    
-    if '/* Begin PBXTargetDependency section */' in content:
-        content = content.replace(
-            '/* Begin PBXTargetDependency section */\n',
-            f'/* Begin PBXTargetDependency section */\n{target_dependency}'
-        )
-    else:
-        content = content.replace(
-            '/* Begin PBXVariantGroup section */',
-            f'/* Begin PBXTargetDependency section */\n{target_dependency}/* End PBXTargetDependency section */\n\n/* Begin PBXVariantGroup section */'
-        )
-    
-    # Fix 6: Add copy files phase to iOS target buildPhases
-    ios_pattern = rf'({IOS_TARGET_UUID} /\* Itori \*/ = {{.*?buildPhases = \(.*?1AD7D4322EDD328800D403F3 /\* Resources \*/,)'
-    replacement = rf'\1\n\t\t\t\t{COPY_FILES_UUID} /* Embed Watch Content */,'
-    content = re.sub(ios_pattern, replacement, content, flags=re.DOTALL)
-    
-    # Fix 7: Add target dependency to iOS target
-    ios_dep_pattern = rf'({IOS_TARGET_UUID} /\* Itori \*/ = {{.*?dependencies = \(\s+)\);'
-    replacement = rf'\1\t\t\t\t{TARGET_DEP_UUID} /* PBXTargetDependency */,\n\t\t\t);'
-    content = re.sub(ios_dep_pattern, replacement, content, flags=re.DOTALL)
-    
-    # Write back
-    with open(pbxproj_path, 'w') as f:
-        f.write(content)
-    
-    print("✅ watchOS companion app configuration complete")
-    print(f"  • Fixed iOS deployment target: 26.1 → 17.0")
-    print(f"  • Fixed watchOS deployment target: 26.0 → 10.0")
-    print(f"  • Added embedding infrastructure")
-    print(f"  • Watch app will now be included in iOS .ipa")
+    parser = argparse.ArgumentParser(description="Embed the watchOS app in the iOS app target")
+    parser.add_argument('--project', type=Path, default=PBXPROJ_PATH, help="project.pbxproj to edit")
+    parser.add_argument('--dry-run', action='store_true', help="Report changes without writing")
+    args = parser.parse_args()
+
+    if not args.project.exists():
+        print(f"❌ File not found: {args.project}")
+        return 1
+    project = PBXProject.load(args.project)
+
+    uuids = {}
+    for name in (IOS_TARGET, WATCH_TARGET):
+        target = project.target(name)
+        if target is None:
+            print(f"❌ Target not found: {name}")
+            return 1
+        uuids[name] = project.uuid_of(target)
+    ios_uuid, watch_uuid = uuids[IOS_TARGET], uuids[WATCH_TARGET]
+
+    changes = fix_deployment_targets(project)
+    changes += ensure_embed_phase(project, ios_uuid, watch_uuid)
+    changes += ensure_dependency(project, ios_uuid, watch_uuid)
+
+    if not changes:
+        print("✅ watchOS companion app already configured; nothing to change")
+        return 0
+    if not args.dry_run:
+        project.save()
+    print("🔍 Dry run: would apply" if args.dry_run else "✅ watchOS companion app configuration complete")
+    for change in changes:
+        print(f"  • {change}")
+    if not args.dry_run:
+        print(f"  • Watch app will now be included in iOS .ipa")
+    return 0
+
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
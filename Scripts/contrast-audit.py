@@ -2,12 +2,40 @@
 """
 Contrast Audit Script for Itori
 Checks color combinations against WCAG AA standards
+
+Builds a palette from the system colors and every .colorset in the asset
+catalogs (light, dark and their high-contrast variants), indexes the
+foreground/background pairs the Swift views actually use, then composites
+each pair (including opacity) per appearance and checks the contrast ratio.
+
+Usage:
+    python3 Scripts/contrast-audit.py
+    python3 Scripts/contrast-audit.py --level AAA --json contrast.json
+    python3 Scripts/contrast-audit.py --matrix       # all palette pairs (NumPy)
+    python3 Scripts/contrast-audit.py --benchmark    # 1,000-color synthetic palette
 """
 
-import re
+import argparse
+import json
+import random
 import sys
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from swift_lexer import IDENT, NUMBER, PUNCT, STRING, LineIndex, SwiftLexError, decode_string, tokenize
+
+# NumPy is only needed for --matrix / --benchmark
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_ASSETS = [ROOT / "SharedCore" / "DesignSystem" / "Assets.xcassets"]
+DEFAULT_SOURCES = [ROOT / "Platforms", ROOT / "SharedCore"]
 
 # WCAG AA Contrast Requirements
 WCAG_AA_NORMAL = 4.5  # Normal text (< 18pt or < 14pt bold)
@@ -15,38 +43,127 @@ WCAG_AA_LARGE = 3.0   # Large text (>= 18pt or >= 14pt bold)
 WCAG_AAA_NORMAL = 7.0
 WCAG_AAA_LARGE = 4.5
 
-# Common SwiftUI colors (light mode approximations)
-SWIFTUI_COLORS = {
-    '.white': (255, 255, 255),
-    '.black': (0, 0, 0),
-    '.gray': (142, 142, 147),
-    '.red': (255, 59, 48),
-    '.orange': (255, 149, 0),
-    '.yellow': (255, 204, 0),
-    '.green': (52, 199, 89),
-    '.blue': (0, 122, 255),
-    '.purple': (175, 82, 222),
-    '.pink': (255, 45, 85),
-    '.primary': (0, 0, 0),      # Light mode
-    '.secondary': (60, 60, 67),  # Light mode
+APPEARANCES = ('light', 'dark', 'light-hc', 'dark-hc')
+
+RGB = Tuple[int, int, int]
+RGBA = Tuple[int, int, int, float]
+
+# System colors per appearance (HIG values: light, dark, light high-contrast,
+# dark high-contrast). Entries without high-contrast values reuse the base one.
+SYSTEM_COLORS: Dict[str, Dict[str, RGBA]] = {
+    'clear': {'light': (0, 0, 0, 0.0), 'dark': (0, 0, 0, 0.0)},
+    'white': {'light': (255, 255, 255, 1.0), 'dark': (255, 255, 255, 1.0)},
+    'black': {'light': (0, 0, 0, 1.0), 'dark': (0, 0, 0, 1.0)},
+    'red': {'light': (255, 59, 48, 1.0), 'dark': (255, 69, 58, 1.0),
+            'light-hc': (215, 0, 21, 1.0), 'dark-hc': (255, 105, 97, 1.0)},
+    'orange': {'light': (255, 149, 0, 1.0), 'dark': (255, 159, 10, 1.0),
+               'light-hc': (201, 52, 0, 1.0), 'dark-hc': (255, 179, 64, 1.0)},
+    'yellow': {'light': (255, 204, 0, 1.0), 'dark': (255, 214, 10, 1.0),
+               'light-hc': (178, 80, 0, 1.0), 'dark-hc': (255, 212, 38, 1.0)},
+    'green': {'light': (52, 199, 89, 1.0), 'dark': (48, 209, 88, 1.0),
+              'light-hc': (36, 138, 61, 1.0), 'dark-hc': (48, 219, 91, 1.0)},
+    'mint': {'light': (0, 199, 190, 1.0), 'dark': (99, 230, 226, 1.0),
+             'light-hc': (12, 129, 123, 1.0), 'dark-hc': (102, 212, 207, 1.0)},
+    'teal': {'light': (48, 176, 199, 1.0), 'dark': (64, 200, 224, 1.0),
+             'light-hc': (0, 130, 153, 1.0), 'dark-hc': (93, 230, 255, 1.0)},
+    'cyan': {'light': (50, 173, 230, 1.0), 'dark': (100, 210, 255, 1.0),
+             'light-hc': (0, 113, 164, 1.0), 'dark-hc': (112, 215, 255, 1.0)},
+    'blue': {'light': (0, 122, 255, 1.0), 'dark': (10, 132, 255, 1.0),
+             'light-hc': (0, 64, 221, 1.0), 'dark-hc': (64, 156, 255, 1.0)},
+    'indigo': {'light': (88, 86, 214, 1.0), 'dark': (94, 92, 230, 1.0),
+               'light-hc': (54, 52, 163, 1.0), 'dark-hc': (125, 122, 255, 1.0)},
+    'purple': {'light': (175, 82, 222, 1.0), 'dark': (191, 90, 242, 1.0),
+               'light-hc': (137, 68, 171, 1.0), 'dark-hc': (218, 143, 255, 1.0)},
+    'pink': {'light': (255, 45, 85, 1.0), 'dark': (255, 55, 95, 1.0),
+             'light-hc': (211, 15, 69, 1.0), 'dark-hc': (255, 100, 130, 1.0)},
+    'brown': {'light': (162, 132, 94, 1.0), 'dark': (172, 142, 104, 1.0),
+              'light-hc': (127, 101, 69, 1.0), 'dark-hc': (181, 148, 105, 1.0)},
+    'gray': {'light': (142, 142, 147, 1.0), 'dark': (142, 142, 147, 1.0),
+             'light-hc': (108, 108, 112, 1.0), 'dark-hc': (174, 174, 178, 1.0)},
+    # Label colors
+    'primary': {'light': (0, 0, 0, 1.0), 'dark': (255, 255, 255, 1.0)},
+    'secondary': {'light': (60, 60, 67, 0.6), 'dark': (235, 235, 245, 0.6),
+                  'light-hc': (60, 60, 67, 0.8), 'dark-hc': (235, 235, 245, 0.8)},
+    'tertiary': {'light': (60, 60, 67, 0.3), 'dark': (235, 235, 245, 0.3),
+                 'light-hc': (60, 60, 67, 0.6), 'dark-hc': (235, 235, 245, 0.6)},
+    # Backgrounds (iOS)
+    'systemBackground': {'light': (255, 255, 255, 1.0), 'dark': (0, 0, 0, 1.0)},
+    'secondarySystemBackground': {'light': (242, 242, 247, 1.0), 'dark': (28, 28, 30, 1.0),
+                                  'dark-hc': (36, 36, 38, 1.0)},
+    'tertiarySystemBackground': {'light': (255, 255, 255, 1.0), 'dark': (44, 44, 46, 1.0),
+                                 'dark-hc': (54, 54, 56, 1.0)},
+    'systemGroupedBackground': {'light': (242, 242, 247, 1.0), 'dark': (0, 0, 0, 1.0)},
+    'secondarySystemGroupedBackground': {'light': (255, 255, 255, 1.0), 'dark': (28, 28, 30, 1.0)},
+    # Backgrounds (macOS)
+    'windowBackgroundColor': {'light': (236, 236, 236, 1.0), 'dark': (50, 50, 50, 1.0)},
+    'controlBackgroundColor': {'light': (255, 255, 255, 1.0), 'dark': (30, 30, 30, 1.0)},
+    'textBackgroundColor': {'light': (255, 255, 255, 1.0), 'dark': (30, 30, 30, 1.0)},
+    'underPageBackgroundColor': {'light': (150, 150, 150, 1.0), 'dark': (40, 40, 40, 1.0)},
 }
+SYSTEM_COLORS['accentColor'] = SYSTEM_COLORS['blue']
 
-# Dark mode variants
-SWIFTUI_COLORS_DARK = {
-    '.primary': (255, 255, 255),
-    '.secondary': (235, 235, 245),
+# Repo design tokens that resolve to a system color
+COLOR_ALIASES = {
+    'accent': 'accentColor',
+    'destructive': 'red',
+    'textPrimary': 'primary',
+    'textSecondary': 'secondary',
+    'label': 'primary',
+    'secondaryLabel': 'secondary',
+    'tertiaryLabel': 'tertiary',
+    'appBackground': 'systemBackground',
+    'sidebarBackground': 'secondarySystemBackground',
+    'primaryBackground': 'windowBackgroundColor',
+    'secondaryBackground': 'controlBackgroundColor',
+    'tertiaryBackground': 'textBackgroundColor',
+    'hoverBackground': 'controlBackgroundColor',
 }
 
+DEFAULT_BACKGROUND = 'systemBackground'
+# Swift Charts marks style plot graphics, not text
+CHART_MARKS = {'AreaMark', 'BarMark', 'LineMark', 'PointMark', 'RectangleMark', 'RuleMark', 'SectorMark'}
+FOREGROUND_MODIFIERS = {'foregroundColor', 'foregroundStyle'}
+# Approximate opacity of hierarchical shape styles such as `.blue.tertiary`
+HIERARCHY_ALPHA = {'secondary': 0.6, 'tertiary': 0.3, 'quaternary': 0.18}
+# A shape's fill is the backdrop for anything in its overlay
+BACKGROUND_MODIFIERS = {'background', 'listRowBackground', 'fill'}
+# Colors inside these don't paint behind the content
+NON_FILL_MODIFIERS = {'stroke', 'strokeBorder', 'border', 'shadow', 'overlay'}
+OPENERS = {'(': ')', '{': '}', '[': ']'}
+
+
+@lru_cache(maxsize=4096)
 def relative_luminance(rgb: Tuple[int, int, int]) -> float:
-    """Calculate relative luminance per WCAG formula"""
+    """Calculate relative luminance per WCAG formula (memoized; pass tuples)"""
     r, g, b = [x / 255.0 for x in rgb]
-    
+
     def adjust(c):
         return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
-    
+
     r, g, b = adjust(r), adjust(g), adjust(b)
     return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
+# Linearized value of every whole 0-255 sRGB channel
+_LINEAR = [c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4 for c in (x / 255.0 for x in range(256))]
+
+def relative_luminances(colors: Iterable[Tuple[float, float, float]]) -> List[float]:
+    """Luminance for a batch of (possibly fractional) RGB colors in one pass"""
+    colors = list(colors)
+    if np is not None and colors:
+        return luminance_array(np.array(colors, dtype=float)).tolist()
+
+    # Without numpy: whole channels from the table, per color
+    table = _LINEAR
+
+    def channel(x):
+        # Composited channels are fractional; only whole values hit the table
+        if x == int(x):
+            return table[int(x)]
+        c = x / 255.0
+        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+    return [0.2126 * channel(r) + 0.7152 * channel(g) + 0.0722 * channel(b) for r, g, b in colors]
+
 def contrast_ratio(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -> float:
     """Calculate contrast ratio between two colors"""
     l1 = relative_luminance(color1)
@@ -55,140 +172,534 @@ def contrast_ratio(color1: Tuple[int, int, int], color2: Tuple[int, int, int]) -
     darker = min(l1, l2)
     return (lighter + 0.05) / (darker + 0.05)
 
-def check_contrast(fg: str, bg: str, context: str = "normal") -> dict:
-    """Check if contrast meets WCAG standards"""
-    if fg not in SWIFTUI_COLORS or bg not in SWIFTUI_COLORS:
-        return {'valid': None, 'ratio': None, 'message': 'Unknown color'}
-    
-    ratio = contrast_ratio(SWIFTUI_COLORS[fg], SWIFTUI_COLORS[bg])
-    required = WCAG_AA_LARGE if context == "large" else WCAG_AA_NORMAL
-    
-    return {
-        'ratio': ratio,
-        'required': required,
-        'passes_aa': ratio >= required,
-        'passes_aaa': ratio >= (WCAG_AAA_LARGE if context == "large" else WCAG_AAA_NORMAL),
-        'message': f"{ratio:.2f}:1 (need {required}:1)"
-    }
-
-def scan_file(filepath: Path) -> List[dict]:
-    """Scan a Swift file for potential contrast issues"""
-    issues = []
-    
-    try:
-        content = filepath.read_text()
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines, 1):
-            # Look for foreground + background combinations
-            # Pattern: .foregroundColor(.xxx) with .background
-            if '.foregroundColor(' in line or '.foregroundStyle(' in line:
-                for color in SWIFTUI_COLORS.keys():
-                    if color in line:
-                        # Check surrounding lines for background
-                        context = '\n'.join(lines[max(0, i-3):min(len(lines), i+3)])
-                        
-                        # Look for common problematic patterns
-                        if '.red' in line and 'opacity(0.15)' in context:
-                            issues.append({
-                                'file': str(filepath),
-                                'line': i,
-                                'issue': 'Red text on red background with low opacity',
-                                'severity': 'warning',
-                                'suggestion': 'Use higher contrast or add stroke'
-                            })
-                        
-                        if color in ['.yellow', '.pink'] and '.white' in context:
-                            issues.append({
-                                'file': str(filepath),
-                                'line': i,
-                                'issue': f'{color} on white may have insufficient contrast',
-                                'severity': 'warning',
-                                'suggestion': 'Test contrast ratio or use darker shade'
-                            })
-        
-    except Exception as e:
-        print(f"Error scanning {filepath}: {e}", file=sys.stderr)
-    
-    return issues
+def ratio_from_luminance(l1: float, l2: float) -> float:
+    return (max(l1, l2) + 0.05) / (min(l1, l2) + 0.05)
+
+def composite(fg: RGBA, bg: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """Source-over alpha compositing of fg onto an opaque bg"""
+    a = fg[3]
+    return tuple(a * f + (1 - a) * b for f, b in zip(fg[:3], bg))
+
+# MARK: - Asset catalog palette
+
+def _parse_component(value) -> float:
+    """Colorset components are 0-1 floats, 0-255 integers or 0xNN hex strings"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.lower().startswith('0x'):
+            return float(int(value, 16))
+        if '.' in value:
+            return float(value) * 255
+        return float(int(value))
+    if isinstance(value, float) and value <= 1.0:
+        return value * 255
+    return float(value)
+
+def _system_reference(reference: str) -> Optional[str]:
+    """Map e.g. `systemBlueColor` or `labelColor` onto a SYSTEM_COLORS name"""
+    name = reference[:-5] if reference.endswith('Color') else reference
+    if name.startswith('system') and name[6:7].isupper():
+        name = name[6].lower() + name[7:]
+    name = {'label': 'primary', 'secondaryLabel': 'secondary', 'tertiaryLabel': 'tertiary'}.get(name, name)
+    if name in SYSTEM_COLORS:
+        return name
+    return reference if reference in SYSTEM_COLORS else None
+
+def _appearance_of(entry: Dict) -> str:
+    appearance = 'light'
+    high_contrast = False
+    for item in entry.get('appearances', []):
+        if item.get('appearance') == 'luminosity' and item.get('value') == 'dark':
+            appearance = 'dark'
+        elif item.get('appearance') == 'contrast' and item.get('value') == 'high':
+            high_contrast = True
+    return f"{appearance}-hc" if high_contrast else appearance
+
+def fill_appearances(colors: Dict[str, RGBA]) -> Dict[str, RGBA]:
+    """Missing dark falls back to light; missing high-contrast to its base appearance"""
+    filled = dict(colors)
+    filled.setdefault('dark', filled['light'])
+    filled.setdefault('light-hc', filled['light'])
+    filled.setdefault('dark-hc', filled['dark'])
+    return filled
+
+def parse_colorset(path: Path) -> Optional[Dict[str, RGBA]]:
+    """Parse one .colorset into per-appearance RGBA values (None if it has no colors)"""
+    with open(path / "Contents.json", 'r', encoding='utf-8') as f:
+        contents = json.load(f)
+
+    colors: Dict[str, RGBA] = {}
+    for entry in contents.get('colors', []):
+        color = entry.get('color')
+        if not color:
+            continue
+        appearance = _appearance_of(entry)
+        if 'reference' in color:
+            name = _system_reference(color['reference'])
+            if name is not None:
+                colors[appearance] = fill_appearances(SYSTEM_COLORS[name])[appearance]
+            continue
+        components = color.get('components', {})
+        rgb = tuple(_parse_component(components.get(c, 0)) for c in ('red', 'green', 'blue'))
+        alpha = float(components.get('alpha', 1))
+        colors[appearance] = (*rgb, alpha)
+
+    if 'light' not in colors:
+        if 'dark' not in colors:
+            return None
+        colors['light'] = colors['dark']
+    return fill_appearances(colors)
+
+def load_palette(asset_dirs: List[Path]) -> Tuple[Dict[str, Dict[str, RGBA]], List[str]]:
+    """System colors plus every colorset (keyed `asset:Name`); returns (palette, empty colorsets)"""
+    palette = {name: fill_appearances(values) for name, values in SYSTEM_COLORS.items()}
+    empty = []
+    for asset_dir in asset_dirs:
+        for colorset in sorted(asset_dir.rglob('*.colorset')):
+            colors = parse_colorset(colorset)
+            if colors is None and colorset.stem == 'AccentColor':
+                # An AccentColor without components is the system accent
+                colors = palette['accentColor']
+            if colors is None:
+                empty.append(str(colorset))
+                continue
+            palette[f"asset:{colorset.stem}"] = colors
+    return palette, empty
+
+# MARK: - Swift source index
+
+@dataclass(frozen=True)
+class ColorRef:
+    key: str
+    alpha: float = 1.0
+
+@dataclass
+class Chain:
+    """A view expression and the modifiers applied to it"""
+    start: int
+    end: int
+    line: int
+    base: str
+    foregrounds: List[ColorRef] = field(default_factory=list)
+    backgrounds: List[ColorRef] = field(default_factory=list)
+    # A background modifier was applied, even if its color could not be resolved
+    # (materials, variables); such views are not paired with outer backgrounds
+    has_background: bool = False
+
+@dataclass
+class UsagePair:
+    foreground: ColorRef
+    background: ColorRef
+    implicit_background: bool
+    locations: List[str] = field(default_factory=list)
+
+def _match_brackets(tokens) -> Dict[int, int]:
+    match = {}
+    stack = []
+    for i, token in enumerate(tokens):
+        if token.kind != PUNCT:
+            continue
+        if token.text in OPENERS:
+            stack.append(i)
+        elif token.text in (')', '}', ']') and stack:
+            match[stack.pop()] = i
+    return match
+
+def _resolve_name(name: str, palette) -> Optional[str]:
+    name = COLOR_ALIASES.get(name, name)
+    return name if name in palette else None
+
+def _trailing_opacity(tokens, i, match) -> Tuple[Optional[float], int]:
+    """
+    Read `.opacity(0.15)` or a hierarchical level (`.blue.tertiary`) right after
+    a color; returns (alpha, next index). Alpha is None when the opacity is not
+    a literal (e.g. `.opacity(opacity)`).
+    """
+    if i + 1 < len(tokens) and tokens[i].text == '.' and tokens[i + 1].text in HIERARCHY_ALPHA \
+            and not (i + 2 < len(tokens) and tokens[i + 2].text == '('):
+        return HIERARCHY_ALPHA[tokens[i + 1].text], i + 2
+    if i + 2 < len(tokens) and tokens[i].text == '.' and tokens[i + 1].text == 'opacity' \
+            and tokens[i + 2].text == '(':
+        close = match.get(i + 2, i + 3)
+        if close == i + 4 and tokens[i + 3].kind == NUMBER:
+            try:
+                return float(tokens[i + 3].text), close + 1
+            except ValueError:
+                pass
+        return None, close + 1
+    return 1.0, i
+
+def resolve_colors(tokens, lo, hi, match, palette, missing_assets) -> List[ColorRef]:
+    """Every color expression in tokens[lo:hi], e.g. both branches of a ternary"""
+    refs = []
+    i = lo
+    while i < hi:
+        token = tokens[i]
+        key = None
+        end = i + 1
+        if token.kind == PUNCT and token.text == '(' and (i == 0 or tokens[i - 1].kind != IDENT):
+            # Grouping such as `(isCorrect ? Color.green : .red).opacity(0.1)`
+            close = match.get(i, hi)
+            inner = resolve_colors(tokens, i + 1, close, match, palette, missing_assets)
+            alpha, end = _trailing_opacity(tokens, close + 1, match)
+            if alpha is not None:
+                refs.extend(ColorRef(r.key, r.alpha * alpha) for r in inner)
+            i = max(end, close + 1)
+            continue
+        if token.kind == PUNCT and token.text == '.' and i + 2 < hi \
+                and tokens[i + 1].text in NON_FILL_MODIFIERS and tokens[i + 2].text in ('(', '{'):
+            i = match.get(i + 2, hi) + 1
+            continue
+        if token.kind == IDENT and token.text == 'Color' and i + 1 < hi:
+            nxt = tokens[i + 1]
+            if nxt.text == '(' and i + 2 < hi:
+                close = match.get(i + 1, hi)
+                if tokens[i + 2].kind == STRING:
+                    name = decode_string(tokens[i + 2])
+                    key = f"asset:{name}"
+                    if key not in palette:
+                        missing_assets.add(name)
+                        key = None
+                else:
+                    # Color(nsColor: .windowBackgroundColor), Color(UIColor.systemGroupedBackground)
+                    for j in range(i + 2, close):
+                        if tokens[j].kind == IDENT and tokens[j - 1].text == '.':
+                            key = _resolve_name(tokens[j].text, palette)
+                            if key:
+                                break
+                end = close + 1
+            elif nxt.text == '.' and i + 2 < hi and tokens[i + 2].kind == IDENT:
+                key = _resolve_name(tokens[i + 2].text, palette)
+                end = i + 3
+        elif token.kind == PUNCT and token.text == '.' and i + 1 < hi and tokens[i + 1].kind == IDENT \
+                and not (i + 2 < hi and tokens[i + 2].text == '('):
+            key = _resolve_name(tokens[i + 1].text, palette)
+            end = i + 2
+
+        if key is not None:
+            alpha, end = _trailing_opacity(tokens, end, match)
+            if alpha is not None:
+                refs.append(ColorRef(key, alpha))
+        i = end
+    return refs
+
+def index_chains(content: str, palette, missing_assets) -> List[Chain]:
+    """Collect view expressions with the colors of their foreground/background modifiers"""
+    tokens = list(tokenize(content))
+    match = _match_brackets(tokens)
+    lines = LineIndex(content)
+    chains: List[Chain] = []
+    frames: List[Optional[Chain]] = [None]
+
+    for i, token in enumerate(tokens):
+        current = frames[-1]
+        if current is not None:
+            current.end = i
+
+        if token.kind == PUNCT and token.text in OPENERS:
+            frames.append(None)
+            continue
+        if token.kind == PUNCT and token.text in (')', '}', ']'):
+            if len(frames) > 1:
+                frames.pop()
+            if frames[-1] is not None:
+                frames[-1].end = i
+            continue
+
+        after_dot = i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].text == '.'
+        if token.kind == IDENT and not after_dot:
+            chain = Chain(start=i, end=i, line=lines.line_of(token.start), base=token.text)
+            chains.append(chain)
+            frames[-1] = chain
+        elif token.kind == IDENT and current is not None and i + 1 < len(tokens) \
+                and tokens[i + 1].text in ('(', '{'):
+            modifier = token.text
+            if modifier in FOREGROUND_MODIFIERS or modifier in BACKGROUND_MODIFIERS:
+                close = match.get(i + 1, i + 1)
+                refs = resolve_colors(tokens, i + 2, close, match, palette, missing_assets)
+                if modifier in FOREGROUND_MODIFIERS:
+                    current.foregrounds.extend(refs)
+                else:
+                    current.backgrounds.extend(refs)
+                    current.has_background = True
+
+    return chains
+
+def collect_pairs(chains: List[Chain], path: str, pairs: Dict[Tuple, UsagePair]):
+    """
+    Pair each foreground with its own background or the nearest enclosing one.
+    Views behind an unresolvable background (materials, variables) are skipped.
+    """
+    with_background = sorted((c for c in chains if c.has_background), key=lambda c: c.start)
+    default = ColorRef(DEFAULT_BACKGROUND)
+
+    for chain in chains:
+        if not chain.foregrounds or chain.base in CHART_MARKS:
+            continue
+        backgrounds = chain.backgrounds
+        implicit = False
+        if not chain.has_background:
+            enclosing = [c for c in with_background if c.start < chain.start and c.end >= chain.end]
+            if enclosing:
+                backgrounds = enclosing[-1].backgrounds
+            else:
+                backgrounds = [default]
+                implicit = True
+        for fg in chain.foregrounds:
+            for bg in backgrounds:
+                pair = pairs.setdefault((fg, bg), UsagePair(fg, bg, implicit))
+                pair.locations.append(f"{path}:{chain.line}")
+
+def build_source_index(source_dirs: List[Path], palette) -> Tuple[Dict[Tuple, UsagePair], set]:
+    pairs: Dict[Tuple, UsagePair] = {}
+    missing_assets = set()
+    for source_dir in source_dirs:
+        for filepath in sorted(source_dir.rglob('*.swift')):
+            try:
+                chains = index_chains(filepath.read_text(encoding='utf-8'), palette, missing_assets)
+            except (OSError, UnicodeDecodeError, SwiftLexError) as e:
+                print(f"Error scanning {filepath}: {e}", file=sys.stderr)
+                continue
+            rel = filepath.relative_to(ROOT) if filepath.is_relative_to(ROOT) else filepath
+            collect_pairs(chains, str(rel), pairs)
+    return pairs, missing_assets
+
+# MARK: - Evaluation
+
+def evaluate_pairs(pairs: List[UsagePair], palette) -> List[Dict]:
+    """Composite every pair per appearance, then compute all luminances in one batch"""
+    composited = []
+    for pair in pairs:
+        fg_values = palette[pair.foreground.key]
+        bg_values = palette[pair.background.key]
+        base_values = palette[DEFAULT_BACKGROUND]
+        for appearance in APPEARANCES:
+            fg_r, fg_g, fg_b, fg_a = fg_values[appearance]
+            bg_r, bg_g, bg_b, bg_a = bg_values[appearance]
+            base = base_values[appearance][:3]
+            bg = composite((bg_r, bg_g, bg_b, bg_a * pair.background.alpha), base)
+            fg = composite((fg_r, fg_g, fg_b, fg_a * pair.foreground.alpha), bg)
+            composited.append((fg, bg))
+
+    luminances = relative_luminances(c for fg_bg in composited for c in fg_bg)
+
+    results = []
+    for idx, pair in enumerate(pairs):
+        ratios = {}
+        for offset, appearance in enumerate(APPEARANCES):
+            k = 2 * (idx * len(APPEARANCES) + offset)
+            ratios[appearance] = ratio_from_luminance(luminances[k], luminances[k + 1])
+        results.append({'pair': pair, 'ratios': ratios})
+    return results
+
+# MARK: - Palette matrix
+
+def luminance_array(rgb: 'np.ndarray') -> 'np.ndarray':
+    """WCAG luminance of an (..., 3) array of 0-255 channels"""
+    c = rgb / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+def contrast_matrix(fg: 'np.ndarray', bg: 'np.ndarray') -> 'np.ndarray':
+    """
+    Full contrast-ratio matrix for fg (n, 4) RGBA over opaque bg (m, 3) RGB.
+    Opaque palettes need one luminance per color and an outer max/min; any
+    translucent foreground is composited over every background by broadcasting.
+    """
+    bg_lum = luminance_array(bg)
+    alpha = fg[:, 3]
+    if np.all(alpha >= 1.0):
+        fg_lum = luminance_array(fg[:, :3])[:, None]
+    else:
+        a = alpha[:, None, None]
+        fg_lum = luminance_array(a * fg[:, None, :3] + (1 - a) * bg[None, :, :])
+    lighter = np.maximum(fg_lum, bg_lum[None, :])
+    darker = np.minimum(fg_lum, bg_lum[None, :])
+    return (lighter + 0.05) / (darker + 0.05)
+
+def palette_arrays(palette, appearance: str) -> Tuple[List[List[str]], 'np.ndarray', 'np.ndarray']:
+    """
+    Distinct visible colors of one appearance: names with the same RGBA (aliases
+    such as accentColor / blue / Color("AccentColor")) form one entry and fully
+    transparent colors are dropped, so no pair compares a color with itself.
+    Returns (names per entry, RGBA foregrounds, backgrounds composited over the
+    default background).
+    """
+    groups: Dict[Tuple, List[str]] = {}
+    for name in sorted(palette):
+        rgba = tuple(palette[name][appearance])
+        if rgba[3] > 0:
+            groups.setdefault(rgba, []).append(name)
+    names = list(groups.values())
+    fg = np.array(list(groups), dtype=float)
+    base = np.array(palette[DEFAULT_BACKGROUND][appearance][:3], dtype=float)
+    a = fg[:, 3:4]
+    bg = a * fg[:, :3] + (1 - a) * base
+    return names, fg, bg
+
+def worst_pairs(ratios: 'np.ndarray', count: int, exclude_diagonal: bool = True) -> List[Tuple[int, int, float]]:
+    """Indices of the `count` lowest-contrast (fg, bg) cells, worst first"""
+    ranked = ratios.copy()
+    if exclude_diagonal and ranked.shape[0] == ranked.shape[1]:
+        np.fill_diagonal(ranked, np.inf)
+    flat = ranked.ravel()
+    count = min(count, flat.size)
+    candidates = np.argpartition(flat, count - 1)[:count]
+    candidates = candidates[np.argsort(flat[candidates], kind='stable')]
+    cols = ranked.shape[1]
+    return [(int(i // cols), int(i % cols), float(flat[i])) for i in candidates if np.isfinite(flat[i])]
+
+def run_matrix(palette, required: float, aaa_required: float, limit: int):
+    """All-pairs audit of the palette for every appearance"""
+    print(f"\n🧮 Palette matrix: {len(palette)} colors × {len(APPEARANCES)} appearances "
+          f"(aliases merged, transparent colors skipped)")
+    print("-" * 60)
+
+    def label(group: List[str]) -> str:
+        aliases = f" (= {', '.join(describe(ColorRef(n)) for n in group[1:])})" if len(group) > 1 else ""
+        return describe(ColorRef(group[0])) + aliases
+
+    for appearance in APPEARANCES:
+        names, fg, bg = palette_arrays(palette, appearance)
+        ratios = contrast_matrix(fg, bg)
+        off_diagonal = ~np.eye(len(names), dtype=bool)
+        aa_mask = (ratios >= required) & off_diagonal
+        aaa_mask = (ratios >= aaa_required) & off_diagonal
+        total = int(off_diagonal.sum())
+        print(f"\n{appearance}: {len(names)} distinct colors, "
+              f"AA {int(aa_mask.sum())}/{total} pass, AAA {int(aaa_mask.sum())}/{total} pass")
+        # Between opaque colors the ratio is symmetric: show each pair once
+        shown = set()
+        for i, j, ratio in worst_pairs(ratios, 2 * limit):
+            if len(shown) == limit:
+                break
+            if fg[i, 3] >= 1 and fg[j, 3] >= 1:
+                if (j, i) in shown:
+                    continue
+            shown.add((i, j))
+            print(f"  {ratio:5.2f}:1  {label(names[i])} on {label(names[j])}")
+
+def run_benchmark(size: int, seed: int = 1234):
+    """Time the broadcast matrix against per-pair Python calls on a synthetic palette"""
+    rng = random.Random(seed)
+    colors = [tuple(rng.randrange(256) for _ in range(3)) for _ in range(size)]
+    print(f"\n⏱  Benchmark: {size} synthetic colors → {size * size:,} pairs (seed {seed})")
+
+    start = time.perf_counter()
+    rgb = np.array(colors, dtype=float)
+    fg = np.hstack([rgb, np.ones((size, 1))])
+    ratios = contrast_matrix(fg, rgb)
+    aa_mask = ratios >= WCAG_AA_NORMAL
+    worst = worst_pairs(ratios, 10)
+    matrix_time = time.perf_counter() - start
+    print(f"  NumPy matrix:        {matrix_time * 1000:8.1f} ms  ({int(aa_mask.sum()):,} AA passes)")
+
+    relative_luminance.cache_clear()
+    start = time.perf_counter()
+    python_ratios = [[contrast_ratio(a, b) for b in colors] for a in colors]
+    python_time = time.perf_counter() - start
+    print(f"  Python pairwise:     {python_time * 1000:8.1f} ms  (memoized luminance)")
+    print(f"  Speedup:             {python_time / matrix_time:8.1f}×")
+
+    i, j, ratio = worst[0]
+    assert abs(python_ratios[i][j] - ratio) < 1e-9, "matrix and pairwise results disagree"
+
+def describe(ref: ColorRef) -> str:
+    name = ref.key[6:] if ref.key.startswith('asset:') else ref.key
+    name = f'Color("{name}")' if ref.key.startswith('asset:') else f".{name}"
+    return f"{name}.opacity({ref.alpha:g})" if ref.alpha < 1 else name
 
 def main():
+    parser = argparse.ArgumentParser(description="WCAG contrast audit over asset colors and Swift usage")
+    parser.add_argument('--assets', type=Path, action='append', help="Asset catalog (repeatable)")
+    parser.add_argument('--source', type=Path, action='append', help="Swift source directory (repeatable)")
+    parser.add_argument('--level', choices=('AA', 'AAA'), default='AA')
+    parser.add_argument('--large', action='store_true', help="Use large-text thresholds")
+    parser.add_argument('--limit', type=int, default=20, help="Failing pairs shown")
+    parser.add_argument('--json', type=Path, help="Write all evaluated pairs as JSON")
+    parser.add_argument('--matrix', action='store_true',
+                        help="All-pairs palette matrix with AA/AAA masks and worst pairs (needs NumPy)")
+    parser.add_argument('--benchmark', type=int, nargs='?', const=1000, metavar='COLORS',
+                        help="Benchmark the matrix on a synthetic palette (default 1000 colors, needs NumPy)")
+    args = parser.parse_args()
+
+    if args.level == 'AA':
+        required = WCAG_AA_LARGE if args.large else WCAG_AA_NORMAL
+    else:
+        required = WCAG_AAA_LARGE if args.large else WCAG_AAA_NORMAL
+    aaa_required = WCAG_AAA_LARGE if args.large else WCAG_AAA_NORMAL
+
+    if (args.matrix or args.benchmark) and np is None:
+        print("❌ Install: pip install numpy")
+        return 1
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return 0
+
     print("🎨 Running Contrast Audit for Itori\n")
     print("=" * 60)
-    
-    # Common color combinations to check
-    print("\n📊 Common Color Combinations:")
-    print("-" * 60)
-    
-    combinations = [
-        (('.white', '.black'), 'normal'),
-        (('.black', '.white'), 'normal'),
-        (('.blue', '.white'), 'normal'),
-        (('.red', '.white'), 'normal'),
-        (('.green', '.white'), 'normal'),
-        (('.orange', '.white'), 'normal'),
-        (('.purple', '.white'), 'normal'),
-        (('.yellow', '.white'), 'normal'),
-        (('.pink', '.white'), 'normal'),
-        (('.gray', '.white'), 'normal'),
-        (('.secondary', '.white'), 'normal'),
-        (('.white', '.blue'), 'normal'),
-        (('.white', '.red'), 'normal'),
-        (('.white', '.green'), 'normal'),
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for (fg, bg), context in combinations:
-        result = check_contrast(fg, bg, context)
-        status = "✅" if result['passes_aa'] else "❌"
-        aaa_status = " (AAA ✅)" if result['passes_aaa'] else " (AAA ❌)" if result['passes_aa'] else ""
-        
-        print(f"{status} {fg:12} on {bg:12} → {result['message']}{aaa_status}")
-        
-        if result['passes_aa']:
-            passed += 1
-        else:
-            failed += 1
-    
-    print("\n" + "=" * 60)
-    print(f"Summary: {passed} passed, {failed} failed")
-    
-    # Scan iOS files for potential issues
-    print("\n🔍 Scanning iOS files for potential contrast issues...")
+
+    palette, empty_colorsets = load_palette([p for p in (args.assets or DEFAULT_ASSETS) if p.exists()])
+    assets = sorted(k[6:] for k in palette if k.startswith('asset:'))
+    print(f"\n📊 Palette: {len(SYSTEM_COLORS)} system colors, {len(assets)} asset colors "
+          f"× {len(APPEARANCES)} appearances")
+    for colorset in empty_colorsets:
+        print(f"   ⚠️  No color values in {colorset}")
+
+    if args.matrix:
+        run_matrix(palette, required, aaa_required, args.limit)
+        return 0
+
+    print("\n🔍 Indexing foreground/background pairs in Swift sources...")
     print("-" * 60)
-    
-    ios_path = Path("Platforms/iOS")
-    all_issues = []
-    
-    if ios_path.exists():
-        swift_files = list(ios_path.rglob("*.swift"))
-        for filepath in swift_files:
-            issues = scan_file(filepath)
-            all_issues.extend(issues)
-        
-        if all_issues:
-            print(f"\n⚠️  Found {len(all_issues)} potential issues:\n")
-            for issue in all_issues:
-                print(f"  {issue['file']}:{issue['line']}")
-                print(f"    Issue: {issue['issue']}")
-                print(f"    Suggestion: {issue['suggestion']}\n")
-        else:
-            print("✅ No obvious contrast issues found in code")
-    
+    pairs, missing_assets = build_source_index([p for p in (args.source or DEFAULT_SOURCES) if p.exists()], palette)
+    results = evaluate_pairs(list(pairs.values()), palette)
+    print(f"Found {len(results)} distinct color pairs "
+          f"({sum(len(p.locations) for p in pairs.values())} usages)")
+    for name in sorted(missing_assets):
+        print(f"   ⚠️  Color(\"{name}\") is used but no {name}.colorset exists")
+
+    failing = [r for r in results if min(r['ratios'].values()) < required]
+    failing.sort(key=lambda r: (min(r['ratios'].values()), -len(r['pair'].locations)))
+    explicit = [r for r in failing if not r['pair'].implicit_background]
+    assumed = [r for r in failing if r['pair'].implicit_background]
+    threshold = f"{required}:1 ({args.level}{' large' if args.large else ''})"
+
+    def report(title, rows):
+        print(f"\n{title}\n")
+        for result in rows[:args.limit]:
+            pair = result['pair']
+            ratios = "  ".join(f"{a}={r:.2f}" for a, r in result['ratios'].items())
+            print(f"  {describe(pair.foreground)} on {describe(pair.background)}")
+            print(f"    {ratios}")
+            print(f"    {len(pair.locations)} usages, e.g. {pair.locations[0]}\n")
+        if len(rows) > args.limit:
+            print(f"  ... and {len(rows) - args.limit} more")
+
+    report(f"❌ {len(explicit)} pairs below {threshold} in at least one appearance", explicit)
+    report(f"⚠️  {len(assumed)} foregrounds below {threshold} against the default background "
+           f"(no background modifier found; may sit on a fill or button)", assumed)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([{
+                'foreground': describe(r['pair'].foreground),
+                'background': describe(r['pair'].background),
+                'implicit_background': r['pair'].implicit_background,
+                'ratios': {a: round(v, 3) for a, v in r['ratios'].items()},
+                'locations': r['pair'].locations,
+            } for r in results], f, indent=2)
+        print(f"💾 Results saved to: {args.json}")
+
     print("\n" + "=" * 60)
+    print(f"Summary: {len(results) - len(failing)} passed, {len(explicit)} failed, "
+          f"{len(assumed)} to verify against their real background")
     print("\n📋 Recommendations:\n")
     print("1. Use Xcode Accessibility Inspector to verify contrast ratios")
-    print("2. Test in both Light and Dark modes")
-    print("3. Test with Increase Contrast enabled")
-    print("4. Use semantic colors (.primary, .secondary) when possible")
-    print("5. Avoid pure yellow or pink on white backgrounds")
-    print("\n✨ Manual Testing Required:")
-    print("   Settings → Accessibility → Display & Text Size → Increase Contrast")
-    print("   Verify all UI elements remain visible and readable")
-    
-    return 0 if failed == 0 else 1
+    print("2. Materials and dynamic colors are not evaluated; check them manually")
+    print("3. Prefer semantic colors (.primary, .secondary) over tinted text on tinted fills")
+
+    return 0 if not explicit else 1
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -3,102 +3,181 @@
 Generate placeholder AppIcon images for macOS Itori app.
 Requires: Pillow (PIL)
 Install with: pip3 install Pillow
+
+One 1024px master is rendered (gradient, rounded-corner mask, 'R' letter) and
+every size is downsampled from it with Lanczos, each level from the next
+larger one (1024 -> 512 -> ... -> 16, so no resize reads more pixels than
+needed); each distinct size is PNG-encoded once, in parallel, and Contents.json is written
+alongside. Pass --master to resample an existing 1024px design instead
+of the placeholder.
+
+Usage:
+    python3 Scripts/generate_appicons.py
+    python3 Scripts/generate_appicons.py --icon-dir path/to/AppIcon.appiconset
+    python3 Scripts/generate_appicons.py --master Design/icon-1024.png
 """
 
-from PIL import Image, ImageDraw, ImageFont
+import argparse
+import io
+import json
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+# NumPy is optional; the gradient falls back to stretching a one-pixel column
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = Path(__file__).parent.parent
+ICON_DIR = ROOT / "SharedCore" / "DesignSystem" / "Assets.xcassets" / "AppIcon.appiconset"
+MASTER_SIZE = 1024
+# Corner mask is drawn this many times larger and downsampled, for smooth edges
+MASK_SUPERSAMPLE = 2
+
+# Define all required sizes: (point size, scale) -> AppIcon-<points>[@2x].png
+SLOTS = [(16, 1), (16, 2), (32, 1), (32, 2), (128, 1), (128, 2), (256, 1), (256, 2), (512, 1), (512, 2)]
+SIZES = {f"AppIcon-{points}{'@2x' if scale == 2 else ''}.png": points * scale for points, scale in SLOTS}
 
-ICON_DIR = "/workspaces/Itori/SharedCore/DesignSystem/Assets.xcassets/AppIcon.appiconset"
-
-# Define all required sizes
-SIZES = {
-    "AppIcon-16.png": 16,
-    "AppIcon-16@2x.png": 32,
-    "AppIcon-32.png": 32,
-    "AppIcon-32@2x.png": 64,
-    "AppIcon-128.png": 128,
-    "AppIcon-128@2x.png": 256,
-    "AppIcon-256.png": 256,
-    "AppIcon-256@2x.png": 512,
-    "AppIcon-512.png": 512,
-    "AppIcon-512@2x.png": 1024,
-}
-
-def create_icon(size, filename):
-    """Create a placeholder icon with gradient and 'R' letter"""
-    # Create image with gradient background
-    img = Image.new('RGB', (size, size))
-    draw = ImageDraw.Draw(img)
-    
-    # Draw gradient (simple two-color)
-    for y in range(size):
-        # Interpolate between two colors
-        r = int(74 + (123 - 74) * y / size)
-        g = int(144 + (104 - 144) * y / size)
-        b = int(226 + (238 - 226) * y / size)
-        draw.line([(0, y), (size, y)], fill=(r, g, b))
-    
-    # Draw rounded rectangle for modern look
-    corner_radius = size // 8
-    mask = Image.new('L', (size, size), 0)
-    mask_draw = ImageDraw.Draw(mask)
-    mask_draw.rounded_rectangle([(0, 0), (size, size)], corner_radius, fill=255)
-    
-    # Apply rounded corners
-    rounded_img = Image.new('RGB', (size, size), (255, 255, 255))
-    rounded_img.paste(img, (0, 0))
-    
-    # Try to add text 'R' if size is large enough
-    if size >= 64:
+TOP_COLOR = (74, 144, 226)
+BOTTOM_COLOR = (123, 104, 238)
+FONT_CANDIDATES = (
+    "/System/Library/Fonts/SFNS.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
+
+
+def gradient(size: int, top=TOP_COLOR, bottom=BOTTOM_COLOR) -> Image.Image:
+    """Vertical two-color gradient, computed for the whole image at once"""
+    if np is not None:
+        t = (np.arange(size, dtype=np.float64) / size)[:, None]
+        rows = np.array(top, dtype=np.float64) + (np.array(bottom) - np.array(top)) * t
+        pixels = np.broadcast_to(rows.astype(np.uint8)[:, None, :], (size, size, 3))
+        return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+    column = Image.new('RGB', (1, size))
+    column.putdata([tuple(int(a + (b - a) * y / size) for a, b in zip(top, bottom)) for y in range(size)])
+    return column.resize((size, size), Image.NEAREST)
+
+
+def rounded_mask(size: int) -> Image.Image:
+    """Anti-aliased rounded-corner alpha mask (corner radius size/8)"""
+    big = size * MASK_SUPERSAMPLE
+    mask = Image.new('L', (big, big), 0)
+    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), (big - 1, big - 1)], big // 8, fill=255)
+    return mask.resize((size, size), Image.LANCZOS)
+
+
+def load_font(size: int, font_path=None):
+    for path in ([font_path] if font_path else FONT_CANDIDATES):
         try:
-            font_size = size // 2
-            # Try to use a system font, fallback to default if not available
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
-            
-            text = "R"
-            # Get text bounding box
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            # Center the text
-            text_x = (size - text_width) // 2
-            text_y = (size - text_height) // 2 - font_size // 8
-            
-            draw = ImageDraw.Draw(rounded_img)
-            draw.text((text_x, text_y), text, fill=(255, 255, 255), font=font)
-        except Exception as e:
-            print(f"Could not add text to icon: {e}")
-    
-    # Save the icon
-    output_path = os.path.join(ICON_DIR, filename)
-    rounded_img.save(output_path, 'PNG')
-    print(f"Generated: {filename} ({size}x{size})")
+            return ImageFont.truetype(str(path), size)
+        except OSError:
+            continue
+    print("⚠️  No TrueType font found; using Pillow's default font")
+    return ImageFont.load_default()
+
+
+def render_master(size: int = MASTER_SIZE, text: str = "R", font_path=None) -> Image.Image:
+    """Create the placeholder master: gradient, centered letter, rounded corners"""
+    img = gradient(size)
+    if text:
+        font = load_font(size // 2, font_path)
+        draw = ImageDraw.Draw(img)
+        # Center the text's ink box
+        bbox = draw.textbbox((0, 0), text, font=font)
+        text_x = (size - (bbox[2] - bbox[0])) // 2 - bbox[0]
+        text_y = (size - (bbox[3] - bbox[1])) // 2 - bbox[1]
+        draw.text((text_x, text_y), text, fill=(255, 255, 255), font=font)
+    img.putalpha(rounded_mask(size))
+    return img
+
+
+def downsample(master: Image.Image, sizes) -> dict:
+    """Every size from the master, largest first, each resized from the previous level"""
+    levels = {}
+    current = master
+    for size in sorted(set(sizes), reverse=True):
+        if current.width != size:
+            current = current.resize((size, size), Image.LANCZOS)
+        levels[size] = current
+    return levels
+
+
+def encode_png(icon: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    icon.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def write_contents(icon_dir: Path) -> Path:
+    """Contents.json listing every generated size for the mac idiom"""
+    contents = {
+        "images": [
+            {"filename": filename, "idiom": "mac", "scale": f"{scale}x", "size": f"{points}x{points}"}
+            for (points, scale), filename in zip(SLOTS, SIZES)
+        ],
+        "info": {"author": "xcode", "version": 1},
+    }
+    path = icon_dir / "Contents.json"
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(contents, f, indent=2)
+        f.write("\n")
+    return path
+
 
 def main():
     """Generate all icon sizes"""
-    print("Generating AppIcon placeholder images...")
-    
-    # Check if directory exists
-    if not os.path.exists(ICON_DIR):
-        print(f"Error: Directory not found: {ICON_DIR}")
-        return
-    
-    # Generate each size
+    parser = argparse.ArgumentParser(description="Generate AppIcon sizes and Contents.json from one master")
+    parser.add_argument('--icon-dir', type=Path, default=ICON_DIR, help="AppIcon.appiconset to write")
+    parser.add_argument('--master', type=Path, help="Existing square master image (default: render a placeholder)")
+    parser.add_argument('--text', default="R", help="Placeholder letter ('' for none)")
+    parser.add_argument('--font', type=Path, help="TrueType font for the placeholder letter")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 4, help="Parallel PNG encoders")
+    args = parser.parse_args()
+
+    icon_dir = args.icon_dir
+    # The icon set itself may be new; its asset catalog must exist
+    if not icon_dir.parent.exists():
+        print(f"❌ Directory not found: {icon_dir.parent}")
+        return 1
+    icon_dir.mkdir(exist_ok=True)
+
+    if args.master:
+        print(f"Resampling AppIcon images from {args.master}...")
+        master = Image.open(args.master).convert('RGBA')
+        if master.width != master.height or master.width < MASTER_SIZE:
+            print(f"❌ Master must be square and at least {MASTER_SIZE}px (got {master.width}x{master.height})")
+            return 1
+    else:
+        print("Generating AppIcon placeholder images...")
+        master = render_master(MASTER_SIZE, args.text, args.font)
+
+    # Generate each size from the master; Pillow releases the GIL while encoding.
+    # Sizes shared by two slots (e.g. 32 and 16@2x) are encoded once
+    levels = downsample(master, SIZES.values())
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        encoded = dict(zip(levels, pool.map(encode_png, levels.values())))
     for filename, size in SIZES.items():
-        create_icon(size, filename)
-    
+        (icon_dir / filename).write_bytes(encoded[size])
+        print(f"Generated: {filename} ({size}x{size})")
+    print(f"Generated: {write_contents(icon_dir).name}")
+
     # Remove old iPhone icon if it exists
-    old_icon = os.path.join(ICON_DIR, "AppIcon-20x20.png")
-    if os.path.exists(old_icon):
-        os.remove(old_icon)
+    old_icon = icon_dir / "AppIcon-20x20.png"
+    if old_icon.exists():
+        old_icon.unlink()
         print(f"Removed: AppIcon-20x20.png")
-    
+
     print("\nAppIcon generation complete!")
-    print("Note: These are placeholder icons. Replace with professionally designed icons for production.")
+    if not args.master:
+        print("Note: These are placeholder icons. Replace with professionally designed icons for production.")
+    return 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
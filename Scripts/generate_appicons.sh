@@ -1,8 +1,17 @@
 #!/bin/bash
 # Script to generate placeholder AppIcon images for macOS
 # This creates simple colored squares as placeholders until proper icons are designed
+# Usage: Scripts/generate_appicons.sh [path/to/AppIcon.appiconset]
 
-ICON_DIR="/workspaces/Itori/SharedCore/DesignSystem/Assets.xcassets/AppIcon.appiconset"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+ICON_DIR="${1:-$SCRIPT_DIR/../SharedCore/DesignSystem/Assets.xcassets/AppIcon.appiconset}"
+
+# Prefer the Python pipeline (one master, Lanczos downsampling, Contents.json)
+if command -v python3 &> /dev/null && python3 -c "import PIL" &> /dev/null; then
+    exec python3 "$SCRIPT_DIR/generate_appicons.py" --icon-dir "$ICON_DIR"
+fi
+
+mkdir -p "$ICON_DIR"
 
 # Check if we have ImageMagick or sips (macOS built-in)
 if command -v sips &> /dev/null; then
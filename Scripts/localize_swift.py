@@ -2,12 +2,71 @@
 """
 Automated Swift Localization Script
 Finds hardcoded strings and wraps them in NSLocalizedString()
+
+Each file is tokenized once (see swift_lexer.py) and every Text/Label/Button/
+Toggle rewrite is collected in a single scan, then applied as one splice list.
+Multi-line calls, raw strings and multi-line literals are handled; literals
+containing interpolation are reported and left for manual localization.
+
+Generated keys are checked against Localizable.xcstrings: identical English
+values reuse their existing key, keys already taken by a different value get a
+deterministic numeric suffix, and new keys are appended to the catalog in one
+batched write at the end of the run.
+
+Usage:
+    python3 Scripts/localize_swift.py <file_or_directory> [...]
+    python3 Scripts/localize_swift.py --dry-run Platforms/ > localization.diff
+    python3 Scripts/localize_swift.py --no-catalog path/to/File.swift
 """
 
+import argparse
+import difflib
 import re
 import sys
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import List, Tuple
+
+from swift_lexer import (
+    IDENT, PUNCT, STRING, LineIndex, SwiftLexError, apply_edits, decode_string,
+    escape_string, tokenize,
+)
+from xcstrings_catalog import DEFAULT_CATALOG, CatalogIndex
+
+# Call shapes that take a user-facing string as first argument:
+# callee -> (key infix, tokens that must follow the literal)
+LOCALIZABLE_CALLS = {
+    'Text': ('', (')',)),
+    'Label': ('label.', (',', 'systemImage', ':')),
+    'Button': ('button.', (')',)),
+    'Toggle': ('toggle.', (',', 'isOn', ':')),
+}
+
+# Text() contents that are decoration rather than copy
+SKIPPED_TEXT = {'·', '—', ' ', '-'}
+
+
+@dataclass
+class FileResult:
+    path: str
+    original: str
+    content: str
+    localized: int = 0
+    skipped_interpolations: List[int] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.content != self.original
+
+    def diff(self) -> str:
+        return ''.join(difflib.unified_diff(
+            self.original.splitlines(keepends=True),
+            self.content.splitlines(keepends=True),
+            fromfile=f"a/{self.path}",
+            tofile=f"b/{self.path}",
+        ))
+
 
 def generate_key(text, context=""):
     """Generate a localization key from text"""
@@ -33,143 +92,167 @@ def extract_category_from_path(filepath):
         return name.lower()
     return 'ui'
 
-def localize_text_calls(content, filepath):
-    """Localize Text() calls"""
-    category = extract_category_from_path(filepath)
-    
-    # Pattern for Text("...") that's not already localized
-    pattern = r'Text\("([^"\\]*(?:\\.[^"\\]*)*)"\)'
-    
-    def replace_text(match):
-        text = match.group(1)
-        
-        # Skip if it's a variable interpolation
-        if '\\(' in text:
-            return match.group(0)
-        
-        # Skip common symbols
-        if text in ['·', '—', ' ', '-']:
-            return match.group(0)
-            
-        # Skip if it looks like a format string result
-        if text.startswith('%'):
-            return match.group(0)
-        
-        # Generate key
-        key = f"{category}.{generate_key(text)}"
-        
-        # Create localized version
-        comment = f"{text[:50]}..." if len(text) > 50 else text
-        localized = f'Text(NSLocalizedString("{key}", value: "{text}", comment: "{comment}"))'
-        
-        return localized
-    
-    return re.sub(pattern, replace_text, content)
-
-def localize_label_calls(content, filepath):
-    """Localize Label("...") calls"""
-    category = extract_category_from_path(filepath)
-    
-    # Pattern for Label("...")
-    pattern = r'Label\("([^"\\]*(?:\\.[^"\\]*)*)"\s*,\s*systemImage:'
-    
-    def replace_label(match):
-        text = match.group(1)
-        key = f"{category}.label.{generate_key(text)}"
-        comment = text[:50]
-        
-        localized = f'Label(NSLocalizedString("{key}", value: "{text}", comment: "{comment}"), systemImage:'
-        return localized
-    
-    return re.sub(pattern, replace_label, content)
-
-def localize_button_calls(content, filepath):
-    """Localize Button("...") calls"""
-    category = extract_category_from_path(filepath)
-    
-    # Pattern for Button("...")
-    pattern = r'Button\("([^"\\]*(?:\\.[^"\\]*)*)"\)'
-    
-    def replace_button(match):
-        text = match.group(1)
-        key = f"{category}.button.{generate_key(text)}"
-        comment = text
-        
-        localized = f'Button(NSLocalizedString("{key}", value: "{text}", comment: "{comment}"))'
-        return localized
-    
-    return re.sub(pattern, replace_button, content)
-
-def localize_toggle_calls(content, filepath):
-    """Localize Toggle("...") calls"""
+def _matches_call(tokens, i) -> Tuple[str, int] | None:
+    """
+    If tokens[i] starts `Callee("literal" <suffix>`, return (callee, literal index).
+    Member accesses such as `.Text(` are not treated as calls.
+    """
+    callee = tokens[i].text
+    if callee not in LOCALIZABLE_CALLS:
+        return None
+    if i > 0 and tokens[i - 1].kind == PUNCT and tokens[i - 1].text == '.':
+        return None
+
+    literal = i + 2
+    suffix = LOCALIZABLE_CALLS[callee][1]
+    if literal + len(suffix) >= len(tokens):
+        return None
+    if tokens[i + 1].text != '(' or tokens[literal].kind != STRING:
+        return None
+    following = tokens[literal + 1:literal + 1 + len(suffix)]
+    if tuple(t.text for t in following) != suffix:
+        return None
+    return callee, literal
+
+def _should_skip(callee: str, text: str) -> bool:
+    """Skip strings that are decoration or already format results"""
+    if callee != 'Text':
+        return False
+    return text in SKIPPED_TEXT or text.startswith('%')
+
+def _comment_for(text: str) -> str:
+    return f"{text[:50]}..." if len(text) > 50 else text
+
+def localize_source(content, filepath, catalog: CatalogIndex | None = None) -> FileResult:
+    """
+    Collect every localizable call in one token scan and splice the rewrites.
+    When a catalog is given, keys are resolved (and new entries staged) through it.
+    """
     category = extract_category_from_path(filepath)
-    
-    pattern = r'Toggle\("([^"\\]*(?:\\.[^"\\]*)*)"\s*,\s*isOn:'
-    
-    def replace_toggle(match):
-        text = match.group(1)
-        key = f"{category}.toggle.{generate_key(text)}"
-        comment = text[:50]
-        
-        localized = f'Toggle(NSLocalizedString("{key}", value: "{text}", comment: "{comment}"), isOn:'
-        return localized
-    
-    return re.sub(pattern, replace_toggle, content)
-
-def process_file(filepath):
+    result = FileResult(path=str(filepath), original=content, content=content)
+
+    tokens = list(tokenize(content))
+    lines = None
+    edits = []
+
+    for i, token in enumerate(tokens):
+        if token.kind != IDENT:
+            continue
+        match = _matches_call(tokens, i)
+        if match is None:
+            continue
+        callee, literal_index = match
+        literal = tokens[literal_index]
+
+        if literal.interpolated:
+            lines = lines or LineIndex(content)
+            result.skipped_interpolations.append(lines.line_of(literal.start))
+            continue
+
+        text = decode_string(literal)
+        if _should_skip(callee, text):
+            continue
+
+        infix = LOCALIZABLE_CALLS[callee][0]
+        key = f"{category}.{infix}{generate_key(text)}"
+        comment = _comment_for(text)
+        if catalog is not None:
+            key = catalog.resolve_key(key, text, comment=comment)
+        # The original literal is reused verbatim so raw and multi-line strings survive
+        replacement = (
+            f'NSLocalizedString("{escape_string(key)}", value: {literal.text}, '
+            f'comment: "{escape_string(comment)}")'
+        )
+        edits.append((literal.start, literal.end, replacement))
+
+    result.localized = len(edits)
+    if edits:
+        result.content = apply_edits(content, edits)
+    return result
+
+def process_file(filepath, dry_run=False, catalog=None):
     """Process a single Swift file"""
+    log = sys.stderr if dry_run else sys.stdout
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
-        
+
         # Skip if already heavily localized
         if content.count('NSLocalizedString') > 20:
-            print(f"⏭️  Skipping {filepath} (already localized)")
-            return False
-        
-        original = content
-        
-        # Apply localizations
-        content = localize_text_calls(content, filepath)
-        content = localize_label_calls(content, filepath)
-        content = localize_button_calls(content, filepath)
-        content = localize_toggle_calls(content, filepath)
-        
+            print(f"⏭️  Skipping {filepath} (already localized)", file=log)
+            return None
+
+        result = localize_source(content, filepath, catalog=catalog)
+
+        for line in result.skipped_interpolations:
+            print(f"✋ {filepath}:{line}: interpolated string needs manual localization", file=log)
+
         # Check if anything changed
-        if content != original:
+        if not result.changed:
+            print(f"⚪ No changes: {filepath}", file=log)
+            return result
+
+        if dry_run:
+            sys.stdout.write(result.diff())
+        else:
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            changes = content.count('NSLocalizedString') - original.count('NSLocalizedString')
-            print(f"✅ Localized {filepath}: +{changes} strings")
-            return True
+                f.write(result.content)
+
+        print(f"✅ Localized {filepath}: +{result.localized} strings", file=log)
+        return result
+
+    except (OSError, UnicodeDecodeError, SwiftLexError) as e:
+        print(f"❌ Error processing {filepath}: {e}", file=log)
+        return None
+
+def iter_swift_files(targets):
+    """Expand files and directories into Swift source paths"""
+    for target in targets:
+        if os.path.isfile(target):
+            yield target
+        elif os.path.isdir(target):
+            yield from (str(p) for p in sorted(Path(target).rglob('*.swift')))
         else:
-            print(f"⚪ No changes: {filepath}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error processing {filepath}: {e}")
-        return False
+            print(f"❌ Invalid target: {target}", file=sys.stderr)
+            sys.exit(1)
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 localize_swift.py <file_or_directory>")
-        sys.exit(1)
-    
-    target = sys.argv[1]
-    
-    if os.path.isfile(target):
-        process_file(target)
-    elif os.path.isdir(target):
-        swift_files = Path(target).rglob('*.swift')
-        count = 0
-        for filepath in swift_files:
-            if process_file(str(filepath)):
-                count += 1
-        print(f"\n📊 Processed {count} files successfully")
-    else:
-        print(f"❌ Invalid target: {target}")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Wrap hardcoded SwiftUI strings in NSLocalizedString()")
+    parser.add_argument('targets', nargs='+', help="Swift files or directories")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print a unified diff to stdout instead of writing files")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG,
+                        help="String catalog used for key collision checks and new entries")
+    parser.add_argument('--no-catalog', action='store_true',
+                        help="Generate keys without consulting or updating the catalog")
+    args = parser.parse_args()
+
+    catalog = None
+    if not args.no_catalog:
+        if not args.catalog.exists():
+            print(f"❌ Catalog not found: {args.catalog} (use --no-catalog to skip)", file=sys.stderr)
+            sys.exit(1)
+        catalog = CatalogIndex.load(args.catalog)
+
+    count = 0
+    strings = 0
+    for filepath in iter_swift_files(args.targets):
+        result = process_file(filepath, dry_run=args.dry_run, catalog=catalog)
+        if result is not None and result.changed:
+            count += 1
+            strings += result.localized
+
+    log = sys.stderr if args.dry_run else sys.stdout
+    verb = "Would localize" if args.dry_run else "Processed"
+    print(f"\n📊 {verb} {count} files successfully ({strings} strings)", file=log)
+
+    if catalog is not None and catalog.pending:
+        if args.dry_run:
+            print(f"🗂  Would add {len(catalog.pending)} new keys to {args.catalog}", file=log)
+        else:
+            added = len(catalog.pending)
+            catalog.save()
+            print(f"🗂  Added {added} new keys to {args.catalog}", file=log)
 
 if __name__ == '__main__':
     main()
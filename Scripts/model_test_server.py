@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Model Download Test Server
+Serves roots-*.mlmodel test files the way a CDN would, for exercising the
+app's model-download path (ModelConfig.testingBaseCDN) against localhost.
+
+- threaded (one thread per connection, HTTP/1.1 keep-alive), so concurrent
+  downloads really run concurrently
+- byte ranges (Range / If-Range, 206 and 416) for resumed downloads, plus
+  ETag / Last-Modified and If-None-Match (304); the ETag comes from the
+  file's size and mtime, so nothing is hashed per request
+- the body is sent with os.sendfile (zero-copy, kernel to socket), falling
+  back to read/write where sendfile is unavailable
+- shaping: --rate caps each connection's bandwidth (sent in ~50ms sendfile
+  slices), --latency delays every response before its headers
+- faults: --drop-after / --drop-probability close the connection mid-body
+  so the client sees a short read
+- one log line per request: status, range, bytes sent, time and throughput
+
+Files are served from --dir at both /models/<name> and /<name>.
+
+Usage:
+    python3 Scripts/model_test_server.py --dir test_models
+    python3 Scripts/model_test_server.py --rate 2M --latency 150
+    python3 Scripts/model_test_server.py --drop-after 1M --drop-probability 0.5
+"""
+
+import argparse
+import email.utils
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import NamedTuple, Optional
+from urllib.parse import unquote, urlsplit
+
+DEFAULT_PORT = 8000
+DEFAULT_DIR = Path("test_models")
+URL_PREFIX = "/models/"
+# Shaped transfers are sent in slices of this many seconds' worth of bytes
+SLICE_SECONDS = 0.05
+CHUNK_SIZE = 1 << 20   # unshaped sendfile / fallback copy size
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+_SIZE = re.compile(r"(\d+(?:\.\d+)?)([KMG]?)B?$", re.I)
+_UNITS = {'': 1, 'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+class ServerConfig(NamedTuple):
+    root: Path
+    rate: Optional[int]           # bytes/s per connection, None = unlimited
+    latency: float                # seconds before the response headers
+    drop_after: Optional[int]     # body bytes before a dropped connection closes
+    drop_probability: float
+    use_sendfile: bool
+
+
+def parse_size(text: str) -> int:
+    """'512K', '2M', '1.5G', '1000' -> bytes"""
+    match = _SIZE.match(text.strip())
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}")
+    return int(float(match.group(1)) * _UNITS[match.group(2).upper()])
+
+
+def format_bytes(count: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if count < 1024:
+            return f"{count:.1f} {unit}" if unit != 'B' else f"{int(count)} B"
+        count /= 1024
+    return f"{count:.1f} GB"
+
+
+def parse_range(header: str, size: int):
+    """
+    (start, end) inclusive for a single "bytes=" range, None to serve the
+    whole file (absent, malformed or multi-range headers are ignored, as
+    RFC 9110 allows), or 'unsatisfiable'.
+    """
+    match = _RANGE.match(header.strip()) if header else None
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:                      # suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return 'unsatisfiable'
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return 'unsatisfiable'
+    return start, end
+
+
+def etag_for(stat: os.stat_result) -> str:
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+class ModelRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ItoriModelTestServer/1.0"
+    config: ServerConfig = None   # set by serve()
+
+    def log_message(self, format, *args):
+        # Per-request lines are written by log_transfer instead
+        pass
+
+    def log_transfer(self, status: int, detail: str, sent: int, elapsed: float, note: str = ""):
+        rate = sent / elapsed if elapsed > 0 else 0
+        print(f"[{time.strftime('%H:%M:%S')}] {self.client_address[0]}:{self.client_address[1]} "
+              f"{self.command} {self.path} {status} {detail} "
+              f"{format_bytes(sent)} in {elapsed:.2f}s ({format_bytes(rate)}/s){note}", flush=True)
+
+    def resolve(self) -> Optional[Path]:
+        path = unquote(urlsplit(self.path).path)
+        if path.startswith(URL_PREFIX):
+            path = path[len(URL_PREFIX):]
+        root = self.config.root
+        candidate = (root / path.lstrip('/')).resolve()
+        if candidate != root and root in candidate.parents and candidate.is_file():
+            return candidate
+        return None
+
+    def do_HEAD(self):
+        self.handle_file(send_body=False)
+
+    def do_GET(self):
+        self.handle_file(send_body=True)
+
+    def handle_file(self, send_body: bool):
+        start_time = time.perf_counter()
+        if self.config.latency:
+            time.sleep(self.config.latency)
+
+        path = self.resolve()
+        if path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            self.log_transfer(404, "-", 0, time.perf_counter() - start_time)
+            return
+
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            size, etag = stat.st_size, etag_for(stat)
+
+            if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.log_transfer(304, "-", 0, time.perf_counter() - start_time)
+                return
+
+            byte_range = parse_range(self.headers.get('Range', ''), size)
+            if_range = self.headers.get('If-Range')
+            if byte_range is not None and if_range is not None and if_range.strip() != etag:
+                byte_range = None      # file changed since the partial download: send it all
+            if byte_range == 'unsatisfiable':
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f"bytes */{size}")
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                self.log_transfer(416, self.headers.get('Range', ''), 0, time.perf_counter() - start_time)
+                return
+
+            if byte_range is None:
+                status, offset, length, detail = HTTPStatus.OK, 0, size, "full"
+            else:
+                first, last = byte_range
+                status, offset, length = HTTPStatus.PARTIAL_CONTENT, first, last - first + 1
+                detail = f"bytes={first}-{last}"
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(length))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', email.utils.formatdate(stat.st_mtime, usegmt=True))
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header('Content-Range', f"bytes {offset}-{offset + length - 1}/{size}")
+            self.end_headers()
+            if not send_body:
+                self.log_transfer(int(status), detail, 0, time.perf_counter() - start_time)
+                return
+
+            drop_at = self.drop_point(length)
+            sent = 0
+            try:
+                sent = self.send_body(f, offset, min(length, drop_at) if drop_at is not None else length)
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+                self.log_transfer(int(status), detail, sent, time.perf_counter() - start_time,
+                                  "  ⚠️ client disconnected")
+                return
+
+        note = ""
+        if drop_at is not None and sent < length:
+            # Simulated network failure: the client gets fewer bytes than Content-Length
+            self.close_connection = True
+            try:
+                self.connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            note = f"  💥 dropped after {format_bytes(sent)}"
+        self.log_transfer(int(status), detail, sent, time.perf_counter() - start_time, note)
+
+    def drop_point(self, length: int) -> Optional[int]:
+        """Body bytes to send before dropping this response, None to send it all"""
+        config = self.config
+        if not config.drop_probability or random.random() >= config.drop_probability:
+            return None
+        if config.drop_after is not None:
+            return config.drop_after
+        return random.randrange(length) if length else None
+
+    def send_body(self, f, offset: int, count: int) -> int:
+        """Send `count` bytes of `f` from `offset`, shaped to config.rate; returns bytes sent"""
+        rate = self.config.rate
+        slice_size = max(1, int(rate * SLICE_SECONDS)) if rate else CHUNK_SIZE
+        out = self.connection
+        started = time.perf_counter()
+        sent = 0
+        while sent < count:
+            size = min(slice_size, count - sent)
+            if self.config.use_sendfile:
+                written = os.sendfile(out.fileno(), f.fileno(), offset + sent, size)
+            else:
+                f.seek(offset + sent)
+                out.sendall(f.read(size))
+                written = size
+            if written == 0:
+                break
+            sent += written
+            if rate:
+                # Sleep until the bytes sent so far are on schedule for the rate
+                ahead = started + sent / rate - time.perf_counter()
+                if ahead > 0:
+                    time.sleep(ahead)
+        return sent
+
+
+def serve(config: ServerConfig, host: str, port: int):
+    handler = type('Handler', (ModelRequestHandler,), {'config': config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threaded model download test server with ranges and shaping")
+    parser.add_argument('--dir', type=Path, default=DEFAULT_DIR, help="Directory of model files to serve")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--rate', type=parse_size, help="Per-connection bandwidth per second, e.g. 512K, 2M")
+    parser.add_argument('--latency', type=float, default=0, help="Milliseconds before each response")
+    parser.add_argument('--drop-after', type=parse_size,
+                        help="Drop connections after this many body bytes (e.g. 1M)")
+    parser.add_argument('--drop-probability', type=float,
+                        help="Fraction of responses to drop (default 1 with --drop-after, else 0); "
+                             "without --drop-after the drop point is random")
+    parser.add_argument('--no-sendfile', action='store_true', help="Copy through userspace instead of sendfile")
+    args = parser.parse_args()
+
+    if not args.dir.is_dir():
+        print(f"❌ Directory not found: {args.dir}")
+        return 1
+    probability = args.drop_probability
+    if probability is None:
+        probability = 1.0 if args.drop_after is not None else 0.0
+    if not 0 <= probability <= 1:
+        print("❌ --drop-probability must be between 0 and 1")
+        return 1
+
+    use_sendfile = not args.no_sendfile and hasattr(os, 'sendfile')
+    config = ServerConfig(args.dir.resolve(), args.rate, args.latency / 1000,
+                          args.drop_after, probability, use_sendfile)
+    try:
+        server = serve(config, args.host, args.port)
+    except OSError as e:
+        print(f"❌ Cannot listen on {args.host}:{args.port}: {e}")
+        return 1
+
+    print(f"📁 Serving {config.root} on http://{args.host}:{args.port}{URL_PREFIX}")
+    for path in sorted(config.root.iterdir()):
+        if path.is_file():
+            print(f"   {URL_PREFIX}{path.name} ({format_bytes(path.stat().st_size)})")
+    print(f"   transfer: {'sendfile' if use_sendfile else 'read/write'}"
+          f", rate: {format_bytes(config.rate) + '/s' if config.rate else 'unlimited'}"
+          f", latency: {args.latency:g} ms")
+    if probability:
+        where = format_bytes(config.drop_after) if config.drop_after is not None else "a random point"
+        print(f"   ⚠️  dropping {probability:.0%} of responses after {where}")
+    print("Press Ctrl+C to stop the server")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✅ Server stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Asset Catalog Optimizer
+Checks and shrinks the images in every .imageset / .appiconset (Assets.xcassets)
+and .icon bundle (Icon Composer) in the repo
+
+Checks (errors fail the run):
+- every file referenced by Contents.json / icon.json exists            (error)
+- app icon pixel dimensions match the slot's size x scale              (error)
+- @2x / @3x variants of an imageset are 2x / 3x the @1x pixels         (error)
+- images larger than --max-dimension pixels on a side                  (warning)
+- files in a set that nothing references                               (warning)
+- byte-identical images, found by content hash                         (warning)
+
+Optimization (--write to apply, otherwise reported as savings):
+- PNGs are re-encoded at maximum zlib effort with metadata chunks (EXIF, text,
+  timestamps) dropped; fully opaque RGBA becomes RGB. ICC profile, gAMA, sRGB,
+  cHRM and transparency are kept. The result is only kept if it is smaller,
+  carries the same colour chunks and decodes pixel-for-pixel to the original,
+  so the recompression is lossless. 16-bit PNGs are left alone (Pillow
+  decodes them to 8 bits).
+
+Results are cached by content hash in .asset_cache.json: on a re-run, unchanged
+files cost one SHA-256 each and are neither decoded nor re-encoded.
+
+Requires Pillow for recompression and JPEG sizes (pip install Pillow); without
+it PNG dimensions are read from the file header and only the checks run.
+
+Usage:
+    python3 Scripts/optimize_assets.py                   # report
+    python3 Scripts/optimize_assets.py --write           # recompress in place
+    python3 Scripts/optimize_assets.py --max-dimension 1024 --json assets.json
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Pillow is optional; without it only the checks run
+try:
+    from PIL import Image, PngImagePlugin
+except ImportError:
+    Image = None
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_CACHE = ROOT / ".asset_cache.json"
+CACHE_VERSION = 2
+SET_SUFFIXES = ('.imageset', '.appiconset')
+RASTER_SUFFIXES = ('.png', '.jpg', '.jpeg')
+DEFAULT_MAX_DIMENSION = 2048
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+SKIP_DIRS = {'.git', 'build', 'DerivedData', 'node_modules', '.build', 'Pods'}
+# Metadata worth keeping through re-encoding: colour management and transparency.
+# Pillow writes these two from Image.info; the COLOR_CHUNKS are copied raw
+KEEP_INFO = ('icc_profile', 'transparency')
+COLOR_CHUNKS = (b'gAMA', b'sRGB', b'cHRM')
+# Modes Pillow round-trips without changing sample depth
+EIGHT_BIT_MODES = {'1', 'L', 'LA', 'P', 'RGB', 'RGBA'}
+
+
+class Reference(NamedTuple):
+    """One image slot in a set; `expected` is the exact pixel size when the slot defines one"""
+    filename: str
+    scale: int = 1
+    expected: Optional[Tuple[int, int]] = None
+
+
+class AssetSet(NamedTuple):
+    path: Path
+    kind: str                    # imageset, appiconset or icon
+    image_dir: Path
+    references: List[Reference]
+
+
+class Issue(NamedTuple):
+    level: str                   # error or warning
+    path: str
+    message: str
+
+
+# MARK: - Discovery
+
+def _scale(text: str) -> int:
+    return int(text.rstrip('x')) if text and text.rstrip('x').isdigit() else 1
+
+
+def parse_contents(set_dir: Path) -> AssetSet:
+    """Image slots of an .imageset / .appiconset from its Contents.json"""
+    kind = set_dir.suffix[1:]
+    with open(set_dir / "Contents.json", 'r', encoding='utf-8') as f:
+        contents = json.load(f)
+    references = []
+    for image in contents.get('images', []):
+        if 'filename' not in image:
+            continue
+        scale = _scale(image.get('scale', '1x'))
+        expected = None
+        if kind == 'appiconset' and 'size' in image:
+            width, height = (float(n) for n in image['size'].split('x'))
+            expected = (round(width * scale), round(height * scale))
+        references.append(Reference(image['filename'], scale, expected))
+    return AssetSet(set_dir, kind, set_dir, references)
+
+
+def parse_icon_bundle(bundle: Path) -> AssetSet:
+    """Layer images of an Icon Composer bundle from its icon.json"""
+    with open(bundle / "icon.json", 'r', encoding='utf-8') as f:
+        icon = json.load(f)
+    names = {layer['image-name'] for group in icon.get('groups', [])
+             for layer in group.get('layers', []) if 'image-name' in layer}
+    return AssetSet(bundle, 'icon', bundle / "Assets", [Reference(name) for name in sorted(names)])
+
+
+def find_asset_sets(root: Path) -> Tuple[List[AssetSet], List[Issue]]:
+    sets, issues = [], []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        path = Path(dirpath)
+        try:
+            if path.suffix in SET_SUFFIXES and 'Contents.json' in filenames:
+                sets.append(parse_contents(path))
+            elif 'icon.json' in filenames and (path / "Assets").is_dir():
+                sets.append(parse_icon_bundle(path))
+        except (OSError, ValueError, KeyError) as e:
+            issues.append(Issue('error', str(path.relative_to(root)), f"unreadable manifest: {e}"))
+    return sets, issues
+
+
+# MARK: - Images
+
+def png_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Pixel size from a PNG's IHDR chunk, without decoding"""
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', data[16:24])
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    size = png_size(data)
+    if size is None and Image is not None:
+        try:
+            size = Image.open(io.BytesIO(data)).size
+        except OSError:
+            return None
+    return size
+
+
+def png_chunks(data: bytes) -> Dict[bytes, bytes]:
+    """Chunk type -> data of its first occurrence, read up to IEND"""
+    chunks = {}
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunks.setdefault(kind, data[pos + 8:pos + 8 + length])
+        pos += 12 + length
+        if kind == b'IEND':
+            break
+    return chunks
+
+
+def recompress_png(data: bytes) -> Optional[bytes]:
+    """A smaller, pixel-identical PNG without metadata chunks, or None"""
+    # 16-bit samples would be truncated to 8 by Pillow (and compare equal after it)
+    if not data.startswith(PNG_SIGNATURE) or len(data) < 33 or data[24] > 8:
+        return None
+    original = Image.open(io.BytesIO(data))
+    if original.mode not in EIGHT_BIT_MODES:
+        return None
+    original.load()
+    image = original
+    if image.mode == 'RGBA' and image.getextrema()[3] == (255, 255):
+        image = image.convert('RGB')
+    info = {key: original.info[key] for key in KEEP_INFO if key in original.info}
+    if 'transparency' in info and image.mode != original.mode:
+        del info['transparency']
+    # Pillow reads gAMA / sRGB / cHRM but never writes them: copy the raw chunks
+    chunks = png_chunks(data)
+    pnginfo = PngImagePlugin.PngInfo()
+    for kind in COLOR_CHUNKS:
+        if kind in chunks:
+            pnginfo.add(kind, chunks[kind])
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True, pnginfo=pnginfo, **info)
+    candidate = buffer.getvalue()
+    if len(candidate) >= len(data):
+        return None
+    new_chunks = png_chunks(candidate)
+    if new_chunks[b'IHDR'][8] > 8 or any(new_chunks.get(kind) != chunks.get(kind) for kind in COLOR_CHUNKS):
+        return None
+    decoded = Image.open(io.BytesIO(candidate))
+    if decoded.info.get('icc_profile') != original.info.get('icc_profile'):
+        return None
+    if decoded.convert('RGBA').tobytes() != original.convert('RGBA').tobytes():
+        return None
+    return candidate
+
+
+class AssetCache:
+    """Per-content-hash results: pixel size and whether the bytes are already optimal"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                if cache.get("version") == CACHE_VERSION:
+                    self.entries = cache.get("files", {})
+            except (OSError, ValueError):
+                pass
+
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({"version": CACHE_VERSION, "files": self.entries}, f, indent=1, sort_keys=True)
+            f.write("\n")
+
+
+class FileResult(NamedTuple):
+    path: Path
+    digest: str
+    size: Optional[Tuple[int, int]]
+    bytes: int
+    saving: int = 0                  # bytes a lossless re-encode saves
+    optimized: Optional[bytes] = None  # that re-encode, when writing
+
+
+def inspect_file(path: Path, cache: AssetCache, write: bool = False) -> FileResult:
+    """Size and recompression result for one image, from the cache when its content is known"""
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = cache.entries.get(digest)
+    optimized = None
+    if entry is None or ('optimal' not in entry and Image is not None):
+        size = image_size(data)
+        entry = {'width': size[0], 'height': size[1]} if size else {}
+        if Image is not None and path.suffix.lower() == '.png' and size:
+            try:
+                optimized = recompress_png(data)
+            except OSError:
+                optimized = None
+            entry['optimal'] = optimized is None
+            if optimized is not None:
+                entry['optimized_bytes'] = len(optimized)
+                # The re-encoded file is optimal as written
+                cache.entries[hashlib.sha256(optimized).hexdigest()] = {
+                    'width': size[0], 'height': size[1], 'optimal': True}
+        cache.entries[digest] = entry
+    elif write and 'optimized_bytes' in entry and Image is not None:
+        # Known to shrink; the bytes are needed again to write it
+        optimized = recompress_png(data)
+    size = (entry['width'], entry['height']) if 'width' in entry else None
+    saving = len(data) - entry['optimized_bytes'] if 'optimized_bytes' in entry else 0
+    return FileResult(path, digest, size, len(data), saving, optimized if write else None)
+
+
+# MARK: - Checks
+
+def check_set(asset_set: AssetSet, files: Dict[Path, FileResult], root: Path,
+              max_dimension: int) -> List[Issue]:
+    issues = []
+    where = str(asset_set.path.relative_to(root))
+    by_scale: Dict[int, Tuple[str, Tuple[int, int]]] = {}
+    for ref in asset_set.references:
+        path = asset_set.image_dir / ref.filename
+        result = files.get(path)
+        if result is None:
+            issues.append(Issue('error', where, f"{ref.filename}: referenced but missing"))
+            continue
+        if result.size is None:
+            continue
+        width, height = result.size
+        if ref.expected and result.size != ref.expected:
+            issues.append(Issue('error', where, f"{ref.filename}: {width}x{height}px, slot needs "
+                                                f"{ref.expected[0]}x{ref.expected[1]}px"))
+        if max(width, height) > max_dimension:
+            issues.append(Issue('warning', where, f"{ref.filename}: {width}x{height}px exceeds "
+                                                  f"{max_dimension}px"))
+        if asset_set.kind == 'imageset':
+            by_scale.setdefault(ref.scale, (ref.filename, result.size))
+
+    if asset_set.kind == 'imageset' and len(by_scale) > 1:
+        base_scale = min(by_scale)
+        base_name, (base_w, base_h) = by_scale[base_scale]
+        for scale, (name, (width, height)) in by_scale.items():
+            want = (round(base_w * scale / base_scale), round(base_h * scale / base_scale))
+            if (width, height) != want:
+                issues.append(Issue('error', where, f"{name}: @{scale}x is {width}x{height}px, expected "
+                                                    f"{want[0]}x{want[1]}px from {base_name}"))
+
+    referenced = {asset_set.image_dir / ref.filename for ref in asset_set.references}
+    for path in files:
+        if path.parent == asset_set.image_dir and path not in referenced:
+            issues.append(Issue('warning', where, f"{path.name}: not referenced by the manifest"))
+    return issues
+
+
+def set_files(asset_set: AssetSet) -> List[Path]:
+    if not asset_set.image_dir.is_dir():
+        return []
+    return sorted(p for p in asset_set.image_dir.iterdir()
+                  if p.is_file() and p.name not in ('Contents.json', 'icon.json') and not p.name.startswith('.'))
+
+
+def optimize_assets(root: Path, cache: AssetCache, write: bool = False,
+                    max_dimension: int = DEFAULT_MAX_DIMENSION):
+    """Scan, check and (with `write`) recompress every asset under `root`"""
+    sets, issues = find_asset_sets(root)
+    files: Dict[Path, FileResult] = {}
+    for asset_set in sets:
+        for path in set_files(asset_set):
+            if path.suffix.lower() in RASTER_SUFFIXES:
+                files[path] = inspect_file(path, cache, write)
+            else:
+                data = path.read_bytes()
+                files[path] = FileResult(path, hashlib.sha256(data).hexdigest(), None, len(data))
+
+    for asset_set in sets:
+        issues += check_set(asset_set, {p: r for p, r in files.items() if p.parent == asset_set.image_dir},
+                            root, max_dimension)
+
+    by_digest: Dict[str, List[FileResult]] = {}
+    for result in files.values():
+        by_digest.setdefault(result.digest, []).append(result)
+    for first, *others in by_digest.values():
+        if others:
+            names = ", ".join(str(r.path.relative_to(root)) for r in others)
+            issues.append(Issue('warning', str(first.path.relative_to(root)), f"identical to {names}"))
+
+    savings = [(r, r.saving) for r in files.values() if r.saving > 0]
+    if write:
+        for result, _ in savings:
+            if result.optimized is None:
+                continue
+            tmp = result.path.with_name(result.path.name + ".tmp")
+            tmp.write_bytes(result.optimized)
+            os.replace(tmp, result.path)
+    return sets, files, issues, savings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and losslessly shrink asset catalog images")
+    parser.add_argument('--root', type=Path, default=ROOT, help="Directory to scan (default: repo root)")
+    parser.add_argument('--write', action='store_true', help="Replace PNGs with their recompressed versions")
+    parser.add_argument('--max-dimension', type=int, default=DEFAULT_MAX_DIMENSION,
+                        help="Warn about images larger than this many pixels on a side")
+    parser.add_argument('--cache', type=Path, default=DEFAULT_CACHE)
+    parser.add_argument('--json', type=Path, help="Write issues and savings as JSON")
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    if Image is None:
+        print("⚠️  Pillow not installed; running checks only. Install: pip install Pillow")
+
+    start = time.perf_counter()
+    cache = AssetCache(args.cache)
+    sets, files, issues, savings = optimize_assets(root, cache, args.write, args.max_dimension)
+    cache.save()
+    elapsed = time.perf_counter() - start
+
+    total_bytes = sum(r.bytes for r in files.values())
+    saved = sum(s for _, s in savings)
+    print(f"🎨 Asset optimizer: {len(sets)} sets, {len(files)} files, {total_bytes / 1024:.1f} KiB "
+          f"({elapsed:.2f}s)")
+    print("=" * 70)
+    for asset_set in sets:
+        count = sum(1 for p in files if p.parent == asset_set.image_dir)
+        print(f"📁 {str(asset_set.path.relative_to(root)):60} {asset_set.kind:10} {count} files")
+
+    if savings:
+        print(f"\n{'💾 Recompressed' if args.write else '💡 Recompressible'} (lossless):")
+        for result, delta in sorted(savings, key=lambda s: -s[1]):
+            print(f"   {str(result.path.relative_to(root)):60} -{delta / 1024:.1f} KiB "
+                  f"({100 * delta / result.bytes:.0f}%)")
+        print(f"   Total: -{saved / 1024:.1f} KiB" + ("" if args.write else " (run with --write)"))
+
+    errors = [i for i in issues if i.level == 'error']
+    warnings = [i for i in issues if i.level == 'warning']
+    if issues:
+        print()
+    for issue in errors:
+        print(f"❌ {issue.path}: {issue.message}")
+    for issue in warnings:
+        print(f"⚠️  {issue.path}: {issue.message}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "issues": [i._asdict() for i in issues],
+                "savings": {str(r.path.relative_to(root)): delta for r, delta in savings},
+            }, f, indent=2)
+        print(f"\n💾 Saved to: {args.json}")
+
+    print(f"\n{'✅' if not errors else '❌'} {len(errors)} errors, {len(warnings)} warnings")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Xcode Project (project.pbxproj) Reader / Writer
+Parses the OpenStep-style property list Xcode uses into plain dicts, lists and
+strings, with every object indexed by its UUID, and writes it back the way
+Xcode does, so an unmodified project round-trips byte for byte and an edit
+only touches the lines it changes.
+
+- references keep their /* comment */ annotations (Ref, a str subclass)
+- dict key order is preserved; new objects get Xcode's order (isa, then the
+  other keys alphabetically) and land in their isa section in UUID order
+- PBXBuildFile / PBXFileReference objects stay on one line
+- mutations are idempotent: ensure_object() derives the UUID from a seed and
+  reuses it, ensure_in_list() only appends missing references
+
+Usage (as a module):
+    project = PBXProject.load("ItoriApp.xcodeproj/project.pbxproj")
+    target = project.target("Itori")
+    project.ensure_in_list(target, "dependencies", dependency_uuid)
+    project.save()        # writes only when something changed
+
+    python3 Scripts/pbxproj.py ItoriApp.xcodeproj/project.pbxproj   # summary + round-trip check
+"""
+
+import hashlib
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+HEADER = "// !$*UTF8*$!\n"
+# Objects Xcode writes on a single line
+SINGLE_LINE_ISA = {"PBXBuildFile", "PBXFileReference"}
+_UNQUOTED = re.compile(r"[A-Za-z0-9_$/.:]+")
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>/\*.*?\*/|//[^\n]*)
+  | (?P<quoted>"(?:[^"\\]|\\.)*")
+  | (?P<bare>[A-Za-z0-9_$/.:+\-]+)
+  | (?P<punct>[{}()=;,])
+""", re.S | re.X)
+_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\', "'": "'"}
+
+Value = Union[str, list, dict]
+
+
+class PBXParseError(ValueError):
+    pass
+
+
+class Ref(str):
+    """A string value with the /* comment */ Xcode writes after it (usually a UUID reference)"""
+
+    comment: Optional[str] = None
+
+    def __new__(cls, value: str, comment: Optional[str] = None):
+        ref = super().__new__(cls, value)
+        ref.comment = comment
+        return ref
+
+
+# MARK: - Parsing
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = []   # (kind, text)
+        pos = 0
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if match is None:
+                line = text.count("\n", 0, pos) + 1
+                raise PBXParseError(f"line {line}: unexpected {text[pos:pos + 20]!r}")
+            if match.lastgroup != 'space':
+                self.tokens.append((match.lastgroup, match.group()))
+            pos = match.end()
+        self.pos = 0
+        self.key_comments: Dict[str, str] = {}
+
+    def peek(self):
+        while self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'comment':
+            self.pos += 1
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ('eof', '')
+
+    def take(self, expected: Optional[str] = None) -> str:
+        kind, text = self.peek()
+        if expected is not None and text != expected:
+            raise PBXParseError(f"expected {expected!r}, got {text!r}")
+        self.pos += 1
+        return text
+
+    def trailing_comment(self) -> Optional[str]:
+        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'comment':
+            text = self.tokens[self.pos][1]
+            if text.startswith('/*'):
+                self.pos += 1
+                return text[2:-2].strip()
+        return None
+
+    def string(self) -> Ref:
+        kind, text = self.peek()
+        if kind == 'quoted':
+            self.pos += 1
+            value = re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), text[1:-1], flags=re.S)
+        elif kind == 'bare':
+            self.pos += 1
+            value = text
+        else:
+            raise PBXParseError(f"expected a string, got {text!r}")
+        return Ref(value, self.trailing_comment())
+
+    def value(self) -> Value:
+        text = self.peek()[1]
+        if text == '{':
+            self.take()
+            result = {}
+            while self.peek()[1] != '}':
+                key = self.string()
+                if key.comment:
+                    self.key_comments[str(key)] = key.comment
+                self.take('=')
+                result[str(key)] = self.value()
+                self.take(';')
+            self.take('}')
+            return result
+        if text == '(':
+            self.take()
+            items = []
+            while self.peek()[1] != ')':
+                items.append(self.value())
+                if self.peek()[1] == ',':
+                    self.take()
+            self.take(')')
+            return items
+        return self.string()
+
+
+def parse(text: str):
+    """(root dict, {uuid: comment} for the objects' own annotations)"""
+    parser = _Parser(text)
+    root = parser.value()
+    if parser.peek()[0] != 'eof':
+        raise PBXParseError(f"trailing content: {parser.peek()[1]!r}")
+    return root, parser.key_comments
+
+
+# MARK: - Writing
+
+def quote(value: str) -> str:
+    if _UNQUOTED.fullmatch(value) and '//' not in value:
+        return value
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n').replace('\t', '\\t')
+    return f'"{escaped}"'
+
+
+def _scalar(value: str) -> str:
+    comment = getattr(value, 'comment', None)
+    return quote(value) + (f" /* {comment} */" if comment else "")
+
+
+def _inline(value: Value) -> str:
+    if isinstance(value, dict):
+        return "{" + "".join(f"{quote(k)} = {_inline(v)}; " for k, v in value.items()) + "}"
+    if isinstance(value, list):
+        return "(" + "".join(f"{_inline(v)}, " for v in value) + ")"
+    return _scalar(value)
+
+
+def _block(value: Value, depth: int) -> str:
+    indent = "\t" * depth
+    if isinstance(value, dict):
+        lines = [f"{indent}\t{quote(k)} = {_block(v, depth + 1)};\n" for k, v in value.items()]
+        return "{\n" + "".join(lines) + indent + "}"
+    if isinstance(value, list):
+        return "(\n" + "".join(f"{indent}\t{_block(v, depth + 1)},\n" for v in value) + indent + ")"
+    return _scalar(value)
+
+
+class PBXProject:
+    """A parsed project.pbxproj: `objects` maps UUID -> object dict"""
+
+    def __init__(self, root: dict, comments: Dict[str, str], path: Optional[Path] = None, text: str = ""):
+        self.data = root
+        self.objects: Dict[str, dict] = root.setdefault('objects', {})
+        self.comments = comments
+        self.path = path
+        self._original = text
+
+    @classmethod
+    def load(cls, path) -> "PBXProject":
+        path = Path(path)
+        text = path.read_text(encoding='utf-8')
+        root, comments = parse(text)
+        return cls(root, comments, path, text)
+
+    # Lookups
+
+    def get(self, uuid: str) -> Optional[dict]:
+        return self.objects.get(uuid)
+
+    def objects_of(self, isa: str) -> Iterator[tuple]:
+        """(uuid, object) for every object of one isa"""
+        return ((uuid, obj) for uuid, obj in self.objects.items() if obj.get('isa') == isa)
+
+    @property
+    def root_object(self) -> dict:
+        return self.objects[self.data['rootObject']]
+
+    def target(self, name: str) -> Optional[dict]:
+        for uuid in self.root_object.get('targets', []):
+            target = self.objects.get(uuid)
+            if target is not None and target.get('name') == name:
+                return target
+        return None
+
+    def uuid_of(self, obj: dict) -> str:
+        for uuid, candidate in self.objects.items():
+            if candidate is obj:
+                return uuid
+        raise KeyError("object is not in this project")
+
+    def ref(self, uuid: str) -> Ref:
+        """A reference to an object, annotated the way its definition is"""
+        return Ref(uuid, self.comments.get(uuid))
+
+    def build_configurations(self, target: dict) -> List[dict]:
+        config_list = self.objects[target['buildConfigurationList']]
+        return [self.objects[uuid] for uuid in config_list.get('buildConfigurations', [])]
+
+    # Idempotent mutations
+
+    def make_uuid(self, seed: str) -> str:
+        """A stable 24-digit UUID for `seed`, so re-running an edit finds its own objects"""
+        digest = hashlib.sha1(seed.encode('utf-8')).hexdigest().upper()
+        return digest[:24]
+
+    def ensure_object(self, seed: str, obj: dict, comment: Optional[str] = None) -> Ref:
+        """Add `obj` under the UUID derived from `seed` unless it is already there"""
+        uuid = self.make_uuid(seed)
+        if uuid not in self.objects:
+            # Xcode's order: isa, then the other keys alphabetically
+            self.objects[uuid] = {'isa': obj['isa'], **{k: obj[k] for k in sorted(obj) if k != 'isa'}}
+            if comment:
+                self.comments[uuid] = comment
+        return self.ref(uuid)
+
+    def ensure_in_list(self, obj: dict, key: str, uuid: str, after: Optional[str] = None) -> bool:
+        """Append (or insert after `after`) a reference to `uuid` in obj[key] unless present"""
+        items = obj.setdefault(key, [])
+        if uuid in items:
+            return False
+        reference = self.ref(uuid)
+        if after is not None and after in items:
+            items.insert(items.index(after) + 1, reference)
+        else:
+            items.append(reference)
+        return True
+
+    def set_value(self, obj: dict, key: str, value: str) -> bool:
+        if obj.get(key) == value:
+            return False
+        obj[key] = Ref(value)
+        return True
+
+    # Serialization
+
+    def _objects_text(self) -> str:
+        sections: Dict[str, List[str]] = {}
+        for uuid in self.objects:
+            sections.setdefault(self.objects[uuid].get('isa', ''), []).append(uuid)
+        out = ["{\n"]
+        for isa in sorted(sections):
+            out.append(f"\n/* Begin {isa} section */\n")
+            for uuid in sorted(sections[isa]):
+                obj = self.objects[uuid]
+                body = _inline(obj) if isa in SINGLE_LINE_ISA else _block(obj, 2)
+                out.append(f"\t\t{_scalar(self.ref(uuid))} = {body};\n")
+            out.append(f"/* End {isa} section */\n")
+        out.append("\t}")
+        return "".join(out)
+
+    def dumps(self) -> str:
+        lines = []
+        for key, value in self.data.items():
+            body = self._objects_text() if key == 'objects' else _block(value, 1)
+            lines.append(f"\t{quote(key)} = {body};\n")
+        return HEADER + "{\n" + "".join(lines) + "}\n"
+
+    @property
+    def changed(self) -> bool:
+        return self.dumps() != self._original
+
+    def save(self, path=None) -> bool:
+        """Write the project if its text changed; returns whether it was written"""
+        text = self.dumps()
+        target = Path(path) if path else self.path
+        if path is None and text == self._original:
+            return False
+        target.write_text(text, encoding='utf-8')
+        if path is None:
+            self._original = text
+        return True
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: python3 Scripts/pbxproj.py path/to/project.pbxproj")
+        return 1
+    project = PBXProject.load(sys.argv[1])
+    counts: Dict[str, int] = {}
+    for obj in project.objects.values():
+        counts[obj.get('isa', '?')] = counts.get(obj.get('isa', '?'), 0) + 1
+    print(f"📁 {sys.argv[1]}: {len(project.objects)} objects")
+    for isa, count in sorted(counts.items()):
+        print(f"   {isa:55} {count}")
+    for uuid in project.root_object.get('targets', []):
+        print(f"🎯 {project.objects[uuid].get('name')} ({uuid})")
+    if project.changed:
+        print("⚠️  Round-trip differs from the file (re-saving would reformat it)")
+        return 1
+    print("✅ Round-trip is byte-identical")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -42,6 +42,21 @@ else
 fi
 echo ""
 
+# Check 2b: Asset catalogs (manifest references, pixel sizes, recompressible PNGs)
+echo "🗜  Checking Asset Catalogs..."
+if command -v python3 &> /dev/null; then
+    if ASSET_REPORT=$(python3 Scripts/optimize_assets.py); then
+        echo "✅ Asset catalogs consistent ($(echo "$ASSET_REPORT" | tail -n 1 | sed 's/^✅ //'))"
+    else
+        echo "$ASSET_REPORT" | grep "^❌"
+        echo "   Details: python3 Scripts/optimize_assets.py"
+        ISSUES=$((ISSUES + 1))
+    fi
+else
+    echo "⚠️  python3 not found; skipping asset catalog checks"
+fi
+echo ""
+
 # Check 3: Screenshots
 echo "📸 Checking Screenshots..."
 if [ -d "Screenshots" ]; then
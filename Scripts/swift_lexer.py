@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Swift Source Lexer
+Tokenizes Swift source for the localization and audit scripts.
+
+Understands line and (nested) block comments, escaped quotes, raw strings
+(#"..."#), multi-line string literals and nested string interpolation, so
+callers can match call shapes on tokens instead of regexes over raw text.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+IDENT = 'ident'
+NUMBER = 'number'
+STRING = 'string'
+PUNCT = 'punct'
+
+
+class SwiftLexError(ValueError):
+    """Raised when the source cannot be tokenized (e.g. unterminated literal)"""
+
+
+@dataclass
+class Token:
+    kind: str
+    start: int
+    end: int
+    text: str
+    # String literal details (only meaningful when kind == STRING)
+    body: str = ''
+    hashes: int = 0
+    multiline: bool = False
+    interpolated: bool = False
+
+
+_TRIVIA_OR_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<line_comment>//[^\n]*)
+  | (?P<block_comment>/\*)
+  | (?P<string>\#*")
+  | (?P<ident>`[^`\n]+`|\$\w*|[^\W\d]\w*)
+  | (?P<number>\d\w*(?:\.\d\w*)?)
+  | (?P<punct>.)
+''', re.X | re.S)
+
+_BLOCK_COMMENT_DELIMS = re.compile(r'/\*|\*/')
+# Body of a \u{...} escape: 1-8 hex digits
+_UNICODE_ESCAPE = re.compile(r'\{([0-9a-fA-F]{1,8})\}')
+
+
+@lru_cache(maxsize=None)
+def _string_stop_pattern(hashes: int, multiline: bool) -> 're.Pattern':
+    """Pattern finding the next escape, closing delimiter or bare newline"""
+    pounds = '#' * hashes
+    escape = re.escape('\\' + pounds)
+    close = re.escape(('"""' if multiline else '"') + pounds)
+    if multiline:
+        return re.compile(f'(?P<escape>{escape})|(?P<close>{close})')
+    return re.compile(f'(?P<escape>{escape})|(?P<close>{close})|(?P<newline>\\n)')
+
+
+def _skip_block_comment(src: str, pos: int) -> int:
+    """Return the offset just past a (possibly nested) block comment opened at pos"""
+    depth = 0
+    for match in _BLOCK_COMMENT_DELIMS.finditer(src, pos):
+        depth += 1 if match.group() == '/*' else -1
+        if depth == 0:
+            return match.end()
+    raise SwiftLexError(f"Unterminated block comment at offset {pos}")
+
+
+def _scan_interpolation(src: str, pos: int) -> int:
+    """Scan code inside \\( ... ) starting after the '(' and return the offset past ')'"""
+    depth = 1
+    while pos < len(src):
+        token, pos = _next_token(src, pos)
+        if token is None or token.kind != PUNCT:
+            continue
+        if token.text == '(':
+            depth += 1
+        elif token.text == ')':
+            depth -= 1
+            if depth == 0:
+                return pos
+    raise SwiftLexError("Unterminated string interpolation")
+
+
+def _scan_string(src: str, start: int, hashes: int) -> Token:
+    """Scan a string literal whose opening '#'s start at `start`"""
+    quote = start + hashes
+    multiline = src.startswith('"""', quote)
+    body_start = quote + (3 if multiline else 1)
+    stop = _string_stop_pattern(hashes, multiline)
+    escape_len = 1 + hashes
+    interpolated = False
+    pos = body_start
+
+    while True:
+        match = stop.search(src, pos)
+        if match is None or match.lastgroup == 'newline':
+            raise SwiftLexError(f"Unterminated string literal at offset {start}")
+        if match.lastgroup == 'close':
+            end = match.end()
+            return Token(
+                kind=STRING,
+                start=start,
+                end=end,
+                text=src[start:end],
+                body=src[body_start:match.start()],
+                hashes=hashes,
+                multiline=multiline,
+                interpolated=interpolated,
+            )
+        # Escape sequence: interpolation or a single escaped character
+        after = match.start() + escape_len
+        if src.startswith('(', after):
+            interpolated = True
+            pos = _scan_interpolation(src, after + 1)
+        else:
+            pos = after + 1
+
+
+def _next_token(src: str, pos: int) -> Tuple['Token | None', int]:
+    """Return (token, next_offset); token is None for whitespace and comments"""
+    match = _TRIVIA_OR_TOKEN.match(src, pos)
+    kind = match.lastgroup
+    if kind in ('ws', 'line_comment'):
+        return None, match.end()
+    if kind == 'block_comment':
+        return None, _skip_block_comment(src, pos)
+    if kind == 'string':
+        token = _scan_string(src, pos, match.end() - pos - 1)
+        return token, token.end
+    return Token(kind=kind, start=pos, end=match.end(), text=match.group()), match.end()
+
+
+def tokenize(src: str) -> Iterator[Token]:
+    """Yield the significant tokens of a Swift source, skipping trivia"""
+    pos = 0
+    length = len(src)
+    while pos < length:
+        token, pos = _next_token(src, pos)
+        if token is not None:
+            yield token
+
+
+_SIMPLE_ESCAPES = {'0': '\0', '\\': '\\', 't': '\t', 'n': '\n', 'r': '\r', '"': '"', "'": "'"}
+
+
+def decode_string(token: Token) -> str:
+    """Best-effort decoding of a literal's contents (interpolations are kept verbatim)"""
+    body = token.body
+    if token.multiline:
+        body = _strip_multiline_indent(body)
+
+    escape = '\\' + '#' * token.hashes
+    if escape not in body:
+        return body
+
+    out = []
+    pos = 0
+    while True:
+        idx = body.find(escape, pos)
+        if idx < 0:
+            out.append(body[pos:])
+            return ''.join(out)
+        out.append(body[pos:idx])
+        pos = idx + len(escape)
+        char = body[pos:pos + 1]
+        if char in _SIMPLE_ESCAPES:
+            out.append(_SIMPLE_ESCAPES[char])
+            pos += 1
+        elif char == 'u' and body.startswith('{', pos + 1):
+            match = _UNICODE_ESCAPE.match(body, pos + 1)
+            scalar = int(match.group(1), 16) if match else -1
+            if not (0 <= scalar <= 0x10FFFF) or 0xD800 <= scalar <= 0xDFFF:
+                end = body.find('}', pos)
+                bad = body[idx:end + 1] if end >= 0 else body[idx:]
+                raise SwiftLexError(f"Invalid unicode escape {bad!r} in string literal at offset {token.start}")
+            out.append(chr(scalar))
+            pos = match.end()
+        elif char == '\n':
+            # Line continuation inside a multi-line literal
+            pos += 1
+        else:
+            out.append(escape)
+
+
+def replace_interpolations(token: Token, placeholder: str) -> str:
+    """Decode a literal with every \\( ... ) interpolation replaced by `placeholder`"""
+    if not token.interpolated:
+        return decode_string(token)
+
+    opener = '\\' + '#' * token.hashes + '('
+    body = token.body
+    pieces = []
+    pos = 0
+    while True:
+        idx = body.find(opener, pos)
+        if idx < 0:
+            pieces.append(body[pos:])
+            break
+        # An escaped backslash directly before the opener is not an interpolation
+        backslashes = len(body[:idx]) - len(body[:idx].rstrip('\\'))
+        if token.hashes == 0 and backslashes % 2:
+            pieces.append(body[pos:idx + len(opener)])
+            pos = idx + len(opener)
+            continue
+        pieces.append(body[pos:idx])
+        pieces.append(placeholder)
+        pos = _scan_interpolation(body, idx + len(opener))
+
+    stripped = Token(kind=STRING, start=token.start, end=token.end, text=token.text,
+                     body=''.join(pieces), hashes=token.hashes, multiline=token.multiline)
+    return decode_string(stripped)
+
+
+def _strip_multiline_indent(body: str) -> str:
+    """Drop the delimiter lines and the closing delimiter's indentation"""
+    if body.startswith('\n'):
+        body = body[1:]
+    last_newline = body.rfind('\n')
+    indent = body[last_newline + 1:]
+    body = body[:max(last_newline, 0)]
+    if not indent:
+        return body
+    return '\n'.join(
+        line[len(indent):] if line.startswith(indent) else line.lstrip(' \t')
+        for line in body.split('\n')
+    )
+
+
+def escape_string(text: str) -> str:
+    """Escape text for use inside a single-line Swift string literal"""
+    return (text.replace('\\', '\\\\')
+                .replace('"', '\\"')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r')
+                .replace('\t', '\\t'))
+
+
+class LineIndex:
+    """Maps character offsets to 1-based line numbers"""
+
+    def __init__(self, src: str):
+        self._starts: List[int] = [0]
+        self._starts.extend(m.end() for m in re.finditer('\n', src))
+
+    def line_of(self, offset: int) -> int:
+        return bisect.bisect_right(self._starts, offset)
+
+
+def apply_edits(src: str, edits: List[Tuple[int, int, str]]) -> str:
+    """Apply non-overlapping (start, end, replacement) splices in a single pass"""
+    pieces = []
+    pos = 0
+    for start, end, replacement in sorted(edits):
+        if start < pos:
+            raise ValueError(f"Overlapping edit at offset {start}")
+        pieces.append(src[pos:start])
+        pieces.append(replacement)
+        pos = end
+    pieces.append(src[pos:])
+    return ''.join(pieces)
@@ -1,7 +1,11 @@
 #!/bin/bash
 
 # Model Download Test Server
-# Simple HTTP server for testing model downloads locally
+# Creates dummy models and serves them with Scripts/model_test_server.py
+# (threaded, byte ranges, ETags, bandwidth/latency shaping, fault injection).
+# Extra arguments are passed through, e.g.:
+#   ./Scripts/test_model_server.sh --rate 2M --latency 150
+#   ./Scripts/test_model_server.sh --drop-after 1M --drop-probability 0.5
 
 echo "════════════════════════════════════════════════════"
 echo "  Itori Model Download Test Server"
@@ -11,6 +15,7 @@ echo ""
 # Configuration
 PORT=8000
 MODELS_DIR="./test_models"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 
 # Create models directory if it doesn't exist
 mkdir -p "$MODELS_DIR"
@@ -51,19 +56,14 @@ echo "  2. Run the app"
 echo "  3. Go to Settings → AI"
 echo "  4. Click Download for macOS or iOS model"
 echo ""
-echo "Press Ctrl+C to stop the server"
+echo "Shaping / fault options: python3 $SCRIPT_DIR/model_test_server.py --help"
 echo "════════════════════════════════════════════════════"
 echo ""
 
-# Change to models directory
-cd "$MODELS_DIR"
-
-# Start Python HTTP server
+# Start the test server
 if command -v python3 &> /dev/null; then
-    python3 -m http.server $PORT
-elif command -v python &> /dev/null; then
-    python -m SimpleHTTPServer $PORT
+    exec python3 "$SCRIPT_DIR/model_test_server.py" --dir "$MODELS_DIR" --port "$PORT" "$@"
 else
-    echo "Error: Python not found. Please install Python to run this server."
+    echo "Error: Python 3 not found. Please install Python 3 to run this server."
     exit 1
 fi
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+String Catalog Index
+Hashed index over Localizable.xcstrings used by the localization scripts.
+
+Keys and English values are indexed once at load time, so key lookups,
+"is this English text already translated under some key" checks and
+collision resolution are dictionary hits instead of catalog scans. New
+entries (and removals) are staged in memory and written back in one batched
+save.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_CATALOG = Path(__file__).parent.parent / "SharedCore" / "DesignSystem" / "Localizable.xcstrings"
+
+
+def english_value(key: str, entry: Dict) -> str:
+    """English text for a catalog entry; keys without an `en` unit are their own value"""
+    unit = entry.get('localizations', {}).get('en', {}).get('stringUnit', {})
+    return unit.get('value', key)
+
+
+class CatalogIndex:
+    """Key and value index over an .xcstrings catalog"""
+
+    def __init__(self, path: Path, data: Dict):
+        self.path = path
+        self.data = data
+        self.strings: Dict[str, Dict] = data.setdefault('strings', {})
+        self.values: Dict[str, str] = {}
+        self.keys_by_value: Dict[str, List[str]] = {}
+        self.pending: Dict[str, Dict] = {}
+        self.removed = 0
+        for key, entry in self.strings.items():
+            self._index(key, english_value(key, entry))
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_CATALOG) -> 'CatalogIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(Path(path), json.load(f))
+
+    def _index(self, key: str, value: str):
+        self.values[key] = value
+        self.keys_by_value.setdefault(value, []).append(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def existing_key_for(self, value: str, preferred_prefix: str = '') -> Optional[str]:
+        """
+        Return a key already holding this exact English value, if any.
+        Keys sharing `preferred_prefix` win; ties break alphabetically so the
+        choice does not depend on catalog order.
+        """
+        keys = self.keys_by_value.get(value)
+        if not keys:
+            return None
+        same_prefix = [k for k in keys if preferred_prefix and k.startswith(preferred_prefix)]
+        return min(same_prefix or keys)
+
+    def resolve_key(self, proposed: str, value: str, comment: str = '') -> str:
+        """
+        Pick the key to use for `value`, staging a new catalog entry when needed.
+
+        - The proposed key is reused when it already maps to the same value.
+        - Any other key with the identical English value is reused.
+        - A proposed key taken by a different value gets the first free
+          numeric suffix (`key.2`, `key.3`, ...).
+        """
+        if self.values.get(proposed) == value:
+            return proposed
+
+        category = proposed.split('.', 1)[0] + '.'
+        existing = self.existing_key_for(value, preferred_prefix=category)
+        if existing is not None:
+            return existing
+
+        key = proposed
+        suffix = 2
+        while key in self.values:
+            key = f"{proposed}.{suffix}"
+            suffix += 1
+
+        self._index(key, value)
+        self.pending[key] = {
+            'comment': comment,
+            'localizations': {
+                'en': {'stringUnit': {'state': 'translated', 'value': value}}
+            },
+        }
+        return key
+
+    def has_english_unit(self, key: str) -> bool:
+        return 'en' in self.strings.get(key, {}).get('localizations', {})
+
+    def drop(self, keys):
+        """Remove entries from the catalog and the index (written on save)"""
+        for key in keys:
+            if self.strings.pop(key, None) is None:
+                continue
+            value = self.values.pop(key)
+            siblings = self.keys_by_value[value]
+            siblings.remove(key)
+            if not siblings:
+                del self.keys_by_value[value]
+            self.removed += 1
+
+    def save(self):
+        """Append all staged entries, apply removals and write the catalog once"""
+        if not self.pending and not self.removed:
+            return
+        self.strings.update(self.pending)
+        self.pending = {}
+        self.removed = 0
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+            f.write('\n')
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+TestGen Answer Distribution Monitor
+
+The distribution/ fixtures judge one test at a time (all answers A, 80% C,
+ABAB...). A model can pass every per-test check and still be biased across
+thousands of tests: favouring B a few points, opening every test with A, or
+never repeating an answer twice in a row. This aggregates answer keys over a
+stream of tests with counters whose size does not depend on how many tests
+have been seen:
+
+- answers:      per-index frequencies, chi-square against uniform (3 df)
+- transitions:  each answer -> the next answer in the same test, chi-square
+                test of independence (9 df), so a model that merely favours
+                one letter is not also reported as sequential
+- positions:    per-index frequencies of the first POSITIONS questions, each
+                tested against the overall answer mix (so only a position that
+                differs from the rest is reported) with a Bonferroni-corrected
+                alpha
+- runs:         histogram of same-answer run lengths (last bucket is open),
+                mean run length vs 4/3 for uniform independent answers
+
+A bias is reported only when a test is significant at --alpha *and* its
+effect size (Cohen's w = sqrt(chi2 / n)) reaches --min-effect, so a large
+enough sample does not flag a negligible deviation.
+
+A snapshot (JSON line) is emitted every --every tests and once at the end.
+bulk_validate.py feeds the same aggregator with --distribution.
+
+Usage:
+    python Tests/Fixtures/TestGen/answer_distribution.py outputs.jsonl
+    python Tests/Fixtures/TestGen/answer_distribution.py dumps/ --every 1000 --snapshots snapshots.jsonl
+    python Tests/Fixtures/TestGen/bulk_validate.py outputs.jsonl -o results.jsonl --distribution snapshots.jsonl
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from testgen_validator import ANSWER_LETTERS, CHOICE_COUNT, TestGenValidator, ValidationStatus
+
+POSITIONS = 10
+MAX_RUN = 6
+ALPHA = 0.001
+MIN_EFFECT = 0.1
+SNAPSHOT_EVERY = 1000
+# Mean run length of independent uniform answers: 1 / (1 - 1/CHOICE_COUNT)
+EXPECTED_MEAN_RUN = CHOICE_COUNT / (CHOICE_COUNT - 1)
+
+LETTER_INDEX = {letter: index for index, letter in enumerate(ANSWER_LETTERS)}
+
+
+# MARK: - Statistics
+
+def chi2_sf(statistic: float, df: int) -> float:
+    """P(X >= statistic) for a chi-square variable with integer df (closed form, no scipy)"""
+    if statistic <= 0:
+        return 1.0
+    half = statistic / 2
+    if df % 2 == 0:
+        term = total = 1.0
+        for k in range(1, df // 2):
+            term *= half / k
+            total += term
+        return min(1.0, math.exp(-half) * total)
+    tail = math.erfc(math.sqrt(half))
+    if df == 1:
+        return tail
+    term = total = 1.0
+    for k in range(1, (df - 1) // 2):
+        term *= statistic / (2 * k + 1)
+        total += term
+    return min(1.0, tail + math.sqrt(2 * statistic / math.pi) * math.exp(-half) * total)
+
+
+def chi_square(observed: Sequence[int], shares: Optional[Sequence[float]] = None) -> float:
+    """Pearson statistic of `observed` against `shares` of the total (equal shares by default)"""
+    total = sum(observed)
+    if not total:
+        return 0.0
+    shares = shares or [1 / len(observed)] * len(observed)
+    return sum((count - total * share) ** 2 / (total * share) for count, share in zip(observed, shares) if share)
+
+
+def independence_chi_square(table: Sequence[Sequence[int]]) -> Tuple[float, int]:
+    """Pearson statistic and df of a contingency table against row/column independence"""
+    rows = [sum(row) for row in table]
+    columns = [sum(column) for column in zip(*table)]
+    total = sum(rows)
+    statistic = sum(
+        (table[i][j] - rows[i] * columns[j] / total) ** 2 / (rows[i] * columns[j] / total)
+        for i in range(len(rows)) if rows[i] for j in range(len(columns)) if columns[j]
+    ) if total else 0.0
+    df = max(0, (sum(1 for r in rows if r) - 1) * (sum(1 for c in columns if c) - 1))
+    return statistic, df
+
+
+def _test(statistic: float, df: int, n: int) -> Dict[str, Any]:
+    return {
+        "chi2": round(statistic, 3),
+        "df": df,
+        "p": chi2_sf(statistic, df),
+        "effect": round(math.sqrt(statistic / n), 4) if n else 0.0,
+        "n": n,
+    }
+
+
+# MARK: - Aggregator
+
+class AnswerDistribution:
+    """Constant-size answer key statistics over any number of tests"""
+
+    def __init__(self, positions: int = POSITIONS, max_run: int = MAX_RUN,
+                 alpha: float = ALPHA, min_effect: float = MIN_EFFECT):
+        self.alpha = alpha
+        self.min_effect = min_effect
+        self.tests = 0
+        self.answers = [0] * CHOICE_COUNT
+        self.transitions = [[0] * CHOICE_COUNT for _ in range(CHOICE_COUNT)]
+        self.positions = [[0] * CHOICE_COUNT for _ in range(positions)]
+        self.runs = [0] * max_run
+        self.codes = Counter()  # per-test DISTRIBUTION_* verdicts, a fixed set of codes
+
+    def add(self, key: str, code: Optional[str] = None):
+        """Record one test's answer key ("ABDC..."); `code` is its per-test distribution verdict"""
+        indices = [LETTER_INDEX[letter] for letter in key]
+        if not indices:
+            return
+        self.tests += 1
+        if code:
+            self.codes[code] += 1
+        longest = len(self.runs)
+        run = 0
+        previous = None
+        for position, index in enumerate(indices):
+            self.answers[index] += 1
+            if position < len(self.positions):
+                self.positions[position][index] += 1
+            if previous is None:
+                run = 1
+            elif index == previous:
+                run += 1
+                self.transitions[previous][index] += 1
+            else:
+                self.runs[min(run, longest) - 1] += 1
+                run = 1
+                self.transitions[previous][index] += 1
+            previous = index
+        self.runs[min(run, longest) - 1] += 1
+
+    @property
+    def questions(self) -> int:
+        return sum(self.answers)
+
+    def tests_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Chi-square results for answers, transitions and the most skewed position"""
+        answers = _test(chi_square(self.answers), CHOICE_COUNT - 1, self.questions)
+        statistic, df = independence_chi_square(self.transitions)
+        transitions = _test(statistic, df, sum(map(sum, self.transitions)))
+        shares = [count / self.questions for count in self.answers] if self.questions else None
+        position = None
+        for number, row in enumerate(self.positions):
+            if not sum(row):
+                break
+            result = _test(chi_square(row, shares), CHOICE_COUNT - 1, sum(row))
+            if position is None or result["p"] < position["p"]:
+                position = dict(result, position=number)
+        return {"answers": answers, "transitions": transitions, "position": position}
+
+    def biases(self, summary: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
+        """Human-readable model-level biases that are both significant and non-negligible"""
+        summary = summary or self.tests_summary()
+        found = []
+
+        def flagged(result, alpha):
+            return result and result["p"] < alpha and result["effect"] >= self.min_effect
+
+        answers = summary["answers"]
+        if flagged(answers, self.alpha):
+            top = max(range(CHOICE_COUNT), key=self.answers.__getitem__)
+            found.append(f"answers: {ANSWER_LETTERS[top]} is {100 * self.answers[top] / answers['n']:.1f}% "
+                         f"of {answers['n']:,} answers (w={answers['effect']:.2f}, p={answers['p']:.1e})")
+
+        transitions = summary["transitions"]
+        if flagged(transitions, self.alpha):
+            n = transitions["n"]
+            repeats = sum(self.transitions[i][i] for i in range(CHOICE_COUNT))
+            expected = sum(sum(self.transitions[i]) * sum(row[i] for row in self.transitions)
+                           for i in range(CHOICE_COUNT)) / n
+            found.append(f"transitions: next answer depends on the previous one; "
+                         f"{100 * repeats / n:.1f}% repeats vs {100 * expected / n:.1f}% expected "
+                         f"(w={transitions['effect']:.2f}, p={transitions['p']:.1e})")
+
+        position = summary["position"]
+        if flagged(position, self.alpha / len(self.positions)):
+            row = self.positions[position["position"]]
+            top = max(range(CHOICE_COUNT), key=row.__getitem__)
+            found.append(f"position: question {position['position'] + 1} is {ANSWER_LETTERS[top]} in "
+                         f"{100 * row[top] / position['n']:.1f}% of tests vs "
+                         f"{100 * self.answers[top] / self.questions:.1f}% overall "
+                         f"(w={position['effect']:.2f}, p={position['p']:.1e})")
+        return found
+
+    def mean_run(self) -> float:
+        """Mean run length; the open last bucket counts as its lower bound"""
+        runs = sum(self.runs)
+        return sum((length + 1) * count for length, count in enumerate(self.runs)) / runs if runs else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        summary = self.tests_summary()
+        questions = self.questions
+        runs = {str(length + 1): count for length, count in enumerate(self.runs)}
+        runs[f"{len(self.runs)}+"] = runs.pop(str(len(self.runs)))
+        return {
+            "tests": self.tests,
+            "questions": questions,
+            "shares": {letter: round(count / questions, 4) if questions else 0.0
+                       for letter, count in zip(ANSWER_LETTERS, self.answers)},
+            "tests_flagged": dict(self.codes),
+            "runs": {"histogram": runs, "mean": round(self.mean_run(), 4),
+                     "expected_mean": round(EXPECTED_MEAN_RUN, 4)},
+            "chi2": summary,
+            "bias": self.biases(summary),
+        }
+
+
+def answer_key(questions: Sequence[Dict[str, Any]]) -> Optional[str]:
+    """Answer letters of a test, or None when an index is outside 0..CHOICE_COUNT-1"""
+    indices = [q["correct_choice_index"] for q in questions]
+    if not all(0 <= index < CHOICE_COUNT for index in indices):
+        return None
+    return "".join(ANSWER_LETTERS[index] for index in indices)
+
+
+class SnapshotWriter:
+    """Emits a JSON-line snapshot every `every` tests and a final one on close()"""
+
+    def __init__(self, distribution: AnswerDistribution, out, every: int = SNAPSHOT_EVERY):
+        self.distribution = distribution
+        self.out = out
+        self.every = every
+        self.last = 0
+
+    def add(self, key: str, code: Optional[str] = None):
+        self.distribution.add(key, code)
+        if self.every and self.distribution.tests - self.last >= self.every:
+            self.emit()
+
+    def emit(self) -> Dict[str, Any]:
+        snapshot = self.distribution.snapshot()
+        self.last = self.distribution.tests
+        if self.out is not None:
+            self.out.write(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")))
+            self.out.write("\n")
+            self.out.flush()
+        return snapshot
+
+    def close(self) -> Dict[str, Any]:
+        """Emit the final snapshot unless the last periodic one already covers every test"""
+        if self.last and self.last == self.distribution.tests:
+            return self.distribution.snapshot()
+        return self.emit()
+
+
+def print_report(snapshot: Dict[str, Any], log=sys.stdout):
+    print(f"\n🎯 Answer distribution: {snapshot['tests']:,} tests, {snapshot['questions']:,} questions", file=log)
+    if not snapshot["questions"]:
+        return
+    for letter, share in snapshot["shares"].items():
+        bar = "█" * round(60 * share)
+        print(f"   {letter}  {100 * share:5.1f}%  {bar}", file=log)
+    chi2 = snapshot["chi2"]
+    for name in ("answers", "transitions", "position"):
+        result = chi2[name]
+        if result:
+            label = f"position {result['position'] + 1}" if name == "position" else name
+            print(f"   {label:<12} chi2={result['chi2']:>10.2f}  df={result['df']:>2}  "
+                  f"p={result['p']:.2e}  w={result['effect']:.3f}", file=log)
+    runs = snapshot["runs"]
+    print(f"   runs         mean {runs['mean']:.3f} (uniform {runs['expected_mean']:.3f})  "
+          + "  ".join(f"{length}:{count:,}" for length, count in runs["histogram"].items()), file=log)
+    if snapshot["tests_flagged"]:
+        print("   per-test     " + ", ".join(f"{code} {count:,}"
+                                           for code, count in sorted(snapshot["tests_flagged"].items())), file=log)
+    if snapshot["bias"]:
+        print("\n❌ Model-level bias detected:", file=log)
+        for bias in snapshot["bias"]:
+            print(f"   {bias}", file=log)
+    else:
+        print("\n✅ No model-level answer bias detected.", file=log)
+
+
+def main():
+    from bulk_validate import iter_records
+
+    parser = argparse.ArgumentParser(description="Stream answer distribution statistics across TestGen outputs")
+    parser.add_argument('source', help="JSONL file, directory of outputs, or - for stdin")
+    parser.add_argument('--every', type=int, default=SNAPSHOT_EVERY, help="Tests between snapshots (0: final only)")
+    parser.add_argument('--snapshots', type=Path, help="Write snapshots as JSONL")
+    parser.add_argument('--alpha', type=float, default=ALPHA, help="Significance level for each test")
+    parser.add_argument('--min-effect', type=float, default=MIN_EFFECT,
+                        help="Smallest Cohen's w reported as a bias")
+    args = parser.parse_args()
+
+    if args.source != "-" and not Path(args.source).exists():
+        print(f"❌ Not found: {args.source}")
+        return 1
+
+    # Schema only: tests that fail the per-test distribution check are exactly the ones to count
+    validator = TestGenValidator(groups=("schema",))
+    distribution = AnswerDistribution(alpha=args.alpha, min_effect=args.min_effect)
+    out = open(args.snapshots, "w", encoding="utf-8") if args.snapshots else None
+    writer = SnapshotWriter(distribution, out, args.every)
+    skipped = 0
+    out_of_range = 0
+    start = time.perf_counter()
+    try:
+        for _, output in iter_records(args.source):
+            result = validator.validate(output) if output is not None else None
+            if result is None or result.status == ValidationStatus.FAIL:
+                skipped += 1
+                continue
+            key = answer_key(result.payload["questions"])
+            if key is None:
+                # Schema-valid, but an answer index no choice letter maps to
+                out_of_range += 1
+                continue
+            writer.add(key)
+        snapshot = writer.close()
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"📁 {distribution.tests:,} tests in {elapsed:.2f}s "
+          f"({distribution.tests / elapsed if elapsed else 0:,.0f} tests/sec), "
+          f"{skipped:,} skipped (schema failures), {out_of_range:,} skipped (answer index out of range)")
+    print_report(snapshot)
+    if args.snapshots:
+        print(f"\n💾 Snapshots saved to: {args.snapshots}")
+    return 1 if snapshot["bias"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
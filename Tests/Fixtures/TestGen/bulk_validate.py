@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+TestGen Bulk Validation
+
+Replays large dumps of LLM outputs through the TestGen validator to measure
+failure rates.
+
+Inputs are streamed, never loaded whole:
+- a JSONL file (or `-` for stdin) where each line is either a JSON string (the
+  raw output) or an object with the output under "output"/"input"/"completion"
+  and an optional "id"
+- a directory, where every file is one raw output (walked in sorted order)
+
+Records are validated in batches across a process pool with a bounded number
+of batches in flight, and results are written in input order as compact JSONL:
+
+    {"id":"dump.jsonl:17","status":"fail","code":"INVALID_JSON","regen":true}
+
+A record the validator itself crashes on is reported as status "error" with
+code VALIDATOR_CRASH (and the exception under "error"), and the replay goes on.
+
+A histogram of error codes and the throughput are printed to stderr. With
+--distribution, each test's answer key is also fed to the streaming
+AnswerDistribution monitor (answer_distribution.py), whose snapshots are
+written to the given JSONL file and whose final report follows the histogram.
+
+Usage:
+    python Tests/Fixtures/TestGen/bulk_validate.py outputs.jsonl > results.jsonl
+    python Tests/Fixtures/TestGen/bulk_validate.py dumps/ -o results.jsonl -j 8
+    cat outputs.jsonl | python Tests/Fixtures/TestGen/bulk_validate.py - --groups schema content
+    python Tests/Fixtures/TestGen/bulk_validate.py outputs.jsonl -o results.jsonl --distribution snapshots.jsonl
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from answer_distribution import SNAPSHOT_EVERY, AnswerDistribution, SnapshotWriter, answer_key, print_report
+from testgen_validator import ALL_GROUPS, RULE_GROUPS, TestGenValidator, ValidationResult
+
+OUTPUT_FIELDS = ("output", "input", "completion", "text")
+UNREADABLE = "UNREADABLE_RECORD"
+VALIDATOR_CRASH = "VALIDATOR_CRASH"
+
+# (record id, raw output or None when the record itself could not be read)
+Record = Tuple[str, Optional[str]]
+# (answer key, per-test DISTRIBUTION_* code or None)
+Answers = Tuple[str, Optional[str]]
+
+
+# MARK: - Input streams
+
+def _record_from_line(line: str, record_id: str) -> Record:
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError:
+        return record_id, None
+    if isinstance(value, str):
+        return record_id, value
+    if isinstance(value, dict):
+        if "id" in value:
+            record_id = str(value["id"])
+        for key in OUTPUT_FIELDS:
+            if isinstance(value.get(key), str):
+                return record_id, value[key]
+    return record_id, None
+
+
+def iter_jsonl(path: str) -> Iterator[Record]:
+    name = "stdin" if path == "-" else Path(path).name
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", errors="surrogateescape")
+    try:
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                yield _record_from_line(line, f"{name}:{number}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def iter_directory(root: Path) -> Iterator[Record]:
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for filename in sorted(files):
+            if filename.startswith("."):
+                continue
+            path = Path(directory) / filename
+            try:
+                yield str(path.relative_to(root)), path.read_text(encoding="utf-8")
+            except (OSError, UnicodeDecodeError):
+                yield str(path.relative_to(root)), None
+
+
+def iter_records(source: str) -> Iterator[Record]:
+    if source != "-" and Path(source).is_dir():
+        return iter_directory(Path(source))
+    return iter_jsonl(source)
+
+
+def iter_batches(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# MARK: - Workers
+
+_validator: Optional[TestGenValidator] = None
+# Schema-only validator, set when answer keys are collected for --distribution
+_schema: Optional[TestGenValidator] = None
+
+
+def _init_worker(groups: Sequence[str], answers: bool = False):
+    global _validator, _schema
+    _validator = TestGenValidator(groups=groups)
+    _schema = TestGenValidator(groups=("schema",)) if answers else None
+
+
+def _answers(output: str, result: ValidationResult) -> Optional[Answers]:
+    """
+    Answer key of a decodable test. Tests rejected by the distribution rules
+    have no payload, but they are exactly the ones the monitor must count, so
+    they are decoded again with the schema rules only.
+    """
+    codes = [i["code"] for i in (result.details or {}).get("issues", ()) if i["code"].startswith("DISTRIBUTION_")]
+    payload = result.payload
+    if payload is None and codes:
+        payload = _schema.validate(output).payload
+    if not payload:
+        return None
+    key = answer_key(payload["questions"])
+    if key is None:
+        return None
+    return key, codes[0] if codes else None
+
+
+def validate_batch(batch: List[Record]) -> List[Tuple[str, str, Optional[str], Optional[Answers]]]:
+    """Validate one batch and return (compact JSONL line, status, code, answers) per output"""
+    lines = []
+    for record_id, output in batch:
+        answers = None
+        if output is None:
+            row = {"id": record_id, "status": "error", "code": UNREADABLE, "regen": False}
+        else:
+            try:
+                result = _validator.validate(output)
+                row = {
+                    "id": record_id,
+                    "status": result.status.value,
+                    "code": result.error_code,
+                    "regen": result.should_trigger_regeneration,
+                }
+                if _schema is not None:
+                    answers = _answers(output, result)
+            except Exception as e:
+                # One pathological record must not abort the whole replay
+                row = {"id": record_id, "status": "error", "code": VALIDATOR_CRASH, "regen": False,
+                       "error": f"{type(e).__name__}: {e}"[:500]}
+                answers = None
+        lines.append((json.dumps(row, ensure_ascii=False, separators=(",", ":")), row["status"], row["code"],
+                      answers))
+    return lines
+
+
+def run(source: str, out, groups: Sequence[str], workers: int, batch_size: int,
+        distribution: Optional[SnapshotWriter] = None) -> Tuple[Counter, Counter, int]:
+    """
+    Stream `source` through the pool, writing results to `out` in input order.
+    At most 2 × workers batches are queued, so memory does not grow with the input.
+    Answer keys go to `distribution` when given.
+    """
+    statuses = Counter()
+    codes = Counter()
+    total = 0
+
+    def drain(lines):
+        nonlocal total
+        for line, status, code, answers in lines:
+            out.write(line)
+            out.write("\n")
+            statuses[status] += 1
+            if code:
+                codes[code] += 1
+            if answers and distribution:
+                distribution.add(*answers)
+        total += len(lines)
+
+    batches = iter_batches(iter_records(source), batch_size)
+    collect = distribution is not None
+    if workers <= 1:
+        _init_worker(groups, collect)
+        for batch in batches:
+            drain(validate_batch(batch))
+        return statuses, codes, total
+
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tuple(groups), collect)) as pool:
+        for batch in batches:
+            pending.append(pool.submit(validate_batch, batch))
+            if len(pending) >= workers * 2:
+                drain(pending.popleft().result())
+        while pending:
+            drain(pending.popleft().result())
+    return statuses, codes, total
+
+
+def print_summary(statuses: Counter, codes: Counter, total: int, elapsed: float, limit: int):
+    log = sys.stderr
+    print(f"\n📊 Validated {total:,} outputs in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed else 0:,.0f} outputs/sec)", file=log)
+    if not total:
+        return
+    for status in ("pass", "warn", "fail", "error"):
+        if statuses[status]:
+            print(f"   {status:5}  {statuses[status]:>9,}  {100 * statuses[status] / total:5.1f}%", file=log)
+
+    if codes:
+        print("\nError codes:", file=log)
+        width = max(len(code) for code, _ in codes.most_common(limit))
+        peak = codes.most_common(1)[0][1]
+        for code, count in codes.most_common(limit):
+            bar = "█" * max(1, round(30 * count / peak))
+            print(f"   {code:<{width}}  {count:>9,}  {100 * count / total:5.1f}%  {bar}", file=log)
+        if len(codes) > limit:
+            print(f"   ... and {len(codes) - limit} more codes", file=log)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a stream of TestGen LLM outputs")
+    parser.add_argument('source', help="JSONL file, directory of outputs, or - for stdin")
+    parser.add_argument('-o', '--output', type=Path, help="Result JSONL (default: stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (1 validates in-process)")
+    parser.add_argument('--batch-size', type=int, default=256, help="Outputs per worker task")
+    parser.add_argument('--groups', nargs='+', choices=list(RULE_GROUPS), default=list(ALL_GROUPS),
+                        help="Rule groups to run (default: all)")
+    parser.add_argument('--limit', type=int, default=20, help="Error codes shown in the histogram")
+    parser.add_argument('--distribution', type=Path, metavar='SNAPSHOTS',
+                        help="Stream answer distribution statistics, writing snapshots to this JSONL file")
+    parser.add_argument('--every', type=int, default=SNAPSHOT_EVERY, help="Tests between distribution snapshots")
+    args = parser.parse_args()
+
+    if args.source != "-" and not Path(args.source).exists():
+        print(f"❌ Not found: {args.source}", file=sys.stderr)
+        return 1
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    snapshots = open(args.distribution, "w", encoding="utf-8") if args.distribution else None
+    distribution = SnapshotWriter(AnswerDistribution(), snapshots, args.every) if snapshots else None
+    start = time.perf_counter()
+    try:
+        statuses, codes, total = run(args.source, out, args.groups, args.workers, args.batch_size, distribution)
+        final = distribution.close() if distribution else None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if snapshots is not None:
+            snapshots.close()
+    print_summary(statuses, codes, total, time.perf_counter() - start, args.limit)
+    if final is not None:
+        print_report(final, sys.stderr)
+        print(f"\n💾 Distribution snapshots saved to: {args.distribution}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+TestGen Fuzz Corpus Generator
+
+Synthesizes valid and invalid TestGen v1 payloads in the fixture format, in
+volumes the hand-written corpus cannot reach. Every case starts from a valid
+test built from the contract (unique prompts, distinct choices, rationales
+that name the answer, a balanced answer key) and gets at most one mutation,
+whose expected outcome is derived from the contract - never by asking the
+validator - so a wrong result is a validator bug, not a generator guess:
+
+    unicode      zero-width / RTL / emoji (warnings), NBSP, smart quotes,
+                 CRLF, decomposed accents (silently normalized)
+    size         prompts over the length limit or the decode field budget,
+                 hundreds of questions
+    structure    unknown top-level and (deeply) nested question keys,
+                 nulls, wrong choice counts, out-of-range indices,
+                 truncation, trailing text, wrong contract version
+    content      duplicate choices and prompts, banned phrases, topic scope
+    distribution random answer keys (skewed, constant, periodic, balanced)
+
+Cases are written as JSONL shards, one fixture object per line. Shard k is
+generated from its own fixed seed, so any shard can be regenerated alone and
+the whole corpus doubles as a reproducible benchmark workload.
+
+Usage:
+    python Tests/Fixtures/TestGen/fuzz_corpus.py                         # 10 shards x 1,000 cases
+    python Tests/Fixtures/TestGen/fuzz_corpus.py --shards 100 --seed 7   # 100k cases
+    python Tests/Fixtures/TestGen/test_harness.py --corpus Tests/Fixtures/TestGen/generated/fuzz -j 4
+"""
+
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from testgen_validator import (
+    BIO101_TOPICS, CHOICE_COUNT, CONTRACT_VERSION, DEFAULT_BUDGET, MAX_PROMPT_CHARS,
+    SKEW_THRESHOLD, MIN_PATTERN_CYCLES,
+)
+
+DEFAULT_OUTPUT = Path(__file__).parent / "generated" / "fuzz"
+
+# Vocabulary free of negations, "except", subjective/absolute words and banned phrases
+SUBJECTS = [
+    "organelle", "enzyme", "pathway", "tissue", "molecule", "structure", "process",
+    "population", "receptor", "hormone", "membrane", "pigment", "gene", "protein",
+]
+ACTIONS = [
+    "produces", "transports", "regulates", "stores", "breaks down", "synthesizes",
+    "detects", "converts", "releases", "copies", "repairs", "absorbs",
+]
+OBJECTS = [
+    "glucose", "oxygen", "carbon dioxide", "amino acids", "nucleotides", "water",
+    "light energy", "lipids", "signals", "ions", "starch", "messenger RNA",
+]
+CONTEXTS = [
+    "a plant cell", "the human liver", "a bacterium", "the small intestine", "a neuron",
+    "a leaf", "muscle tissue", "a yeast cell", "the bloodstream", "the nucleus",
+]
+ANSWERS = [
+    "Mitochondrion", "Chloroplast", "Ribosome", "Lysosome", "Nucleus", "Vacuole",
+    "Peroxisome", "Centrosome", "Cytoplasm", "Flagellum", "Cilium", "Chromosome",
+    "Hemoglobin", "Insulin", "Amylase", "Pepsin", "Collagen", "Keratin", "Myosin",
+    "Glycogen", "Cellulose", "Chlorophyll", "Melanin", "Rhodopsin", "Histone",
+]
+OFF_TOPIC = ["world_history", "calculus", "poetry", "astronomy", "macroeconomics", "music_theory"]
+
+Payload = Dict[str, Any]
+# (payload or raw output, status, error code) -- raw str when the mutation breaks JSON
+Expectation = Tuple[Any, str, str | None]
+
+
+# MARK: - Valid tests
+
+def _periodic(key: List[int]) -> bool:
+    """The contract's pattern rule: the whole key repeats a mixed unit at least MIN_PATTERN_CYCLES times"""
+    for period in range(2, len(key) // MIN_PATTERN_CYCLES + 1):
+        unit = key[:period]
+        if len(set(unit)) > 1 and all(key[i] == unit[i % period] for i in range(len(key))):
+            return True
+    return False
+
+
+def distribution_outcome(key: List[int]) -> Tuple[str, str | None]:
+    """Expected (status, code) of an answer key under the distribution rules"""
+    total = len(key)
+    if total < 2:
+        return "pass", None
+    top = max(key.count(i) for i in range(CHOICE_COUNT))
+    if total >= 3 and top == total:
+        return "fail", "DISTRIBUTION_ALL_SAME_ANSWER"
+    if top > SKEW_THRESHOLD * total + 1:
+        return "fail", "DISTRIBUTION_SKEWED"
+    if _periodic(key):
+        return "warn", "DISTRIBUTION_PATTERN_DETECTED"
+    return "pass", None
+
+
+def balanced_key(rng: random.Random, total: int) -> List[int]:
+    """A shuffled answer key with near-equal counts and no repeating pattern"""
+    key = [i % CHOICE_COUNT for i in range(total)]
+    rng.shuffle(key)
+    while distribution_outcome(key)[0] != "pass":
+        rng.shuffle(key)
+    return key
+
+
+def make_question(rng: random.Random, number: int, correct: int) -> Dict[str, Any]:
+    choices = rng.sample(ANSWERS, CHOICE_COUNT)
+    action = rng.choice(ACTIONS)
+    return {
+        "prompt": (f"Question {number + 1}: which {rng.choice(SUBJECTS)} {action} "
+                   f"{rng.choice(OBJECTS)} in {rng.choice(CONTEXTS)}?"),
+        "choices": choices,
+        "correct_choice_index": correct,
+        "rationale": f"The {choices[correct].lower()} is the answer because it {action} them there.",
+    }
+
+
+def make_test(rng: random.Random, total: int, key: List[int] | None = None) -> Payload:
+    key = key if key is not None else balanced_key(rng, total)
+    return {
+        "contract_version": CONTRACT_VERSION,
+        "topic": rng.choice(BIO101_TOPICS),
+        "questions": [make_question(rng, i, correct) for i, correct in enumerate(key)],
+    }
+
+
+# MARK: - Mutations
+
+def _question(rng, test):
+    return rng.choice(test["questions"])
+
+
+def _valid(rng):
+    return make_test(rng, rng.randint(1, 25)), "pass", None
+
+
+def _valid_large(rng):
+    return make_test(rng, rng.randint(100, 250)), "pass", None
+
+
+def _insert(rng, text: str, insert: str) -> str:
+    words = text.split(" ")
+    position = rng.randrange(1, len(words))
+    return " ".join(words[:position] + [insert + words[position]] + words[position + 1:])
+
+
+def _unicode_warning(character: str, code: str) -> Callable:
+    def mutate(rng):
+        test = make_test(rng, rng.randint(1, 20))
+        question = _question(rng, test)
+        question["prompt"] = _insert(rng, question["prompt"], character)
+        return test, "warn", code
+    return mutate
+
+
+def _unicode_emoji(rng):
+    test = make_test(rng, rng.randint(1, 20))
+    question = _question(rng, test)
+    question["prompt"] = question["prompt"][:-1] + " " + rng.choice("🧬🔬🌱🦠") + "?"
+    return test, "warn", "EMOJI_DETECTED"
+
+
+def _unicode_silent(rng):
+    """Characters the unicode stage rewrites without flagging"""
+    test = make_test(rng, rng.randint(1, 20))
+    question = _question(rng, test)
+    kind = rng.randrange(4)
+    if kind == 0:
+        question["prompt"] = question["prompt"].replace(" ", "\u00a0", rng.randint(1, 3))
+    elif kind == 1:
+        question["rationale"] = question["rationale"].replace(" the", " \u201cthe") + "\u201d"
+    elif kind == 2:
+        question["rationale"] = question["rationale"].replace(" ", "\r\n", 1)
+    else:
+        question["prompt"] = question["prompt"].replace("which", "which cafe\u0301", 1)
+    return test, "pass", None
+
+
+def _oversized_prompt(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    question = _question(rng, test)
+    question["prompt"] += " in detail" * ((MAX_PROMPT_CHARS + rng.randint(1, 4000)) // 10)
+    return test, "fail", "PROMPT_TOO_LONG"
+
+
+def _field_over_budget(rng):
+    test = make_test(rng, rng.randint(1, 5))
+    question = _question(rng, test)
+    field = rng.choice(["prompt", "rationale"])
+    question[field] += "x" * (DEFAULT_BUDGET.max_field_chars + rng.randint(1, 5000))
+    return test, "fail", "FIELD_TOO_LARGE"
+
+
+def _nested(rng, depth: int) -> Any:
+    value: Any = rng.choice(["hard", 3, None, True])
+    for _ in range(depth):
+        value = {"level": value} if rng.random() < 0.5 else [value]
+    return value
+
+
+def _unknown_question_key(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    _question(rng, test)[rng.choice(["difficulty", "hint", "meta", "bloomLevel"])] = _nested(rng, rng.randint(0, 20))
+    return test, "fail", "UNKNOWN_QUESTION_KEY"
+
+
+def _deep_nesting(rng):
+    """Nesting past the decoder's recursion limit; spliced in as text since json.dumps would recurse too"""
+    test = make_test(rng, rng.randint(1, 3))
+    _question(rng, test)["meta"] = "@nested@"
+    depth = rng.randint(2000, 5000)
+    raw = json.dumps(test, ensure_ascii=False).replace('"@nested@"', "[" * depth + "null" + "]" * depth)
+    return raw, "fail", "NESTING_TOO_DEEP"
+
+
+def _unknown_top_level_key(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    test[rng.choice(["metadata", "model", "notes"])] = _nested(rng, rng.randint(0, 5))
+    return test, "fail", "UNKNOWN_TOP_LEVEL_KEY"
+
+
+def _null_field(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    _question(rng, test)[rng.choice(["prompt", "choices", "correct_choice_index", "rationale"])] = None
+    return test, "fail", "NULL_VALUE_NOT_ALLOWED"
+
+
+def _wrong_choice_count(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    question = _question(rng, test)
+    if rng.random() < 0.5:
+        question["choices"] = question["choices"][:3]
+        question["correct_choice_index"] = min(question["correct_choice_index"], 2)
+    else:
+        question["choices"].append(rng.choice([a for a in ANSWERS if a not in question["choices"]]))
+    return test, "fail", "INVALID_CHOICE_COUNT"
+
+
+def _index_out_of_bounds(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    _question(rng, test)["correct_choice_index"] = rng.choice([-1, 4, 5, 9, 100])
+    return test, "fail", "CORRECT_INDEX_OUT_OF_BOUNDS"
+
+
+def _duplicate_choice(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    question = _question(rng, test)
+    choices = question["choices"]
+    source, target = rng.sample([i for i in range(CHOICE_COUNT) if i != question["correct_choice_index"]], 2)
+    choices[target] = choices[source].upper()
+    return test, "fail", "DUPLICATE_CHOICES_CASE_INSENSITIVE"
+
+
+def _duplicate_prompt(rng):
+    test = make_test(rng, rng.randint(2, 20))
+    first, second = rng.sample(range(len(test["questions"])), 2)
+    test["questions"][second]["prompt"] = test["questions"][first]["prompt"]
+    return test, "fail", "DUPLICATE_PROMPT_EXACT"
+
+
+def _banned_phrase(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    question = _question(rng, test)
+    wrong = rng.choice([i for i in range(CHOICE_COUNT) if i != question["correct_choice_index"]])
+    question["choices"][wrong] = rng.choice(["All of the above", "all of the  ABOVE"])
+    return test, "fail", "BANNED_PHRASE_ALL_OF_ABOVE"
+
+
+def _off_topic(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    test["topic"] = rng.choice(OFF_TOPIC)
+    return test, "fail", "INVALID_TOPIC"
+
+
+def _wrong_version(rng):
+    test = make_test(rng, rng.randint(1, 10))
+    test["contract_version"] = rng.choice(["2.0", "0.9", "1", "v1.0"])
+    return test, "fail", "UNSUPPORTED_CONTRACT_VERSION"
+
+
+def _truncated(rng):
+    raw = json.dumps(make_test(rng, rng.randint(1, 10)), ensure_ascii=False)
+    return raw[:rng.randrange(len(raw) - 1)], "fail", "INVALID_JSON"
+
+
+def _trailing_text(rng):
+    raw = json.dumps(make_test(rng, rng.randint(1, 10)), ensure_ascii=False)
+    return raw + rng.choice(["\nHope this helps!", " Let me know if you need more.", "\n```"]), \
+        "fail", "TRAILING_TEXT"
+
+
+def _random_distribution(rng):
+    total = rng.randint(2, 30)
+    weights = [rng.random() ** rng.choice([1, 3, 8]) for _ in range(CHOICE_COUNT)]
+    if rng.random() < 0.3:
+        unit = [rng.randrange(CHOICE_COUNT) for _ in range(rng.randint(2, 4))]
+        key = [unit[i % len(unit)] for i in range(total)]
+    else:
+        key = rng.choices(range(CHOICE_COUNT), weights=weights, k=total)
+    status, code = distribution_outcome(key)
+    return make_test(rng, total, key), status, code
+
+
+# (name, weight, mutation)
+MUTATIONS: List[Tuple[str, int, Callable]] = [
+    ("valid", 10, _valid),
+    ("valid_large", 1, _valid_large),
+    ("unicode_zero_width", 3, _unicode_warning("\u200b", "ZERO_WIDTH_CHARACTER_DETECTED")),
+    ("unicode_rtl_mark", 3, _unicode_warning("\u200f", "RTL_MARK_DETECTED")),
+    ("unicode_emoji", 3, _unicode_emoji),
+    ("unicode_silent", 4, _unicode_silent),
+    ("oversized_prompt", 3, _oversized_prompt),
+    ("field_over_budget", 1, _field_over_budget),
+    ("unknown_question_key", 3, _unknown_question_key),
+    ("deep_nesting", 1, _deep_nesting),
+    ("unknown_top_level_key", 3, _unknown_top_level_key),
+    ("null_field", 3, _null_field),
+    ("wrong_choice_count", 3, _wrong_choice_count),
+    ("index_out_of_bounds", 3, _index_out_of_bounds),
+    ("duplicate_choice", 3, _duplicate_choice),
+    ("duplicate_prompt", 3, _duplicate_prompt),
+    ("banned_phrase", 3, _banned_phrase),
+    ("off_topic", 2, _off_topic),
+    ("wrong_version", 2, _wrong_version),
+    ("truncated", 4, _truncated),
+    ("trailing_text", 3, _trailing_text),
+    ("random_distribution", 10, _random_distribution),
+]
+
+
+# MARK: - Corpus
+
+def shard_seed(seed: int, shard: int) -> int:
+    return seed * 1_000_003 + shard
+
+
+def generate_case(rng: random.Random, name: str, mutate: Callable, label: str) -> Dict[str, Any]:
+    payload, status, code = mutate(rng)
+    raw = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+    return {
+        "description": f"fuzz {label} ({name})",
+        "category": "fuzz",
+        "mutation": name,
+        "severity": "fatal" if status == "fail" else "warning" if status == "warn" else "info",
+        "input": raw,
+        "expected": {
+            "status": status,
+            "error_code": code,
+            "should_trigger_regeneration": status == "fail",
+        },
+        "notes": f"Generated by fuzz_corpus.py ({label})",
+    }
+
+
+def generate_shard(seed: int, shard: int, cases: int) -> List[Dict[str, Any]]:
+    rng = random.Random(shard_seed(seed, shard))
+    names, weights, mutations = zip(*MUTATIONS)
+    picks = rng.choices(range(len(MUTATIONS)), weights=weights, k=cases)
+    return [
+        generate_case(rng, names[pick], mutations[pick], f"seed {seed} shard {shard} case {number}")
+        for number, pick in enumerate(picks)
+    ]
+
+
+def write_corpus(output: Path, seed: int, shards: int, cases: int) -> int:
+    output.mkdir(parents=True, exist_ok=True)
+    for stale in output.glob("shard_*.jsonl"):
+        stale.unlink()
+    total = 0
+    for shard in range(shards):
+        path = output / f"shard_{shard:04d}.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for case in generate_shard(seed, shard, cases):
+                f.write(json.dumps(case, ensure_ascii=False))
+                f.write("\n")
+                total += 1
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a sharded TestGen fuzz corpus")
+    parser.add_argument('-o', '--output', type=Path, default=DEFAULT_OUTPUT,
+                        help="Shard directory (existing shards are replaced)")
+    parser.add_argument('--shards', type=int, default=10)
+    parser.add_argument('--cases', type=int, default=1000, help="Cases per shard")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    total = write_corpus(args.output, args.seed, args.shards, args.cases)
+    size = sum(p.stat().st_size for p in args.output.glob("shard_*.jsonl"))
+    print(f"🎲 Generated {total:,} cases in {args.shards} shards (seed {args.seed})")
+    print(f"💾 {args.output} ({size / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
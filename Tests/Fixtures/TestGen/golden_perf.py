@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+TestGen Golden Performance Gate
+
+Extends the golden regression gate from "still passes" to "still fast":
+
+- every golden fixture, plus the 20-question golden test scaled synthetically
+  to 200 and 2000 questions (prompts made unique, choices reshuffled so the
+  answer key stays balanced), is validated repeatedly and its median latency
+  and tracemalloc peak are recorded
+- latencies are stored relative to a fixed calibration workload timed right
+  before each batch, so clock drift cancels out and a baseline recorded on
+  one machine still means something on another
+- the gate fails when a case is more than --max-slowdown percent slower (or
+  allocates that much more) than the baseline, and for latency also at least
+  MIN_SLOWDOWN_MS slower in absolute terms (sub-millisecond cases swing by
+  tens of percent from scheduler noise alone), or when the per-question cost
+  at 2000 questions grows more than MAX_COST_GROWTH x over 200 questions,
+  which is how a quadratic duplicate or distribution check shows up
+
+Usage:
+    python Tests/Fixtures/TestGen/golden_perf.py                    # compare against the baseline
+    python Tests/Fixtures/TestGen/golden_perf.py --record           # rewrite the baseline
+    python Tests/Fixtures/TestGen/golden_perf.py --max-slowdown 15
+    python Tests/Fixtures/TestGen/test_harness.py --golden-only --perf
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from testgen_validator import TestGenValidator, ValidationStatus
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).parent / "golden_perf_baseline.json"
+SCALES = (200, 2000)
+SCALE_SOURCE = "bio101_20q_full.json"
+MAX_SLOWDOWN_PERCENT = 25.0
+# Per-question cost may grow this much between the two largest scales
+MAX_COST_GROWTH = 2.0
+# A latency regression must also cost this much per call, at the current calibration
+MIN_SLOWDOWN_MS = 0.2
+REPEATS = 5
+MIN_BATCH_SECONDS = 0.25
+
+
+# MARK: - Workload
+
+def scale_test(raw: str, target: int, seed: int = 0) -> str:
+    """Repeat a test's questions up to `target`, with unique prompts and reshuffled choices"""
+    test = json.loads(raw)
+    base = test["questions"]
+    rng = random.Random(seed)
+    questions = []
+    for number in range(target):
+        question = base[number % len(base)]
+        order = rng.sample(range(len(question["choices"])), len(question["choices"]))
+        questions.append({
+            "prompt": f"{question['prompt'][:-1]} (set {number // len(base) + 1})?",
+            "choices": [question["choices"][i] for i in order],
+            "correct_choice_index": order.index(question["correct_choice_index"]),
+            "rationale": question["rationale"],
+        })
+    return json.dumps(dict(test, questions=questions))
+
+
+def golden_cases(fixtures: List[Dict[str, Any]]) -> List[Tuple[str, str, int]]:
+    """(case name, raw output, question count) for each golden fixture and each scale"""
+    cases = []
+    for fixture in fixtures:
+        if "input" not in fixture:
+            continue
+        name = Path(fixture.get("_filename", fixture.get("description", "golden"))).stem
+        cases.append((name, fixture["input"], len(json.loads(fixture["input"])["questions"])))
+        if fixture.get("_filename") == SCALE_SOURCE:
+            for target in SCALES:
+                cases.append((f"{name}_x{target}", scale_test(fixture["input"], target), target))
+    return cases
+
+
+# MARK: - Measurement
+
+_CALIBRATION_TEXT = json.dumps([
+    {"prompt": f"Calibration prompt number {i} about cells?", "choices": ["A", "B", "C", "D"], "index": i % 4}
+    for i in range(200)
+])
+_CALIBRATION_WORD = re.compile(r"[a-z]{4,}")
+
+
+def _calibration_round():
+    data = json.loads(_CALIBRATION_TEXT)
+    words = {}
+    for item in data:
+        for word in _CALIBRATION_WORD.findall(item["prompt"].casefold()):
+            words[word] = words.get(word, 0) + 1
+    return sorted(words.items())
+
+
+def _loops_for(fn) -> int:
+    """Calls per batch so that one batch takes at least MIN_BATCH_SECONDS"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= MIN_BATCH_SECONDS:
+            return loops
+        loops *= 2
+
+
+def _batch_ms(fn, loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter() - start) * 1000 / loops
+
+
+def timed(fn) -> Tuple[float, float, float]:
+    """
+    (median ms per call, median calibration ms, median ratio). Each batch is
+    paired with a calibration batch run right before it, so clock-speed drift
+    during the run cancels out of the ratio the gate compares.
+    """
+    loops, calibration_loops = _loops_for(fn), _loops_for(_calibration_round)
+    latencies, calibrations, ratios = [], [], []
+    for _ in range(REPEATS):
+        calibration = _batch_ms(_calibration_round, calibration_loops)
+        latency = _batch_ms(fn, loops)
+        latencies.append(latency)
+        calibrations.append(calibration)
+        ratios.append(latency / calibration)
+    return statistics.median(latencies), statistics.median(calibrations), statistics.median(ratios)
+
+
+def peak_kib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def measure(cases: List[Tuple[str, str, int]]) -> Dict[str, Any]:
+    validator = TestGenValidator()
+    calibrations = []
+    results = {}
+    for name, raw, questions in cases:
+        status = validator.validate(raw).status
+        latency, calibration, relative = timed(lambda: validator.validate(raw))
+        calibrations.append(calibration)
+        results[name] = {
+            "questions": questions,
+            "status": status.value,
+            "latency_ms": round(latency, 4),
+            "relative": round(relative, 4),
+            "peak_kib": round(peak_kib(lambda: validator.validate(raw)), 1),
+        }
+    return {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "calibration_ms": round(statistics.median(calibrations), 4),
+        "cases": results,
+    }
+
+
+# MARK: - Gate
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any] | None, max_slowdown: float) -> List[str]:
+    """Print the comparison table and return the reasons the gate fails"""
+    problems = []
+    limit = 1 + max_slowdown / 100
+    previous = (baseline or {}).get("cases", {})
+
+    print(f"\n{'Case':<28} {'Qs':>5} {'Latency ms':>11} {'vs base':>8} {'Peak KiB':>10} {'vs base':>8}")
+    print("-" * 76)
+    for name, case in current["cases"].items():
+        before = previous.get(name)
+        speed = memory = ""
+        if before:
+            speed_ratio = case["relative"] / before["relative"]
+            memory_ratio = case["peak_kib"] / before["peak_kib"] if before["peak_kib"] else 1.0
+            speed = f"{100 * (speed_ratio - 1):+.0f}%"
+            memory = f"{100 * (memory_ratio - 1):+.0f}%"
+            slower_ms = (case["relative"] - before["relative"]) * current["calibration_ms"]
+            if speed_ratio > limit and slower_ms >= MIN_SLOWDOWN_MS:
+                problems.append(f"{name}: {speed} latency (limit +{max_slowdown:.0f}%)")
+            if memory_ratio > limit:
+                problems.append(f"{name}: {memory} peak memory (limit +{max_slowdown:.0f}%)")
+        if case["status"] == ValidationStatus.FAIL.value:
+            problems.append(f"{name}: golden input no longer validates")
+        print(f"{name:<28} {case['questions']:>5} {case['latency_ms']:>11.3f} {speed:>8} "
+              f"{case['peak_kib']:>10.1f} {memory:>8}")
+
+    scaled = sorted((c for c in current["cases"].values() if c["questions"] in SCALES),
+                    key=lambda c: c["questions"])
+    if len(scaled) >= 2:
+        small, large = scaled[-2], scaled[-1]
+        growth = (large["relative"] / large["questions"]) / (small["relative"] / small["questions"])
+        print(f"\nPer-question cost {small['questions']} → {large['questions']} questions: {growth:.2f}x "
+              f"(limit {MAX_COST_GROWTH:.1f}x)")
+        if growth > MAX_COST_GROWTH:
+            problems.append(f"per-question cost grows {growth:.2f}x from {small['questions']} "
+                            f"to {large['questions']} questions (superlinear validation)")
+    return problems
+
+
+def load_baseline(path: Path) -> Dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    return baseline if baseline.get("version") == BASELINE_VERSION else None
+
+
+def perf_gate(fixtures: List[Dict[str, Any]], baseline_path: Path = DEFAULT_BASELINE,
+              max_slowdown: float = MAX_SLOWDOWN_PERCENT, record: bool = False) -> bool:
+    print(f"\n{'='*60}")
+    print(f"GOLDEN PERFORMANCE GATE")
+    print(f"{'='*60}")
+
+    current = measure(golden_cases(fixtures))
+    baseline = None if record else load_baseline(baseline_path)
+    print(f"Calibration: {current['calibration_ms']:.3f} ms"
+          + (f" (baseline {baseline['calibration_ms']:.3f} ms, Python {baseline['python']})" if baseline else ""))
+    problems = compare(current, baseline, max_slowdown)
+
+    if record:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"\n💾 Baseline saved to: {baseline_path}")
+    elif baseline is None:
+        print(f"\n⚠️  No baseline at {baseline_path}; run golden_perf.py --record to create one")
+
+    if problems:
+        print(f"\n❌ Performance regression:")
+        for problem in problems:
+            print(f"   {problem}")
+        return False
+    print(f"\n✅ Golden fixtures within performance budget.")
+    return True
+
+
+def main():
+    from test_harness import FixtureLoader
+
+    parser = argparse.ArgumentParser(description="Golden fixture latency / memory regression gate")
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--record', action='store_true', help="Measure and overwrite the baseline")
+    parser.add_argument('--max-slowdown', type=float, default=MAX_SLOWDOWN_PERCENT, metavar='PERCENT',
+                        help="Allowed latency / peak memory growth over the baseline")
+    args = parser.parse_args()
+
+    fixtures = FixtureLoader(Path(__file__).parent.parent).load_category("golden")
+    return 0 if perf_gate(fixtures, args.baseline, args.max_slowdown, args.record) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
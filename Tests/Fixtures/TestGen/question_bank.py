@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+TestGen Question Bank Deduplication
+
+Finds prompts repeated across many generated tests. The validator only sees
+one test at a time; a model that keeps reusing the same questions makes a
+bank look far larger than it is.
+
+- exact:  identical after the validator's normalization (normalized_key:
+          case, whitespace and word-edge punctuation, so "What is 3.5 × 2?"
+          and "What is 35 × 2?" stay distinct)
+- near:   MinHash signatures over word shingles, bucketed with LSH banding;
+          a pair is reported when its estimated Jaccard similarity reaches
+          --threshold ("Which organelle produces most ATP?" vs
+          "Which organelle produces most of the cell's ATP?")
+
+Candidate pairs only come from shared LSH buckets, so the bank grows linearly
+with the number of prompts instead of comparing all pairs. Signatures live in
+one flat array (num_perm × 8 bytes per prompt).
+
+Usage:
+    python Tests/Fixtures/TestGen/question_bank.py dumps/
+    python Tests/Fixtures/TestGen/question_bank.py outputs.jsonl --threshold 0.7 --json duplicates.json
+    python Tests/Fixtures/TestGen/question_bank.py outputs.jsonl --exact-only
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bulk_validate import iter_records
+from testgen_validator import TestGenValidator, ValidationStatus, normalized_key
+
+SHINGLE_WORDS = 3
+MERSENNE_PRIME = (1 << 61) - 1
+# LSH bands are sized so that pairs right at the threshold still share a bucket
+# with high probability; the signature comparison then filters the candidates
+LSH_MARGIN = 0.1
+
+
+@dataclass
+class Duplicate:
+    kind: str  # "exact" or "near"
+    test_id: str
+    question: int
+    prompt: str
+    other_test_id: str
+    other_question: int
+    other_prompt: str
+    similarity: float
+
+
+def shingles(text: str) -> List[bytes]:
+    """Overlapping word n-grams of the normalized text (the whole text when shorter)"""
+    words = normalized_key(text).split()
+    if len(words) <= SHINGLE_WORDS:
+        return [" ".join(words).encode()]
+    return [" ".join(words[i:i + SHINGLE_WORDS]).encode() for i in range(len(words) - SHINGLE_WORDS + 1)]
+
+
+class MinHasher:
+    """num_perm universal hash functions (a·x + b mod 2^61-1) over 64-bit shingle hashes"""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> List[int]:
+        hashes = {
+            int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "little")
+            for shingle in shingles(text)
+        }
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self.params]
+
+
+def lsh_shape(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(bands, rows): the widest bands whose LSH threshold (1/b)^(1/r) sits LSH_MARGIN below `threshold`"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold - LSH_MARGIN:
+            best = (bands, rows)
+    return best
+
+
+class QuestionBank:
+    """Accumulates prompts across tests and reports each new prompt's closest earlier duplicate"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, near: bool = True, seed: int = 1):
+        self.threshold = threshold
+        self.near = near
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = lsh_shape(num_perm, threshold)
+        self.refs: List[Tuple[str, int, str]] = []
+        self.exact: Dict[str, int] = {}
+        self.buckets: Dict[Tuple[int, int], List[int]] = {}
+        self.signatures = array("Q")
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def add(self, test_id: str, question: int, prompt: str) -> Optional[Duplicate]:
+        key = normalized_key(prompt)
+        if key in self.exact:
+            return self._duplicate("exact", (test_id, question, prompt), self.exact[key], 1.0)
+
+        ref = len(self.refs)
+        self.refs.append((test_id, question, prompt))
+        self.exact[key] = ref
+        if not self.near:
+            return None
+
+        num_perm = self.hasher.num_perm
+        signature = self.hasher.signature(prompt)
+        band_keys = [
+            (band, hash(tuple(signature[band * self.rows:(band + 1) * self.rows])))
+            for band in range(self.bands)
+        ]
+        candidates = set()
+        for band_key in band_keys:
+            candidates.update(self.buckets.get(band_key, ()))
+
+        best, best_similarity = None, 0.0
+        for candidate in candidates:
+            offset = candidate * num_perm
+            agree = sum(1 for i in range(num_perm) if self.signatures[offset + i] == signature[i])
+            similarity = agree / num_perm
+            if similarity > best_similarity:
+                best, best_similarity = candidate, similarity
+
+        self.signatures.extend(signature)
+        for band_key in band_keys:
+            self.buckets.setdefault(band_key, []).append(ref)
+
+        if best is not None and best_similarity >= self.threshold:
+            return self._duplicate("near", self.refs[ref], best, best_similarity)
+        return None
+
+    def _duplicate(self, kind: str, this: Tuple[str, int, str], other: int, similarity: float) -> Duplicate:
+        other_test, other_question, other_prompt = self.refs[other]
+        return Duplicate(kind, this[0], this[1], this[2], other_test, other_question, other_prompt,
+                         round(similarity, 3))
+
+
+def iter_tests(source: str, skipped: Counter) -> Iterator[Tuple[str, List[Dict]]]:
+    """(record id, normalized questions) for every output that passes the schema"""
+    validator = TestGenValidator(groups=("schema", "unicode"))
+    for record_id, output in iter_records(source):
+        result = validator.validate(output) if output is not None else None
+        if result is None or result.status == ValidationStatus.FAIL:
+            skipped[result.error_code if result else "UNREADABLE_RECORD"] += 1
+            continue
+        yield record_id, result.payload["questions"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find duplicate and near-duplicate prompts across TestGen outputs")
+    parser.add_argument('source', help="JSONL file, directory of outputs, or - for stdin")
+    parser.add_argument('--threshold', type=float, default=0.8,
+                        help="Estimated Jaccard similarity that counts as a near duplicate")
+    parser.add_argument('--num-perm', type=int, default=64, help="MinHash signature length")
+    parser.add_argument('--exact-only', action='store_true', help="Skip near-duplicate detection")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--limit', type=int, default=20, help="Duplicates shown per kind")
+    parser.add_argument('--json', type=Path, help="Write every duplicate as JSON")
+    args = parser.parse_args()
+
+    if args.source != "-" and not Path(args.source).exists():
+        print(f"❌ Not found: {args.source}")
+        return 1
+
+    bank = QuestionBank(args.threshold, args.num_perm, near=not args.exact_only, seed=args.seed)
+    duplicates: List[Duplicate] = []
+    skipped = Counter()
+    tests = prompts = 0
+    start = time.perf_counter()
+    for record_id, questions in iter_tests(args.source, skipped):
+        tests += 1
+        for number, question in enumerate(questions):
+            prompts += 1
+            duplicate = bank.add(record_id, number, question["prompt"])
+            if duplicate:
+                duplicates.append(duplicate)
+    elapsed = time.perf_counter() - start
+
+    print("🗃  Question Bank Deduplication")
+    print(f"📁 {tests:,} tests, {prompts:,} prompts, {len(bank):,} unique "
+          f"({elapsed:.2f}s, {prompts / elapsed if elapsed else 0:,.0f} prompts/sec)")
+    if not args.exact_only:
+        print(f"   MinHash {args.num_perm} perms, LSH {bank.bands} bands × {bank.rows} rows, "
+              f"threshold {args.threshold}")
+    if skipped:
+        print(f"⚠️  Skipped {sum(skipped.values()):,} outputs that failed the schema: "
+              + ", ".join(f"{code} {count}" for code, count in skipped.most_common(5)))
+    print("=" * 70)
+
+    for kind, title in (("exact", "🔁 Exact duplicates"), ("near", "≈  Near duplicates")):
+        rows = [d for d in duplicates if d.kind == kind]
+        if kind == "near":
+            rows.sort(key=lambda d: -d.similarity)
+        print(f"\n{title}: {len(rows)}")
+        print("-" * 70)
+        for d in rows[:args.limit]:
+            similarity = f"{d.similarity:.2f}  " if kind == "near" else ""
+            print(f"  {similarity}{d.test_id}#{d.question}: {d.prompt!r}")
+            print(f"  {' ' * len(similarity)}  ↳ {d.other_test_id}#{d.other_question}: {d.other_prompt!r}")
+        if len(rows) > args.limit:
+            print(f"  ... and {len(rows) - args.limit} more")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([asdict(d) for d in duplicates], f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Duplicates saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
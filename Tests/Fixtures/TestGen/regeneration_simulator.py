@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+TestGen Regeneration Simulator
+
+Replays multi-attempt generation sequences against the validator with the
+retry / repair / fallback policy the app uses:
+
+    GENERATE -> VALIDATE -> pass/warn   -> ACCEPT
+                         -> fail        -> RETRY with repair instructions
+                                        -> GIVE UP when the policy is exhausted -> FALLBACK
+
+The policy gives up after `max_attempts`, or earlier when the model returns
+the same unparseable output `max_identical_failures` times in a row (the
+repair prompt is evidently not reaching it). A give-up reports the last error
+code suffixed with _MAX_RETRIES and, when a safe template exists for the topic,
+triggers the fallback, which is itself validated before use.
+
+Usage:
+    python Tests/Fixtures/TestGen/regeneration_simulator.py              # replay regeneration/ fixtures
+    python Tests/Fixtures/TestGen/regeneration_simulator.py --benchmark 10000 --pass-rate 0.6
+    python Tests/Fixtures/TestGen/regeneration_simulator.py --benchmark 10000 --max-attempts 3 --model-latency 800
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from testgen_validator import TestGenValidator, ValidationResult, ValidationStatus
+
+DEFAULT_TOPIC = "cell_biology"
+
+# Pre-validated safe questions used when every attempt failed
+FALLBACK_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "cell_biology": {
+        "contract_version": "1.0",
+        "topic": "cell_biology",
+        "questions": [
+            {
+                "prompt": "[FALLBACK] What is the basic unit of life?",
+                "choices": ["Cell", "Atom", "Molecule", "Organ"],
+                "correct_choice_index": 0,
+                "rationale": "The cell is the fundamental unit of life.",
+            }
+        ],
+    },
+}
+
+PARSE_FAILURES = {"INVALID_JSON", "INVALID_JSON_UNESCAPED_QUOTES", "TRAILING_TEXT", "INVALID_ROOT_TYPE"}
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    max_identical_failures: int = 3
+
+
+@dataclass
+class AttemptOutcome:
+    attempt: int
+    status: str
+    error_code: Optional[str]
+    should_retry: bool
+    trigger_fallback: bool = False
+    repair_instructions: Optional[str] = None
+    latency_ms: float = 0.0
+
+
+@dataclass
+class SequenceResult:
+    attempts: List[AttemptOutcome] = field(default_factory=list)
+    accepted: bool = False
+    fallback: Optional[Dict[str, Any]] = None
+
+    @property
+    def attempts_used(self) -> int:
+        return len(self.attempts)
+
+    @property
+    def latency_ms(self) -> float:
+        return sum(a.latency_ms for a in self.attempts)
+
+
+def repair_instructions(result: ValidationResult) -> str:
+    """Corrective prompt appended to the next generation request"""
+    issues = (result.details or {}).get("issues") or []
+    field_hint = next((i["field"] for i in issues if i.get("field")), None)
+    if result.error_code in PARSE_FAILURES:
+        return ("Your previous response was not a single valid JSON object. "
+                "Return only the JSON object, with no text before or after it.")
+    where = f" (field: {field_hint})" if field_hint else ""
+    return (f"Your previous response failed validation with {result.error_code}{where}. "
+            f"Fix that problem and return the complete JSON object again.")
+
+
+class RegenerationSimulator:
+    """Drives one generation request through the retry state machine"""
+
+    def __init__(self, validator: Optional[TestGenValidator] = None,
+                 policy: RetryPolicy = RetryPolicy(), topic: str = DEFAULT_TOPIC):
+        self.validator = validator or TestGenValidator()
+        self.policy = policy
+        self.topic = topic
+        self._fallback = self._validated_fallback()
+
+    def _validated_fallback(self) -> Optional[Dict[str, Any]]:
+        template = FALLBACK_TEMPLATES.get(self.topic)
+        if template is None:
+            return None
+        result = self.validator.validate(json.dumps(template))
+        return template if result.status != ValidationStatus.FAIL else None
+
+    def fallback(self) -> Optional[Dict[str, Any]]:
+        """The safe template for the topic, only if it passes validation"""
+        return self._fallback
+
+    def run(self, outputs: Sequence[str], model_latency_ms: float = 0.0) -> SequenceResult:
+        """
+        Replay model outputs until one is accepted or the policy gives up.
+        Outputs beyond the point where the sequence ends are ignored.
+        """
+        sequence = SequenceResult()
+        previous = None
+        identical = 0
+
+        for number, output in enumerate(outputs, 1):
+            start = time.perf_counter()
+            result = self.validator.validate(output)
+            latency = (time.perf_counter() - start) * 1000 + model_latency_ms
+
+            if result.status != ValidationStatus.FAIL:
+                sequence.attempts.append(AttemptOutcome(
+                    number, result.status.value, result.error_code, False, latency_ms=latency))
+                sequence.accepted = True
+                return sequence
+
+            identical = identical + 1 if output == previous and result.error_code in PARSE_FAILURES else 1
+            previous = output
+            exhausted = (number >= self.policy.max_attempts
+                         or identical >= self.policy.max_identical_failures)
+
+            if not exhausted:
+                sequence.attempts.append(AttemptOutcome(
+                    number, "fail", result.error_code, True,
+                    repair_instructions=repair_instructions(result), latency_ms=latency))
+                continue
+
+            sequence.fallback = self.fallback()
+            code = f"{result.error_code}_MAX_RETRIES" if identical >= self.policy.max_identical_failures \
+                else result.error_code
+            sequence.attempts.append(AttemptOutcome(
+                number, "fail", code, False, trigger_fallback=sequence.fallback is not None,
+                latency_ms=latency))
+            return sequence
+
+        return sequence
+
+
+# MARK: - Fixtures
+
+def check_regeneration_fixture(fixture: Dict[str, Any], simulator: RegenerationSimulator) -> List[str]:
+    """Return a list of mismatches (empty when the fixture passes)"""
+    if "expected_fallback" in fixture:
+        fallback = simulator.fallback()
+        if fallback != fixture["expected_fallback"]:
+            return [f"fallback template differs: {fallback}"]
+        return []
+
+    attempts = fixture.get("attempts") or []
+    result = simulator.run([a["input"] for a in attempts])
+    problems = []
+    if result.attempts_used != len(attempts):
+        problems.append(f"used {result.attempts_used} attempts, fixture has {len(attempts)}")
+    for spec, outcome in zip(attempts, result.attempts):
+        expected = spec["expected"]
+        got = {
+            "status": outcome.status,
+            "error_code": outcome.error_code,
+            "should_retry": outcome.should_retry,
+            "trigger_fallback": outcome.trigger_fallback,
+        }
+        for key, value in expected.items():
+            if got.get(key) != value:
+                problems.append(f"attempt {spec['attempt']}: {key}={got.get(key)!r}, expected {value!r}")
+    return problems
+
+
+# MARK: - Benchmark
+
+def _sample_outputs(fixtures_dir: Path):
+    """Passing and failing single-input outputs from the fixture corpus"""
+    from test_harness import FixtureLoader
+    validator = TestGenValidator()
+    passing, failing = [], []
+    for category, fixtures in FixtureLoader(fixtures_dir).load_all().items():
+        for fixture in fixtures:
+            for output in [fixture.get("input")] + [a.get("input") for a in fixture.get("attempts", [])]:
+                if not output:
+                    continue
+                ok = validator.validate(output).status != ValidationStatus.FAIL
+                (passing if ok else failing).append(output)
+    return passing, failing
+
+
+def benchmark(sequences: int, pass_rate: float, policy: RetryPolicy, model_latency_ms: float,
+              seed: int, fixtures_dir: Path):
+    """Simulate many requests where each attempt passes with probability `pass_rate`"""
+    passing, failing = _sample_outputs(fixtures_dir)
+    rng = random.Random(seed)
+    simulator = RegenerationSimulator(policy=policy)
+
+    attempts_used = []
+    latencies = []
+    fallbacks = 0
+    start = time.perf_counter()
+    for _ in range(sequences):
+        outputs = [rng.choice(passing) if rng.random() < pass_rate else rng.choice(failing)
+                   for _ in range(policy.max_attempts)]
+        result = simulator.run(outputs, model_latency_ms=model_latency_ms)
+        attempts_used.append(result.attempts_used)
+        latencies.append(result.latency_ms)
+        fallbacks += not result.accepted
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(f"\n⏱  Retry policy benchmark: {sequences:,} requests (seed {seed})")
+    print(f"   policy: max_attempts={policy.max_attempts}, "
+          f"max_identical_failures={policy.max_identical_failures}, pass rate {pass_rate:.0%}")
+    print("-" * 60)
+    print(f"   mean attempts:     {statistics.mean(attempts_used):6.2f}")
+    print(f"   fallback rate:     {100 * fallbacks / sequences:6.2f}%")
+    print(f"   latency p50/p95:   {statistics.median(latencies):8.2f} / {p95:8.2f} ms per request"
+          f"{' (incl. model latency)' if model_latency_ms else ''}")
+    print(f"   validation cost:   {elapsed * 1000 / sum(attempts_used):8.3f} ms per attempt")
+    print(f"   simulated in {elapsed:.2f}s ({sequences / elapsed:,.0f} requests/sec)")
+
+
+def replay_fixtures(fixtures_dir: Path, policy: RetryPolicy) -> bool:
+    from test_harness import FixtureLoader
+    simulator = RegenerationSimulator(policy=policy)
+    all_passed = True
+    for fixture in FixtureLoader(fixtures_dir).load_category("regeneration"):
+        problems = check_regeneration_fixture(fixture, simulator)
+        name = fixture.get("description", fixture.get("_filename"))
+        if problems:
+            all_passed = False
+            print(f"❌ FAIL: {name}")
+            for problem in problems:
+                print(f"   {problem}")
+            continue
+        if "attempts" in fixture:
+            result = simulator.run([a["input"] for a in fixture["attempts"]])
+            print(f"✅ PASS: {name} ({result.attempts_used} attempts, {result.latency_ms:.2f} ms)")
+        else:
+            print(f"✅ PASS: {name}")
+    return all_passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate TestGen retry / repair / fallback")
+    parser.add_argument('--benchmark', type=int, metavar='REQUESTS',
+                        help="Simulate this many synthetic requests instead of replaying fixtures")
+    parser.add_argument('--pass-rate', type=float, default=0.6,
+                        help="Probability that a synthetic attempt is valid")
+    parser.add_argument('--max-attempts', type=int, default=RetryPolicy.max_attempts)
+    parser.add_argument('--max-identical-failures', type=int, default=RetryPolicy.max_identical_failures)
+    parser.add_argument('--model-latency', type=float, default=0.0, metavar='MS',
+                        help="Model latency added to every attempt (not slept)")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    fixtures_dir = Path(__file__).parent.parent
+    policy = RetryPolicy(args.max_attempts, args.max_identical_failures)
+    if args.benchmark:
+        benchmark(args.benchmark, args.pass_rate, policy, args.model_latency, args.seed, fixtures_dir)
+        return 0
+    return 0 if replay_fixtures(fixtures_dir, policy) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,55 @@
 """
 TestGen v1 Fixture Test Harness
 
-This module demonstrates how to load and test fixtures against the TestGen validation system.
+Loads the v1 fixture corpus and runs it against the TestGen validator
+(testgen_validator.py).
+
+Usage:
+    python Tests/Fixtures/TestGen/test_harness.py
+    python Tests/Fixtures/TestGen/test_harness.py --golden-only
+    python Tests/Fixtures/TestGen/test_harness.py --golden-only --perf   # + latency / memory gate
+    python Tests/Fixtures/TestGen/test_harness.py -j 4        # parallel, same report order
+    python Tests/Fixtures/TestGen/test_harness.py --corpus Tests/Fixtures/TestGen/generated/fuzz -j 4
 """
 
 import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
-from dataclasses import dataclass
-from enum import Enum
+from typing import Dict, Any, List, Tuple
 
+from regeneration_simulator import RegenerationSimulator, check_regeneration_fixture
+from testgen_validator import (
+    ALL_GROUPS, TestGenValidator, ValidationResult, ValidationStatus, normalize_text,
+)
 
-class ValidationStatus(Enum):
-    PASS = "pass"
-    FAIL = "fail"
-    WARN = "warn"
 
+CATEGORIES = ['schema', 'validators', 'regeneration', 'distribution', 'unicode', 'golden']
 
-@dataclass
-class ValidationResult:
-    status: ValidationStatus
-    error_code: str | None = None
-    should_trigger_regeneration: bool = False
-    details: Dict[str, Any] | None = None
+# Bump when the cached fixture layout changes
+MANIFEST_VERSION = 1
+MANIFEST_NAME = ".fixture_manifest.pickle"
 
 
 class FixtureLoader:
-    """Loads and manages test fixtures"""
+    """
+    Loads and manages test fixtures.
+
+    Parsed fixtures are cached in a pickled manifest next to the corpus. The
+    manifest is keyed by each file's (mtime, size): unchanged files are reused,
+    new or edited ones are re-parsed and removed ones dropped, so a warm run
+    only stats the corpus instead of decoding every JSON file.
+    """
     
-    def __init__(self, fixtures_dir: Path):
+    def __init__(self, fixtures_dir: Path, use_cache: bool = True):
         self.fixtures_dir = fixtures_dir
         self.v1_dir = fixtures_dir / "TestGen" / "v1"
+        self.manifest_path = fixtures_dir / "TestGen" / MANIFEST_NAME
+        self.use_cache = use_cache
+        self._fixtures: Dict[str, List[Dict[str, Any]]] | None = None
+        self.reparsed = 0
     
     def load_fixture(self, category: str, name: str) -> Dict[str, Any]:
         """Load a specific fixture by category and name"""
@@ -42,140 +61,264 @@ class FixtureLoader:
             return json.load(f)
     
     def load_category(self, category: str) -> List[Dict[str, Any]]:
-        """Load all fixtures in a category"""
+        """Load all fixtures in a category, ordered by filename"""
+        if category in CATEGORIES:
+            return self.load_all()[category]
+        return [fixture for _, fixture in self._parse_category(category, {})]
+    
+    def load_all(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Load all fixtures organized by category"""
+        if self._fixtures is None:
+            self._fixtures = self._load_manifest()
+        return self._fixtures
+    
+    def _signatures(self, category: str) -> List[Tuple[str, Tuple[int, int]]]:
         category_dir = self.v1_dir / category
         if not category_dir.exists():
             return []
-        
-        fixtures = []
-        for fixture_file in category_dir.glob("*.json"):
-            with open(fixture_file, 'r', encoding='utf-8') as f:
+        entries = [e for e in os.scandir(category_dir) if e.name.endswith('.json') and e.is_file()]
+        return sorted((e.name, (e.stat().st_mtime_ns, e.stat().st_size)) for e in entries)
+    
+    def _parse_category(self, category: str, cached: Dict[str, Any]):
+        """Yield (signature entry, fixture), reusing cached fixtures whose file is unchanged"""
+        for name, signature in self._signatures(category):
+            entry = cached.get(name)
+            if entry is not None and entry[0] == signature:
+                yield (name, signature, entry[1]), entry[1]
+                continue
+            with open(self.v1_dir / category / name, 'r', encoding='utf-8') as f:
                 fixture = json.load(f)
-                fixture['_filename'] = fixture_file.name
-                fixtures.append(fixture)
+            fixture['_filename'] = name
+            self.reparsed += 1
+            yield (name, signature, fixture), fixture
+    
+    def _load_manifest(self) -> Dict[str, List[Dict[str, Any]]]:
+        cached = {}
+        if self.use_cache and self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'rb') as f:
+                    manifest = pickle.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    cached = manifest['categories']
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+                cached = {}
         
+        fixtures = {}
+        entries = {}
+        for category in CATEGORIES:
+            previous = {name: (signature, fixture)
+                        for name, signature, fixture in cached.get(category, [])}
+            parsed = list(self._parse_category(category, previous))
+            entries[category] = [entry for entry, _ in parsed]
+            fixtures[category] = [fixture for _, fixture in parsed]
+        
+        stale = self.reparsed or any(
+            len(entries[c]) != len(cached.get(c, [])) for c in CATEGORIES
+        )
+        if self.use_cache and stale:
+            self._write_manifest(entries)
         return fixtures
     
-    def load_all(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Load all fixtures organized by category"""
-        categories = ['schema', 'validators', 'regeneration', 'distribution', 'unicode', 'golden']
-        return {
-            category: self.load_category(category)
-            for category in categories
-        }
+    def _write_manifest(self, entries):
+        tmp = self.manifest_path.with_suffix('.tmp')
+        try:
+            with open(tmp, 'wb') as f:
+                pickle.dump({'version': MANIFEST_VERSION, 'categories': entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.manifest_path)
+        except OSError as e:
+            print(f"⚠️  Could not write fixture manifest: {e}")
+
 
+# Rule groups exercised by each category. Fixtures isolate one stage (e.g. the
+# distribution fixtures use placeholder "R1" rationales); golden and
+# regeneration fixtures run the full pipeline.
+CATEGORY_RULE_GROUPS = {
+    'schema': ('schema',),
+    'validators': ('schema', 'content'),
+    'distribution': ('schema', 'distribution'),
+    'unicode': ('schema', 'unicode'),
+}
 
-class TestGenValidator:
+
+def validator_for(category: str) -> TestGenValidator:
+    return TestGenValidator(groups=CATEGORY_RULE_GROUPS.get(category, ALL_GROUPS))
+
+
+def expected_outcome(fixture: Dict[str, Any]) -> Tuple[str, Tuple[str, ...], bool | None]:
     """
-    Mock validator for demonstration purposes.
-    Replace with actual TestGen validation logic.
+    (status, acceptable error codes, regeneration flag) for either fixture format:
+    the v1 contract format (status/error_code) or the legacy QuestionDraft
+    format (shouldPass/errorCodes) shared with FixtureBasedTests.swift.
     """
-    
-    def validate(self, llm_output: str) -> ValidationResult:
-        """
-        Validate LLM output against TestGen schema and rules.
-        
-        This is a mock implementation. Replace with actual validation logic:
-        1. Parse JSON
-        2. Check schema compliance
-        3. Validate MCQ structure
-        4. Check content policy
-        5. Verify distribution patterns
-        6. Normalize unicode
-        """
-        # Mock implementation
-        try:
-            data = json.loads(llm_output)
-            
-            # Basic validation
-            if "contract_version" not in data:
-                return ValidationResult(
-                    status=ValidationStatus.FAIL,
-                    error_code="MISSING_CONTRACT_VERSION",
-                    should_trigger_regeneration=True
-                )
-            
-            if data.get("contract_version") != "1.0":
-                return ValidationResult(
-                    status=ValidationStatus.FAIL,
-                    error_code="UNSUPPORTED_CONTRACT_VERSION",
-                    should_trigger_regeneration=True
-                )
-            
-            # More validation logic would go here...
-            
-            return ValidationResult(status=ValidationStatus.PASS)
-            
-        except json.JSONDecodeError:
-            return ValidationResult(
-                status=ValidationStatus.FAIL,
-                error_code="INVALID_JSON",
-                should_trigger_regeneration=True
-            )
-
-
-def run_fixture_test(fixture: Dict[str, Any], validator: TestGenValidator) -> bool:
+    expected = fixture["expected"]
+    if "status" in expected:
+        code = expected.get("error_code")
+        return (expected["status"], (code,) if code else (),
+                expected.get("should_trigger_regeneration", False))
+    status = "pass" if expected.get("shouldPass") else "fail"
+    return status, tuple(expected.get("errorCodes") or ()), None
+
+
+def _code_matches(code: str | None, expected_codes: Tuple[str, ...]) -> bool:
+    """Legacy fixtures name code families: BANNED_PHRASE covers BANNED_PHRASE_ALL_OF_ABOVE"""
+    if not expected_codes:
+        return True
+    return code is not None and any(
+        code == expected or code.startswith(expected + "_") for expected in expected_codes
+    )
+
+
+# expected flag -> characters that must be gone from the normalized payload
+NORMALIZED_CHARACTERS = {
+    "normalized_newlines": "\r",
+    "normalized_nbsp": "\u00a0",
+    "normalized_quotes": "\u2018\u2019\u201c\u201d",
+}
+
+
+def _payload_texts(payload: Dict[str, Any]) -> List[str]:
+    texts = [payload["topic"]] if isinstance(payload.get("topic"), str) else []
+    for question in payload.get("questions", []):
+        texts += [question["prompt"], *question["choices"], question["rationale"]]
+    return texts
+
+
+def normalization_problems(fixture: Dict[str, Any], result: ValidationResult) -> List[str]:
     """
-    Run a single fixture test.
-    Returns True if test passes, False otherwise.
+    Why a should_normalize fixture's payload is not normalized: it must differ
+    from the input, be stable under another normalization pass, and be free of
+    the characters named by normalized_* flags.
     """
-    llm_output = fixture["input"]
     expected = fixture["expected"]
-    
+    if not expected.get("should_normalize"):
+        return []
+    if result.payload is None:
+        return ["no normalized payload"]
+    before, after = _payload_texts(json.loads(fixture["input"])), _payload_texts(result.payload)
+    problems = []
+    if before == after:
+        problems.append("payload is identical to the input")
+    unstable = next((text for text in after if normalize_text(text) != (text, [])), None)
+    if unstable is not None:
+        problems.append(f"payload text still normalizes: {unstable!r}")
+    for flag, characters in NORMALIZED_CHARACTERS.items():
+        if expected.get(flag) and any(c in text for text in after for c in characters):
+            problems.append(f"{flag}: payload still contains {characters!r}")
+    return problems
+
+
+def check_fixture(fixture: Dict[str, Any], validator: TestGenValidator) -> Tuple[bool | None, List[str]]:
+    """
+    Check a single fixture and return (outcome, report lines).
+    Outcome is True if the test passes, False otherwise, None for fixtures
+    that carry nothing to validate. Multi-attempt regeneration fixtures are
+    replayed through the retry simulator.
+    """
+    name = fixture.get('description', fixture.get('name', 'Unknown'))
+    if "attempts" in fixture or "expected_fallback" in fixture:
+        problems = check_regeneration_fixture(fixture, RegenerationSimulator(validator))
+        if problems:
+            return False, [f"❌ FAIL: {name}"] + [f"   {problem}" for problem in problems]
+        return True, [f"✅ PASS: {name}"]
+    if "input" not in fixture:
+        return None, [f"⏭️  SKIP: {name} (no input)"]
+
+    llm_output = fixture["input"]
+    status, codes, regeneration = expected_outcome(fixture)
+    expected_details = fixture["expected"].get("details") or {}
+
     # Run validation
     result = validator.validate(llm_output)
-    
+
     # Check results match expectations
-    status_match = result.status.value == expected["status"]
-    
-    if expected["status"] != "pass":
-        error_code_match = result.error_code == expected.get("error_code")
-        regeneration_match = result.should_trigger_regeneration == expected.get("should_trigger_regeneration", False)
-        
-        if not (status_match and error_code_match and regeneration_match):
-            print(f"❌ FAIL: {fixture.get('description', 'Unknown')}")
-            print(f"   Expected: {expected}")
-            print(f"   Got: status={result.status.value}, error={result.error_code}, regen={result.should_trigger_regeneration}")
-            return False
-    
-    print(f"✅ PASS: {fixture.get('description', 'Unknown')}")
-    return True
+    matched = result.status.value == status
+    if status != "pass":
+        matched = (matched and _code_matches(result.error_code, codes)
+                   and (regeneration is None or result.should_trigger_regeneration == regeneration))
+        details = result.details or {}
+        matched = matched and all(details.get(k) == v for k, v in expected_details.items())
 
+    if not matched:
+        return False, [
+            f"❌ FAIL: {name}",
+            f"   Expected: {fixture['expected']}",
+            f"   Got: status={result.status.value}, error={result.error_code}, regen={result.should_trigger_regeneration}",
+        ]
+    problems = normalization_problems(fixture, result)
+    if problems:
+        return False, [f"❌ FAIL: {name}"] + [f"   {problem}" for problem in problems]
+    return True, [f"✅ PASS: {name}"]
 
-def run_category_tests(category: str, fixtures: List[Dict[str, Any]], validator: TestGenValidator) -> Dict[str, int]:
-    """Run all tests in a category"""
+
+def run_fixture_test(fixture: Dict[str, Any], validator: TestGenValidator) -> bool | None:
+    """Run a single fixture test and print its report"""
+    outcome, lines = check_fixture(fixture, validator)
+    for line in lines:
+        print(line)
+    return outcome
+
+
+def _run_shard(category: str, fixtures: List[Dict[str, Any]]) -> List[Tuple[bool | None, List[str]]]:
+    """Worker entry point: check one slice of a category"""
+    validator = validator_for(category)
+    return [check_fixture(fixture, validator) for fixture in fixtures]
+
+
+def _report_category(category: str, outcomes: List[Tuple[bool | None, List[str]]]) -> Dict[str, int]:
     print(f"\n{'='*60}")
     print(f"Testing Category: {category.upper()}")
     print(f"{'='*60}")
     
-    passed = 0
-    failed = 0
+    counts = {"passed": 0, "failed": 0, "skipped": 0}
+    for outcome, lines in outcomes:
+        for line in lines:
+            print(line)
+        key = "skipped" if outcome is None else "passed" if outcome else "failed"
+        counts[key] += 1
     
-    for fixture in fixtures:
-        if run_fixture_test(fixture, validator):
-            passed += 1
-        else:
-            failed += 1
-    
-    print(f"\nResults: {passed} passed, {failed} failed")
-    return {"passed": passed, "failed": failed}
+    print(f"\nResults: {counts['passed']} passed, {counts['failed']} failed, {counts['skipped']} skipped")
+    return counts
 
 
-def run_all_tests(fixtures_dir: Path):
-    """Run all fixture tests"""
-    loader = FixtureLoader(fixtures_dir)
-    validator = TestGenValidator()
+def run_category_tests(category: str, fixtures: List[Dict[str, Any]], validator: TestGenValidator) -> Dict[str, int]:
+    """Run all tests in a category"""
+    return _report_category(category, [check_fixture(fixture, validator) for fixture in fixtures])
+
+
+def run_all_tests(fixtures_dir: Path, workers: int = 1, shard_size: int = 16,
+                  fixtures: Dict[str, List[Dict[str, Any]]] | None = None):
+    """
+    Run all fixture tests.
+    With workers > 1 each category is split into shards of `shard_size`
+    fixtures that run across a process pool; reports are still printed per
+    category in corpus order, so output is identical to a serial run.
+    """
+    all_fixtures = fixtures if fixtures is not None else FixtureLoader(fixtures_dir).load_all()
+    
+    shards = [
+        (category, category_fixtures[i:i + shard_size])
+        for category, category_fixtures in all_fixtures.items()
+        for i in range(0, len(category_fixtures), shard_size)
+    ]
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shard_results = list(pool.map(_run_shard, *zip(*shards)))
+    else:
+        shard_results = [_run_shard(category, chunk) for category, chunk in shards]
     
-    all_fixtures = loader.load_all()
+    outcomes: Dict[str, List[Tuple[bool | None, List[str]]]] = {}
+    for (category, _), results in zip(shards, shard_results):
+        outcomes.setdefault(category, []).extend(results)
     
     total_passed = 0
     total_failed = 0
     
-    for category, fixtures in all_fixtures.items():
-        if not fixtures:
+    for category in all_fixtures:
+        if not outcomes.get(category):
             continue
         
-        results = run_category_tests(category, fixtures, validator)
+        results = _report_category(category, outcomes[category])
         total_passed += results["passed"]
         total_failed += results["failed"]
     
@@ -185,21 +328,97 @@ def run_all_tests(fixtures_dir: Path):
     print(f"Total Passed: {total_passed}")
     print(f"Total Failed: {total_failed}")
     print(f"Success Rate: {100 * total_passed / (total_passed + total_failed) if (total_passed + total_failed) > 0 else 0:.1f}%")
+    return total_failed == 0
 
 
-def test_golden_fixtures(fixtures_dir: Path):
+def _run_corpus_shard(path: str) -> Dict[str, Any]:
+    """Worker entry point: check one generated JSONL shard, timing each case by mutation"""
+    validator = TestGenValidator()
+    summary = {"cases": 0, "failed": 0, "crashed": 0, "failures": [], "timing": {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            fixture = json.loads(line)
+            mutation = fixture.get("mutation", "unknown")
+            start = time.perf_counter()
+            try:
+                outcome, lines = check_fixture(fixture, validator)
+            except Exception as e:  # a crash is exactly what the fuzz corpus is looking for
+                outcome = False
+                lines = [f"💥 CRASH: {fixture.get('description')}", f"   {type(e).__name__}: {e}"]
+                summary["crashed"] += 1
+            elapsed = time.perf_counter() - start
+
+            count, total, worst = summary["timing"].get(mutation, (0, 0.0, 0.0))
+            summary["timing"][mutation] = (count + 1, total + elapsed, max(worst, elapsed))
+            summary["cases"] += 1
+            if not outcome:
+                summary["failed"] += 1
+                summary["failures"].append(lines)
+    return summary
+
+
+def run_corpus(corpus_dir: Path, workers: int = 1, limit: int = 20) -> bool:
+    """
+    Run a generated corpus (fuzz_corpus.py shards, one fixture per JSONL line)
+    through the full validator. Prints failures and crashes, throughput and the
+    cost per mutation so performance cliffs show up next to correctness bugs.
+    """
+    shards = sorted(str(p) for p in corpus_dir.glob("*.jsonl"))
+    if not shards:
+        print(f"❌ No JSONL shards in {corpus_dir}")
+        return False
+
+    print(f"\n{'='*60}")
+    print(f"GENERATED CORPUS: {corpus_dir} ({len(shards)} shards)")
+    print(f"{'='*60}")
+
+    start = time.perf_counter()
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(_run_corpus_shard, shards))
+    else:
+        summaries = [_run_corpus_shard(shard) for shard in shards]
+    elapsed = time.perf_counter() - start
+
+    cases = sum(s["cases"] for s in summaries)
+    failed = sum(s["failed"] for s in summaries)
+    crashed = sum(s["crashed"] for s in summaries)
+    failures = [lines for s in summaries for lines in s["failures"]]
+    for lines in failures[:limit]:
+        for line in lines:
+            print(line)
+    if len(failures) > limit:
+        print(f"... and {len(failures) - limit} more failures")
+
+    timing: Dict[str, Tuple[int, float, float]] = {}
+    for s in summaries:
+        for mutation, (count, total, worst) in s["timing"].items():
+            c, t, w = timing.get(mutation, (0, 0.0, 0.0))
+            timing[mutation] = (c + count, t + total, max(w, worst))
+
+    print(f"\n{'Mutation':<26} {'Cases':>8} {'Mean ms':>9} {'Max ms':>9}")
+    print("-" * 56)
+    for mutation, (count, total, worst) in sorted(timing.items(), key=lambda item: -item[1][1] / item[1][0]):
+        print(f"{mutation:<26} {count:>8,} {1000 * total / count:>9.3f} {1000 * worst:>9.2f}")
+
+    print(f"\nCorpus: {cases - failed:,} passed, {failed:,} failed ({crashed:,} crashes) "
+          f"in {elapsed:.1f}s ({cases / elapsed if elapsed else 0:,.0f} cases/sec)")
+    return failed == 0
+
+
+def test_golden_fixtures(fixtures_dir: Path, fixtures: Dict[str, List[Dict[str, Any]]] | None = None):
     """
     Test golden fixtures.
     These MUST always pass. Failure indicates regression.
     """
-    loader = FixtureLoader(fixtures_dir)
-    validator = TestGenValidator()
+    all_fixtures = fixtures if fixtures is not None else FixtureLoader(fixtures_dir).load_all()
+    validator = validator_for('golden')
     
     print(f"\n{'='*60}")
     print(f"GOLDEN FIXTURE REGRESSION TEST")
     print(f"{'='*60}")
     
-    golden_fixtures = loader.load_category('golden')
+    golden_fixtures = all_fixtures.get('golden', [])
     
     all_passed = True
     for fixture in golden_fixtures:
@@ -219,19 +438,43 @@ def test_golden_fixtures(fixtures_dir: Path):
 
 # Example usage
 if __name__ == "__main__":
+    import argparse
     import sys
     
+    parser = argparse.ArgumentParser(description="Run the TestGen v1 fixture corpus")
+    parser.add_argument('--golden-only', action='store_true',
+                        help="Only run the golden regression fixtures (CI gate)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="Worker processes for the full run (sharded per category)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignore and do not write the fixture manifest")
+    parser.add_argument('--perf', action='store_true',
+                        help="Also gate golden latency and peak memory against golden_perf_baseline.json")
+    parser.add_argument('--corpus', type=Path,
+                        help="Run a generated JSONL corpus (see fuzz_corpus.py) instead of v1/")
+    args = parser.parse_args()
+    
     # Assuming this script is in Tests/Fixtures/TestGen/
     fixtures_dir = Path(__file__).parent.parent
     
     print("TestGen Fixture Test Harness")
+    if args.corpus:
+        sys.exit(0 if run_corpus(args.corpus, workers=args.workers) else 1)
     print(f"Fixtures directory: {fixtures_dir}")
     
+    # Load the corpus once (through the manifest) for both passes
+    fixtures = FixtureLoader(fixtures_dir, use_cache=not args.no_cache).load_all()
+    
     # Run golden tests first (regression detection)
-    golden_passed = test_golden_fixtures(fixtures_dir)
+    golden_passed = test_golden_fixtures(fixtures_dir, fixtures)
+    if args.perf:
+        from golden_perf import perf_gate
+        golden_passed = perf_gate(fixtures['golden']) and golden_passed
+    if args.golden_only:
+        sys.exit(0 if golden_passed else 1)
     
     # Run all tests
-    run_all_tests(fixtures_dir)
+    all_passed = run_all_tests(fixtures_dir, workers=args.workers, fixtures=fixtures)
     
-    # Exit with error code if golden tests failed
-    sys.exit(0 if golden_passed else 1)
+    # Exit with error code if any fixture failed
+    sys.exit(0 if golden_passed and all_passed else 1)
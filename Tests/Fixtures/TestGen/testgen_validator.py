@@ -0,0 +1,1104 @@
+"""
+TestGen v1 Validator
+
+Validates raw LLM output for Practice Test generation against the v1 contract:
+
+    {"contract_version": "1.0", "topic": "...", "questions": [
+        {"prompt": "...", "choices": [4 strings], "correct_choice_index": 0-3, "rationale": "..."}
+    ]}
+
+Validation is a pipeline of small rules grouped into stages:
+
+1. schema        strict JSON decoding, root/question shape, types, encoding
+2. unicode       normalization (NFC, newlines, spaces, quotes) + invisible character detection
+3. content       topic scope, per-question MCQ structure and content policy, duplicate prompts
+4. distribution  test-level answer-key balance and patterns
+
+Rules record issues on a shared context. A fatal issue stops the pipeline
+(later rules would only report noise about a payload that must be regenerated
+anyway); warnings accumulate. The first fatal issue - or, without one, the
+first warning - becomes the result's error code.
+
+Decoding is budgeted (see DecodeBudget): outputs over the size limit are
+rejected before any parsing, and large outputs go through an incremental,
+contract-aware decoder that stops at the first structural violation instead
+of materializing the whole payload first. The same decoder backs
+validate_stream() for responses that are still arriving.
+
+Legacy single-question drafts (the QuestionDraft shape used by
+FixtureBasedTests.swift: prompt/choices/correctIndex/...) are accepted and
+validated as a one-question test without topic scope.
+"""
+
+import difflib
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+
+CONTRACT_VERSION = "1.0"
+TOP_LEVEL_KEYS = ("contract_version", "topic", "questions")
+QUESTION_KEYS = ("prompt", "choices", "correct_choice_index", "rationale")
+QUESTION_KEY_SET = frozenset(QUESTION_KEYS)
+DRAFT_KEYS = (
+    "prompt", "choices", "correctAnswer", "correctIndex", "rationale",
+    "topic", "bloomLevel", "difficulty", "templateType",
+)
+
+BIO101_TOPICS = (
+    "cell_biology", "molecular_biology", "genetics", "evolution", "ecology",
+    "plant_biology", "human_physiology", "microbiology", "biochemistry",
+)
+
+CHOICE_COUNT = 4
+ANSWER_LETTERS = "ABCD"
+MAX_PROMPT_CHARS = 500
+MIN_RATIONALE_CHARS = 20
+SKEW_THRESHOLD = 0.5
+# A repeating answer key is only a pattern once it has cycled this many times
+MIN_PATTERN_CYCLES = 3
+TOPIC_FUZZY_CUTOFF = 0.8
+
+FATAL = "fatal"
+WARNING = "warning"
+
+BANNED_PHRASES = (
+    ("all of the above", "BANNED_PHRASE_ALL_OF_ABOVE"),
+    ("none of the above", "BANNED_PHRASE_NONE_OF_ABOVE"),
+    ("both a and b", "BANNED_PHRASE_BOTH_AB"),
+    ("neither a nor b", "BANNED_PHRASE_NEITHER_NOR"),
+)
+
+URL_PATTERN = re.compile(r"https?://|\bwww\.", re.IGNORECASE)
+EXCEPT_PATTERN = re.compile(r"\bexcept\b", re.IGNORECASE)
+SUBJECTIVE_PATTERN = re.compile(r"\b(?:clearly|obviously|evidently|of course)\b", re.IGNORECASE)
+ABSOLUTE_PATTERN = re.compile(r"\b(?:always|never)\b", re.IGNORECASE)
+NEGATION_WORDS = ("not", "no", "never", "neither", "nor")
+NEGATION_PATTERN = re.compile(r"\b(?:%s)\b" % "|".join(NEGATION_WORDS), re.IGNORECASE)
+NEGATED_NEGATIVE_PATTERN = re.compile(r"\b(?:not|never|no)\s+(?:un|non-?)\w{3,}", re.IGNORECASE)
+PUNCTUATION = re.compile(r"[^\w\s]+")
+SIGNS = "-+\u2212."
+WHITESPACE = re.compile(r"\s+")
+DOUBLE_SPACE = re.compile(r" {2,}")
+WORD = re.compile(r"[^\W\d_]{4,}")
+
+# A \uD800-\uDFFF escape in the raw text is the only way a lone surrogate gets in
+SURROGATE_ESCAPE = re.compile(r"\\u[dD][89a-fA-F]")
+SURROGATE = re.compile("[\ud800-\udfff]")
+
+# Invisible or decorative characters: dropped from the text and flagged, in this order
+UNICODE_FLAGS = (
+    ("ZERO_WIDTH_CHARACTER_DETECTED", ((0x200B, 0x200D), (0x2060, 0x2060), (0xFEFF, 0xFEFF))),
+    ("RTL_MARK_DETECTED", ((0x200E, 0x200F), (0x202A, 0x202E), (0x2066, 0x2069))),
+    ("EMOJI_DETECTED", ((0x1F000, 0x1FAFF), (0x2600, 0x27BF), (0x2B00, 0x2BFF), (0xFE0F, 0xFE0F))),
+)
+# Typographic characters rewritten to ASCII without a warning
+UNICODE_REWRITES = {
+    "\r": "\n",
+    "\u00a0": " ", "\u2007": " ", "\u202f": " ",
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+}
+
+
+def _char_class(ranges) -> str:
+    return "".join(chr(low) if low == high else f"{chr(low)}-{chr(high)}" for low, high in ranges)
+
+
+# character -> (replacement, detection code or None)
+UNICODE_TABLE: Dict[str, Tuple[str, str | None]] = {
+    chr(codepoint): ("", code)
+    for code, ranges in UNICODE_FLAGS for low, high in ranges for codepoint in range(low, high + 1)
+}
+UNICODE_TABLE.update({char: (replacement, None) for char, replacement in UNICODE_REWRITES.items()})
+# Every character in the table; one sub() pass over it drops and rewrites them all
+UNICODE_SPECIAL = re.compile("[%s%s]" % ("".join(_char_class(r) for _, r in UNICODE_FLAGS), "".join(UNICODE_REWRITES)))
+# JSON escapes are the only way a pure-ASCII output can decode to non-ASCII or CR text
+UNICODE_ESCAPES = ("\\u", "\\r")
+
+
+@dataclass(frozen=True)
+class DecodeBudget:
+    """Upper bounds on what a single model response may cost to validate"""
+    max_chars: int = 4_000_000
+    max_questions: int = 5_000
+    max_field_chars: int = 20_000
+    max_depth: int = 32
+
+
+DEFAULT_BUDGET = DecodeBudget()
+# Below this size the C decoder finishes before an incremental scan gets going
+INCREMENTAL_THRESHOLD = 256 * 1024
+
+
+class ValidationStatus(Enum):
+    PASS = "pass"
+    FAIL = "fail"
+    WARN = "warn"
+
+
+@dataclass
+class ValidationResult:
+    status: ValidationStatus
+    error_code: str | None = None
+    should_trigger_regeneration: bool = False
+    details: Dict[str, Any] | None = None
+    payload: Dict[str, Any] | None = None
+
+
+@dataclass
+class Issue:
+    code: str
+    severity: str = FATAL
+    field: str | None = None
+    details: Dict[str, Any] | None = None
+
+
+@dataclass
+class ValidationContext:
+    """State shared by the rules of one validation run"""
+    raw: str
+    data: Any = None
+    budget: DecodeBudget = DEFAULT_BUDGET
+    topic: str | None = None
+    questions: List[Dict[str, Any]] = field(default_factory=list)
+    draft: bool = False
+    duplicates: "DuplicateIndex | None" = None
+    issues: List[Issue] = field(default_factory=list)
+    fatal: bool = False
+
+    def fail(self, code: str, field: str | None = None, **details):
+        self.issues.append(Issue(code, FATAL, field, details or None))
+        self.fatal = True
+
+    def warn(self, code: str, field: str | None = None, **details):
+        self.issues.append(Issue(code, WARNING, field, details or None))
+
+
+Rule = Callable[[ValidationContext], None]
+
+
+# MARK: - Parsing
+
+def _reject_constant(name: str):
+    raise ValueError(f"{name} is not valid JSON")
+
+
+_DECODER = json.JSONDecoder(parse_constant=_reject_constant)
+
+
+def _looks_like_unescaped_quote(text: str, pos: int) -> bool:
+    """A string closed early by a bare quote leaves a word right after the '"'"""
+    before = text[:pos].rstrip()
+    return bool(before) and before[-1] == '"' and pos < len(text) and text[pos].isalnum()
+
+
+def parse_output(raw: str, budget: DecodeBudget = DEFAULT_BUDGET) -> Tuple[Any, Issue | None]:
+    """
+    Strictly decode the LLM output; a single JSON value with nothing after it.
+
+    On TRAILING_TEXT the decoded prefix is returned alongside the issue so the
+    caller can decide whether to recover it.
+    """
+    if not isinstance(raw, str):
+        return None, Issue("INVALID_JSON", details={"reason": "output is not text"})
+    if len(raw) > budget.max_chars:
+        return None, Issue("OUTPUT_TOO_LARGE", details={"length": len(raw), "limit": budget.max_chars})
+    if len(raw) > INCREMENTAL_THRESHOLD:
+        decoder = IncrementalDecoder(budget)
+        decoder.feed(raw)
+        data, issue = decoder.close()
+        if issue is not None and issue.field is not None and issue.field.startswith("questions["):
+            # The rules check the root before any question (a bad contract_version
+            # outranks a bad question), so let them pick the issue as for small outputs
+            try:
+                return _DECODER.decode(raw.lstrip("\ufeff")), None
+            except (ValueError, RecursionError):
+                pass
+        return data, issue
+
+    text = raw.lstrip("\ufeff")
+    start = len(text) - len(text.lstrip())
+    try:
+        data, end = _DECODER.raw_decode(text, start)
+    except json.JSONDecodeError as e:
+        if e.msg in ("Expecting ',' delimiter", "Expecting ':' delimiter") \
+                and _looks_like_unescaped_quote(text, e.pos):
+            return None, Issue("INVALID_JSON_UNESCAPED_QUOTES", details={"position": e.pos})
+        return None, Issue("INVALID_JSON", details={"reason": e.msg, "position": e.pos})
+    except RecursionError:
+        return None, Issue("NESTING_TOO_DEEP", details={"limit": budget.max_depth})
+    except ValueError as e:
+        return None, Issue("INVALID_JSON", details={"reason": str(e)})
+    if text[end:].strip():
+        return data, Issue("TRAILING_TEXT", details={"position": end})
+    return data, None
+
+
+# MARK: - Incremental decoding
+
+WS_RUN = re.compile(r"[ \t\n\r]*")
+STRING_TOKEN = re.compile(r'"((?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*)"')
+# A string that is still valid so far but has not been closed yet
+STRING_PREFIX = re.compile(r'"(?:[^"\\\x00-\x1f]|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*(?:\\(?:u[0-9a-fA-F]{0,3})?)?\Z')
+NUMBER_TOKEN = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+LITERALS = (("true", True), ("false", False), ("null", None))
+
+# What the decoder expects next
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+EXPECTING = {
+    _VALUE: "Expecting value",
+    _VALUE_OR_END: "Expecting value",
+    _KEY: "Expecting property name enclosed in double quotes",
+    _KEY_OR_END: "Expecting property name enclosed in double quotes",
+    _COLON: "Expecting ':' delimiter",
+    _COMMA_OR_END: "Expecting ',' delimiter",
+}
+
+# Where a container sits in the contract
+_ROOT, _QUESTIONS, _QUESTION, _CHOICES, _OTHER = range(5)
+
+
+class DecodeAbort(Exception):
+    def __init__(self, issue: Issue):
+        super().__init__(issue.code)
+        self.issue = issue
+
+
+class IncrementalDecoder:
+    """
+    Push decoder for one model response: feed() chunks as they arrive, then close().
+
+    Structure is checked against the contract token by token, so a response
+    that can only fail (wrong root type, a malformed question, a question over
+    budget, an oversized field) is rejected at the first offending token rather
+    than after the whole payload has been decoded. Top-level keys and the type
+    of `questions` are left to check_root, so the issue reported for them does
+    not depend on the payload's size. Once
+    the root value closes, anything other than whitespace is trailing text; the
+    decoded prefix is kept so the caller can choose to recover it.
+    """
+
+    def __init__(self, budget: DecodeBudget = DEFAULT_BUDGET):
+        self.budget = budget
+        self.issue: Issue | None = None
+        self.questions = 0
+        self.trailing_at: int | None = None
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0  # characters already dropped from the front of the buffer
+        self._size = 0
+        self._state = _VALUE
+        self._stack: List[list] = []  # [container, context, pending key]
+        self._root: Any = None
+        self._draft = False
+        self._after_string = False
+
+    @property
+    def done(self) -> bool:
+        return self._state == _DONE
+
+    def feed(self, chunk: str) -> Issue | None:
+        """Consume the next chunk; returns the fatal issue once there is one"""
+        if self.issue is not None:
+            return self.issue
+        if not self._size:
+            chunk = chunk.lstrip("\ufeff")
+        self._size += len(chunk)
+        if self._size > self.budget.max_chars:
+            self.issue = Issue("OUTPUT_TOO_LARGE", details={"length": self._size, "limit": self.budget.max_chars})
+            return self.issue
+        if self.trailing_at is not None:
+            return None
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._scan(final=False)
+        return self.issue
+
+    def close(self) -> Tuple[Any, Issue | None]:
+        """Finish the response; returns (decoded value or recovered prefix, first issue)"""
+        if self.issue is None:
+            self._scan(final=True)
+        if self.issue is None and not self.done:
+            self.issue = Issue("INVALID_JSON", details={
+                "reason": EXPECTING.get(self._state, "Expecting value") + " (end of output)",
+                "position": self._offset + len(self._buffer),
+            })
+        if self.issue is None and self.trailing_at is not None:
+            return self._root, Issue("TRAILING_TEXT", details={"position": self.trailing_at})
+        return (None, self.issue) if self.issue is not None else (self._root, None)
+
+    # Scanning
+
+    def _scan(self, final: bool):
+        try:
+            self._pos = self._tokens(self._buffer, self._pos, final)
+        except DecodeAbort as abort:
+            self.issue = abort.issue
+        except ValueError as e:
+            # e.g. an integer literal over Python's int-conversion digit limit
+            self.issue = Issue("INVALID_JSON", details={"reason": str(e)})
+
+    def _tokens(self, buf: str, pos: int, final: bool) -> int:
+        """Consume complete tokens from buf[pos:]; returns where the unread text starts"""
+        end = len(buf)
+        while True:
+            pos = WS_RUN.match(buf, pos).end()
+            if pos >= end:
+                return pos
+            if self._state == _DONE:
+                self.trailing_at = self._offset + pos
+                return pos
+            ch = buf[pos]
+
+            if ch == '"':
+                match = STRING_TOKEN.match(buf, pos)
+                if match is None:
+                    if not final and STRING_PREFIX.match(buf, pos):
+                        # \uXXXX is the widest escape: 6 characters per decoded one
+                        if end - pos > 6 * self.budget.max_field_chars + 2:
+                            self._fail("FIELD_TOO_LARGE", self._field(), limit=self.budget.max_field_chars)
+                        return pos
+                    self._invalid(pos, "Unterminated string" if STRING_PREFIX.match(buf, pos)
+                                  else "Invalid string character or escape")
+                body = match.group(1)
+                text = body if "\\" not in body else json.loads(match.group(0))
+                if len(text) > self.budget.max_field_chars:
+                    self._fail("FIELD_TOO_LARGE", self._field(), length=len(text),
+                               limit=self.budget.max_field_chars)
+                if self._state in (_KEY, _KEY_OR_END):
+                    self._key(text)
+                else:
+                    self._expect_value(buf, pos)
+                    self._value(text, str)
+                    self._after_string = True
+                pos = match.end()
+                continue
+
+            after_string, self._after_string = self._after_string, False
+            if ch == "{" and self._stack and self._stack[-1][1] == _QUESTIONS \
+                    and self._state in (_VALUE, _VALUE_OR_END):
+                # Whole questions go through the C decoder; the token scan below
+                # only takes over for one that is truncated or malformed
+                decoded = self._decode_question(buf, pos)
+                if decoded is not None:
+                    pos = decoded
+                    continue
+            if ch in "{[":
+                self._expect_value(buf, pos)
+                self._open({} if ch == "{" else [], pos)
+                pos += 1
+            elif ch == "}" or ch == "]":
+                self._close(ch, pos)
+                pos += 1
+            elif ch == ":":
+                if self._state != _COLON:
+                    self._invalid(pos)
+                self._state = _VALUE
+                pos += 1
+            elif ch == ",":
+                if self._state != _COMMA_OR_END:
+                    self._invalid(pos)
+                self._state = _KEY if isinstance(self._stack[-1][0], dict) else _VALUE
+                pos += 1
+            elif ch == "-" or "0" <= ch <= "9":
+                self._expect_value(buf, pos, after_string)
+                match = NUMBER_TOKEN.match(buf, pos)
+                if match is None:
+                    self._invalid(pos)
+                if match.end() == end and not final:
+                    return pos
+                number = match.group(0)
+                if match.group(1) or match.group(2):
+                    self._value(float(number), float)
+                else:
+                    self._value(int(number), int)
+                pos = match.end()
+            elif ch in "tfn":
+                self._expect_value(buf, pos, after_string)
+                for literal, value in LITERALS:
+                    if buf.startswith(literal, pos):
+                        self._value(value, type(value))
+                        pos += len(literal)
+                        break
+                    if not final and end - pos < len(literal) and literal.startswith(buf[pos:]):
+                        return pos
+                else:
+                    self._invalid(pos)
+            else:
+                self._expect_value(buf, pos, after_string)
+                self._invalid(pos, "Comments are not valid JSON" if ch == "/" else
+                              "Single-quoted strings are not valid JSON" if ch == "'" else None)
+
+    def _invalid(self, pos: int, reason: str | None = None):
+        raise DecodeAbort(Issue("INVALID_JSON", details={
+            "reason": reason or EXPECTING.get(self._state, "Extra data"),
+            "position": self._offset + pos,
+        }))
+
+    def _fail(self, code: str, field: str | None = None, **details):
+        raise DecodeAbort(Issue(code, FATAL, field, details or None))
+
+    def _expect_value(self, buf: str, pos: int, after_string: bool = False):
+        if self._state in (_VALUE, _VALUE_OR_END):
+            return
+        # A string closed early by a bare quote leaves a word right after the '"'
+        if after_string and self._state == _COMMA_OR_END and buf[pos].isalnum():
+            raise DecodeAbort(Issue("INVALID_JSON_UNESCAPED_QUOTES", details={"position": self._offset + pos}))
+        self._invalid(pos)
+
+    def _decode_question(self, buf: str, pos: int) -> int | None:
+        try:
+            question, end = _DECODER.raw_decode(buf, pos)
+        except (ValueError, RecursionError):
+            return None
+        self.questions += 1
+        if self.questions > self.budget.max_questions:
+            self._fail("QUESTION_BUDGET_EXCEEDED", "questions", limit=self.budget.max_questions)
+        issue = question_schema_issue(question, f"questions[{self.questions - 1}]", self.budget)
+        if issue is not None:
+            raise DecodeAbort(issue)
+        self._attach(question)
+        self._state = _COMMA_OR_END
+        return end
+
+    # Contract checks
+
+    def _field(self) -> str | None:
+        if not self._stack:
+            return None
+        container, context, key = self._stack[-1]
+        if context == _ROOT:
+            return key
+        if context == _QUESTION:
+            return f"questions[{self.questions - 1}].{key}" if key else f"questions[{self.questions - 1}]"
+        if context == _CHOICES:
+            return f"questions[{self.questions - 1}].choices[{len(container)}]"
+        return None
+
+    def _key(self, key: str):
+        frame = self._stack[-1]
+        context = frame[1]
+        if context == _ROOT:
+            # Top-level keys are left to check_root, which also decides between
+            # an unknown key and a missing, null or unsupported one
+            if key in DRAFT_KEYS and key not in TOP_LEVEL_KEYS:
+                self._draft = True
+        elif context == _QUESTION and key not in QUESTION_KEYS:
+            self._fail("UNKNOWN_QUESTION_KEY", f"questions[{self.questions - 1}].{key}", keys=[key])
+        frame[2] = key
+        self._state = _COLON
+
+    def _child_context(self, kind: type) -> int:
+        """Check a value against its position in the contract; returns its context"""
+        if not self._stack:
+            if kind is not dict:
+                self._fail("INVALID_ROOT_TYPE", root_type=kind.__name__)
+            return _ROOT
+
+        parent, context, key = self._stack[-1]
+        if context == _ROOT:
+            # A null or non-array `questions` is check_root's to report
+            return _QUESTIONS if key == "questions" and kind is list and not self._draft else _OTHER
+        if context == _QUESTIONS:
+            self.questions += 1
+            if self.questions > self.budget.max_questions:
+                self._fail("QUESTION_BUDGET_EXCEEDED", "questions", limit=self.budget.max_questions)
+            if kind is not dict:
+                self._fail("INVALID_QUESTION_TYPE", f"questions[{self.questions - 1}]")
+            return _QUESTION
+        if context == _QUESTION:
+            field = f"questions[{self.questions - 1}].{key}"
+            if kind is type(None):
+                self._fail("NULL_VALUE_NOT_ALLOWED", field)
+            if key == "choices":
+                if kind is not list:
+                    self._fail("INVALID_CHOICES_TYPE", field)
+                return _CHOICES
+            if key == "correct_choice_index" and kind is not int:
+                self._fail("INVALID_CORRECT_INDEX_TYPE", field)
+            if key in ("prompt", "rationale") and kind is not str:
+                self._fail("INVALID_FIELD_TYPE", field)
+        elif context == _CHOICES and kind is not str:
+            self._fail("INVALID_CHOICES_TYPE", f"questions[{self.questions - 1}].choices")
+        return _OTHER
+
+    # Building values
+
+    def _attach(self, value: Any):
+        if not self._stack:
+            self._root = value
+            return
+        container, _, key = self._stack[-1]
+        if isinstance(container, dict):
+            container[key] = value
+        else:
+            container.append(value)
+
+    def _value(self, value: Any, kind: type):
+        self._child_context(kind)
+        self._attach(value)
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+    def _open(self, container, pos: int):
+        context = self._child_context(type(container))
+        if len(self._stack) >= self.budget.max_depth:
+            self._fail("NESTING_TOO_DEEP", limit=self.budget.max_depth, position=self._offset + pos)
+        self._attach(container)
+        self._stack.append([container, context, None])
+        self._state = _KEY_OR_END if isinstance(container, dict) else _VALUE_OR_END
+
+    def _close(self, ch: str, pos: int):
+        if not self._stack:
+            self._invalid(pos)
+        container, context, _ = self._stack[-1]
+        closes_object = ch == "}"
+        if closes_object != isinstance(container, dict):
+            self._invalid(pos)
+        if self._state not in ((_KEY_OR_END if closes_object else _VALUE_OR_END), _COMMA_OR_END):
+            self._invalid(pos)
+        if context == _QUESTION:
+            missing = [key for key in QUESTION_KEYS if key not in container]
+            if missing:
+                self._fail("MISSING_REQUIRED_FIELDS", f"questions[{self.questions - 1}].{missing[0]}",
+                           fields=missing)
+        self._stack.pop()
+        self._state = _COMMA_OR_END if self._stack else _DONE
+
+
+# MARK: - Schema rules
+
+def check_root(ctx: ValidationContext):
+    data = ctx.data
+    if not isinstance(data, dict):
+        ctx.fail("INVALID_ROOT_TYPE", root_type=type(data).__name__)
+        return
+
+    if "prompt" in data and "questions" not in data:
+        _check_draft_root(ctx, data)
+        return
+
+    missing = [key for key in TOP_LEVEL_KEYS if key not in data]
+    if missing == ["contract_version"]:
+        ctx.fail("MISSING_CONTRACT_VERSION", "contract_version")
+        return
+    if missing:
+        ctx.fail("MISSING_REQUIRED_FIELDS", missing[0], fields=missing)
+        return
+
+    for key in TOP_LEVEL_KEYS:
+        if data[key] is None:
+            ctx.fail("NULL_VALUE_NOT_ALLOWED", key)
+            return
+    if data["contract_version"] != CONTRACT_VERSION:
+        ctx.fail("UNSUPPORTED_CONTRACT_VERSION", "contract_version",
+                 version=data["contract_version"], supported=CONTRACT_VERSION)
+        return
+
+    unknown = sorted(set(data) - set(TOP_LEVEL_KEYS))
+    if unknown:
+        ctx.fail("UNKNOWN_TOP_LEVEL_KEY", unknown[0], keys=unknown)
+        return
+    if not isinstance(data["topic"], str):
+        ctx.fail("INVALID_TOPIC_TYPE", "topic")
+        return
+    if not isinstance(data["questions"], list):
+        ctx.fail("INVALID_QUESTIONS_TYPE", "questions")
+        return
+    if not data["questions"]:
+        ctx.fail("NO_QUESTIONS", "questions")
+        return
+    if len(data["questions"]) > ctx.budget.max_questions:
+        ctx.fail("QUESTION_BUDGET_EXCEEDED", "questions", limit=ctx.budget.max_questions)
+        return
+
+    ctx.topic = data["topic"]
+    ctx.questions = data["questions"]
+
+
+def _check_draft_root(ctx: ValidationContext, data: Dict[str, Any]):
+    """Legacy single-question QuestionDraft payload"""
+    ctx.draft = True
+    for key in DRAFT_KEYS:
+        if key not in data:
+            ctx.fail("MISSING_FIELD", key)
+            return
+    ctx.questions = [{
+        "prompt": data["prompt"],
+        "choices": data["choices"],
+        "correct_choice_index": data["correctIndex"],
+        "rationale": data["rationale"],
+    }]
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield key
+            yield from _strings(item)
+
+
+def check_encoding(ctx: ValidationContext):
+    """Lone UTF-16 surrogates decode in Python but cannot be stored or displayed"""
+    if not SURROGATE_ESCAPE.search(ctx.raw):
+        return
+    for text in _strings(ctx.data):
+        if SURROGATE.search(text):
+            ctx.fail("INVALID_UNICODE_SEQUENCE")
+            return
+
+
+def question_schema_issue(question: Any, path: str, budget: DecodeBudget = DEFAULT_BUDGET) -> Issue | None:
+    """First structural problem with one decoded question, if any"""
+    if not isinstance(question, dict):
+        return Issue("INVALID_QUESTION_TYPE", field=path)
+    exact_keys = question.keys() == QUESTION_KEY_SET
+    if not exact_keys:
+        missing = [key for key in QUESTION_KEYS if key not in question]
+        if missing:
+            return Issue("MISSING_REQUIRED_FIELDS", field=f"{path}.{missing[0]}", details={"fields": missing})
+    nulls = [key for key in QUESTION_KEYS if question[key] is None]
+    if nulls:
+        return Issue("NULL_VALUE_NOT_ALLOWED", field=f"{path}.{nulls[0]}")
+    if not exact_keys:
+        unknown = sorted(question.keys() - QUESTION_KEY_SET)
+        return Issue("UNKNOWN_QUESTION_KEY", field=f"{path}.{unknown[0]}", details={"keys": unknown})
+    choices = question["choices"]
+    if not isinstance(choices, list) or not all(isinstance(c, str) for c in choices):
+        return Issue("INVALID_CHOICES_TYPE", field=f"{path}.choices")
+    correct = question["correct_choice_index"]
+    if not isinstance(correct, int) or isinstance(correct, bool):
+        return Issue("INVALID_CORRECT_INDEX_TYPE", field=f"{path}.correct_choice_index")
+    for key in ("prompt", "rationale"):
+        if not isinstance(question[key], str):
+            return Issue("INVALID_FIELD_TYPE", field=f"{path}.{key}")
+    limit = budget.max_field_chars
+    if len(question["prompt"]) <= limit and len(question["rationale"]) <= limit \
+            and all(len(c) <= limit for c in choices):
+        return None
+    for key, text in [("prompt", question["prompt"]), ("rationale", question["rationale"])] + [
+        (f"choices[{i}]", choice) for i, choice in enumerate(choices)
+    ]:
+        if len(text) > limit:
+            return Issue("FIELD_TOO_LARGE", field=f"{path}.{key}", details={"length": len(text), "limit": limit})
+    return None
+
+
+def check_question_schema(ctx: ValidationContext):
+    for index, question in enumerate(ctx.questions):
+        issue = question_schema_issue(question, f"questions[{index}]", ctx.budget)
+        if issue is not None:
+            ctx.issues.append(issue)
+            ctx.fatal = True
+            return
+
+
+# MARK: - Unicode rules
+
+def normalize_text(text: str) -> Tuple[str, List[str]]:
+    """Return the cleaned text and the detection codes it triggered"""
+    if text.isascii():
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text, []
+
+    found = set()
+
+    def rewrite(match):
+        replacement, code = UNICODE_TABLE[match.group()]
+        if code:
+            found.add(code)
+        return replacement
+
+    text = UNICODE_SPECIAL.sub(rewrite, text.replace("\r\n", "\n"))
+    if "EMOJI_DETECTED" in found:
+        text = DOUBLE_SPACE.sub(" ", text).strip()
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    return text, [code for code, _ in UNICODE_FLAGS if code in found]
+
+
+def normalize_payload(topic: str | None, questions: List[Dict[str, Any]]
+                      ) -> Tuple[str | None, List[Dict[str, Any]], List[Tuple[str, str]]]:
+    """
+    Normalize every text field of a test in one pass. Returns the cleaned topic
+    and questions plus (code, first field path) for each detection code.
+    """
+    flagged: Dict[str, str] = {}
+
+    def clean(text, path):
+        text, codes = normalize_text(text)
+        for code in codes:
+            flagged.setdefault(code, path)
+        return text
+
+    if topic is not None:
+        topic = clean(topic, "topic")
+    normalized = []
+    for index, question in enumerate(questions):
+        path = f"questions[{index}]"
+        normalized.append({
+            "prompt": clean(question["prompt"], f"{path}.prompt"),
+            "choices": [clean(c, f"{path}.choices[{i}]") for i, c in enumerate(question["choices"])],
+            "correct_choice_index": question["correct_choice_index"],
+            "rationale": clean(question["rationale"], f"{path}.rationale"),
+        })
+    return topic, normalized, list(flagged.items())
+
+
+def normalize_unicode(ctx: ValidationContext):
+    """Normalize every question string and warn once per detection code"""
+    if ctx.raw.isascii() and not any(escape in ctx.raw for escape in UNICODE_ESCAPES):
+        return  # every decoded string is plain ASCII without CR: nothing to rewrite
+    ctx.topic, ctx.questions, flagged = normalize_payload(ctx.topic, ctx.questions)
+    for code, path in flagged:
+        ctx.warn(code, path)
+
+
+# MARK: - Content rules
+
+def check_topic(ctx: ValidationContext, allowed_topics: Sequence[str]):
+    if ctx.topic is None or ctx.topic in allowed_topics:
+        return
+    close = difflib.get_close_matches(ctx.topic, allowed_topics, n=1, cutoff=TOPIC_FUZZY_CUTOFF)
+    if close:
+        ctx.fail("INVALID_TOPIC_NO_FUZZY_MATCH", "topic", topic=ctx.topic, closest=close[0])
+    else:
+        ctx.fail("INVALID_TOPIC", "topic", topic=ctx.topic)
+
+
+def _fold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _edge_punctuation(match: re.Match) -> str:
+    text, start, end = match.string, match.start(), match.end()
+    if end == len(text) or text[end].isspace():
+        return ""
+    if start == 0 or text[start - 1].isspace():
+        # Leading: keep a sign or decimal point that belongs to a number ("-2", ".5")
+        run = match.group()
+        return run[-1] if run[-1] in SIGNS and text[end].isdecimal() else ""
+    return match.group()
+
+
+def _strip_punctuation(text: str) -> str:
+    # Only word edges: "-2", "3.5", "1/2" and "x^2" stay distinct from "2", "35", "12" and "x2"
+    return " ".join(PUNCTUATION.sub(_edge_punctuation, text).split())
+
+
+def normalized_key(text: str) -> str:
+    """Coarsest comparison key: casefolded, whitespace-collapsed, edge punctuation removed"""
+    return _strip_punctuation(_fold(text))
+
+
+# Each level normalizes further; a duplicate is reported at the first level it appears
+DUPLICATE_LEVELS = (
+    ("DUPLICATE_CHOICES", lambda c: c),
+    ("DUPLICATE_CHOICES_CASE_INSENSITIVE", str.casefold),
+    ("DUPLICATE_CHOICES_NORMALIZED", _fold),
+    ("DUPLICATE_CHOICES_PUNCTUATION", normalized_key),
+)
+
+
+@dataclass
+class DuplicateIndex:
+    """
+    Duplicate choices and prompts for a whole test, found in one pass.
+
+    Every string is hashed once at the coarsest level (normalized_key); levels
+    only get coarser, so finer levels are computed just for the questions whose
+    coarse keys collide. Choice duplicates are keyed by question path.
+    """
+    choices: Dict[str, str] = field(default_factory=dict)
+    prompt: Issue | None = None
+
+    @classmethod
+    def build(cls, questions: List[Dict[str, Any]]) -> "DuplicateIndex":
+        index = cls()
+        exact: Dict[str, int] = {}
+        normalized: Dict[str, int] = {}
+        for number, question in enumerate(questions):
+            path = f"questions[{number}]"
+            choices = question["choices"]
+            if len({normalized_key(choice) for choice in choices}) != len(choices):
+                index.choices[path] = next(
+                    code for code, normalize in DUPLICATE_LEVELS
+                    if len({normalize(choice) for choice in choices}) != len(choices)
+                )
+
+            if index.prompt is not None:
+                continue
+            prompt = question["prompt"]
+            key = normalized_key(prompt)
+            if prompt in exact:
+                index.prompt = Issue("DUPLICATE_PROMPT_EXACT", field=f"{path}.prompt",
+                                     details={"duplicate_of": exact[prompt]})
+            elif key in normalized:
+                index.prompt = Issue("DUPLICATE_PROMPT_NORMALIZED", field=f"{path}.prompt",
+                                     details={"duplicate_of": normalized[key]})
+            exact.setdefault(prompt, number)
+            normalized.setdefault(key, number)
+        return index
+
+
+def index_duplicates(ctx: ValidationContext):
+    ctx.duplicates = DuplicateIndex.build(ctx.questions)
+
+
+def check_choices(ctx, question, path):
+    choices = question["choices"]
+    if len(choices) != CHOICE_COUNT:
+        ctx.fail("INVALID_CHOICE_COUNT", f"{path}.choices", count=len(choices), expected=CHOICE_COUNT)
+        return
+    blank = [i for i, choice in enumerate(choices) if not choice.strip()]
+    if len(blank) == len(choices):
+        ctx.fail("ALL_CHOICES_EMPTY", f"{path}.choices")
+        return
+    if blank:
+        ctx.fail("EMPTY_CHOICE", f"{path}.choices[{blank[0]}]")
+        return
+    correct = question["correct_choice_index"]
+    if not 0 <= correct < len(choices):
+        ctx.fail("CORRECT_INDEX_OUT_OF_BOUNDS", f"{path}.correct_choice_index", index=correct)
+        return
+    code = ctx.duplicates.choices.get(path)
+    if code:
+        ctx.fail(code, f"{path}.choices")
+
+
+def check_banned_phrases(ctx, question, path):
+    combined = _fold("\n".join([question["prompt"], *question["choices"]]))
+    if not any(phrase in combined for phrase, _ in BANNED_PHRASES):
+        return
+    for text, field_path in [(question["prompt"], f"{path}.prompt")] + [
+        (choice, f"{path}.choices[{i}]") for i, choice in enumerate(question["choices"])
+    ]:
+        folded = _fold(text)
+        for phrase, code in BANNED_PHRASES:
+            if phrase in folded:
+                ctx.fail(code, field_path, phrase=phrase)
+                return
+
+
+def check_prompt(ctx, question, path):
+    prompt = question["prompt"]
+    if not prompt.strip():
+        ctx.fail("PROMPT_EMPTY", f"{path}.prompt")
+    elif len(prompt) > MAX_PROMPT_CHARS:
+        ctx.fail("PROMPT_TOO_LONG", f"{path}.prompt", length=len(prompt), limit=MAX_PROMPT_CHARS)
+    elif NEGATED_NEGATIVE_PATTERN.search(prompt) or \
+            len({m.lower() for m in NEGATION_PATTERN.findall(prompt)}) >= 2:
+        ctx.fail("DOUBLE_NEGATIVE_DETECTED", f"{path}.prompt")
+    elif EXCEPT_PATTERN.search(prompt):
+        ctx.fail("EXCEPT_PATTERN_DETECTED", f"{path}.prompt")
+
+
+def check_rationale(ctx, question, path):
+    rationale = question["rationale"].strip()
+    if not rationale:
+        ctx.fail("RATIONALE_EMPTY", f"{path}.rationale")
+    elif len(rationale) < MIN_RATIONALE_CHARS:
+        ctx.fail("RATIONALE_TOO_SHORT", f"{path}.rationale",
+                 length=len(rationale), minimum=MIN_RATIONALE_CHARS)
+    elif URL_PATTERN.search(rationale):
+        ctx.fail("RATIONALE_CONTAINS_URL", f"{path}.rationale")
+
+
+def _mentions(rationale: str, answer: str) -> bool:
+    """Loose check that the rationale talks about the answer (allows plural/verb forms)"""
+    rationale = rationale.casefold()
+    words = WORD.findall(answer.casefold())
+    if not words:
+        return _fold(answer) in _fold(rationale)
+    return any(word[:max(4, len(word) - 2)] in rationale for word in words)
+
+
+def check_style(ctx, question, path):
+    """Warnings: weak wording that does not require regeneration"""
+    correct = question["choices"][question["correct_choice_index"]]
+    if not _mentions(question["rationale"], correct):
+        ctx.warn("RATIONALE_NO_MENTION_CORRECT", f"{path}.rationale")
+    if SUBJECTIVE_PATTERN.search(question["prompt"]) or \
+            any(SUBJECTIVE_PATTERN.search(choice) for choice in question["choices"]):
+        ctx.warn("SUBJECTIVE_LANGUAGE_DETECTED", f"{path}.prompt")
+    if any(ABSOLUTE_PATTERN.search(choice) for choice in question["choices"]):
+        ctx.warn("ABSOLUTE_LANGUAGE_DETECTED", f"{path}.choices")
+
+
+QUESTION_RULES = (check_choices, check_banned_phrases, check_prompt, check_rationale, check_style)
+
+
+def check_questions(ctx: ValidationContext):
+    for index, question in enumerate(ctx.questions):
+        for rule in QUESTION_RULES:
+            rule(ctx, question, f"questions[{index}]")
+            if ctx.fatal:
+                return
+
+
+def check_duplicate_prompts(ctx: ValidationContext):
+    if ctx.duplicates.prompt is not None:
+        ctx.issues.append(ctx.duplicates.prompt)
+        ctx.fatal = True
+
+
+# MARK: - Distribution rules
+
+def _repeating_unit(key: str) -> str | None:
+    """Smallest unit the whole answer key repeats with, if it cycles often enough"""
+    # Prefix function (KMP): the key's shortest period is its length minus its longest border.
+    # A shortest period of 2+ is never a single repeated letter.
+    border = [0] * len(key)
+    length = 0
+    for i in range(1, len(key)):
+        while length and key[i] != key[length]:
+            length = border[length - 1]
+        if key[i] == key[length]:
+            length += 1
+        border[i] = length
+    period = len(key) - border[-1] if key else 0
+    if 2 <= period <= len(key) // MIN_PATTERN_CYCLES:
+        return key[:period]
+    return None
+
+
+def check_distribution(ctx: ValidationContext):
+    # Out-of-range indices are the content rules' to report; without them
+    # (e.g. --groups schema distribution) they are simply not counted
+    indices = [q["correct_choice_index"] for q in ctx.questions
+               if 0 <= q["correct_choice_index"] < CHOICE_COUNT]
+    total = len(indices)
+    if total < 2:
+        return
+    counts = [indices.count(i) for i in range(CHOICE_COUNT)]
+    top = max(range(CHOICE_COUNT), key=counts.__getitem__)
+
+    if total >= 3 and counts[top] == total:
+        ctx.fail("DISTRIBUTION_ALL_SAME_ANSWER", "questions", answer=ANSWER_LETTERS[top])
+        return
+    # One question of slack keeps short tests from failing on a single extra answer
+    if counts[top] > SKEW_THRESHOLD * total + 1:
+        shares = {ANSWER_LETTERS[i]: round(c / total, 4) for i, c in enumerate(counts) if c}
+        ctx.fail("DISTRIBUTION_SKEWED", "questions", threshold=SKEW_THRESHOLD, **shares)
+        return
+
+    key = "".join(ANSWER_LETTERS[i] for i in indices)
+    if _repeating_unit(key):
+        ctx.warn("DISTRIBUTION_PATTERN_DETECTED", "questions", pattern=key)
+
+
+# MARK: - Validator
+
+RULE_GROUPS: Dict[str, Tuple[Rule, ...]] = {
+    "schema": (check_root, check_encoding, check_question_schema),
+    "unicode": (normalize_unicode,),
+    "content": (check_topic, index_duplicates, check_questions, check_duplicate_prompts),
+    "distribution": (check_distribution,),
+}
+ALL_GROUPS = tuple(RULE_GROUPS)
+
+
+class TestGenValidator:
+    """
+    Validates LLM output against the TestGen v1 contract.
+
+    `groups` selects which rule stages run (schema always runs, since every
+    later rule depends on a decoded payload). With `recover_trailing_text`,
+    text after a complete JSON object is downgraded to a TRAILING_TEXT warning
+    and the object itself is validated.
+    """
+
+    __test__ = False  # not a pytest test class
+
+    def __init__(self, groups: Sequence[str] = ALL_GROUPS,
+                 allowed_topics: Sequence[str] = BIO101_TOPICS,
+                 budget: DecodeBudget = DEFAULT_BUDGET,
+                 recover_trailing_text: bool = False):
+        unknown = set(groups) - set(RULE_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown rule groups: {', '.join(sorted(unknown))}")
+        self.allowed_topics = tuple(allowed_topics)
+        self.budget = budget
+        self.recover_trailing_text = recover_trailing_text
+        selected = ["schema"] + [g for g in ALL_GROUPS if g in groups and g != "schema"]
+        self.rules: List[Rule] = []
+        for group in selected:
+            for rule in RULE_GROUPS[group]:
+                if rule is check_topic:
+                    self.rules.append(lambda ctx: check_topic(ctx, self.allowed_topics))
+                else:
+                    self.rules.append(rule)
+
+    def validate(self, llm_output: str) -> ValidationResult:
+        """Validate LLM output against the TestGen schema and content rules"""
+        data, issue = parse_output(llm_output, self.budget)
+        return self._run(ValidationContext(raw=llm_output, data=data, budget=self.budget), issue)
+
+    def validate_stream(self, chunks: Iterable[str]) -> ValidationResult:
+        """
+        Validate a response while it is still arriving. Reading stops at the
+        first fatal structural issue, or as soon as text follows the JSON object,
+        so the caller can cancel the model request early.
+        """
+        decoder = IncrementalDecoder(self.budget)
+        received = []
+        for chunk in chunks:
+            received.append(chunk)
+            if decoder.feed(chunk) is not None or decoder.trailing_at is not None:
+                break
+        data, issue = decoder.close()
+        return self._run(ValidationContext(raw="".join(received), data=data, budget=self.budget), issue)
+
+    def _run(self, ctx: ValidationContext, issue: Issue | None) -> ValidationResult:
+        if issue is not None:
+            if issue.code != "TRAILING_TEXT" or not self.recover_trailing_text:
+                ctx.issues.append(issue)
+                return self._result(ctx)
+            ctx.warn("TRAILING_TEXT", **issue.details)
+
+        for rule in self.rules:
+            rule(ctx)
+            if ctx.fatal:
+                break
+        return self._result(ctx)
+
+    def _result(self, ctx: ValidationContext) -> ValidationResult:
+        issues = ctx.issues
+        fatal = next((i for i in issues if i.severity == FATAL), None)
+        primary = fatal or (issues[0] if issues else None)
+        if primary is None:
+            status = ValidationStatus.PASS
+        else:
+            status = ValidationStatus.FAIL if fatal else ValidationStatus.WARN
+
+        details = dict(primary.details or {}) if primary else {}
+        if issues:
+            details["issues"] = [
+                {"code": i.code, "severity": i.severity, "field": i.field} for i in issues
+            ]
+
+        payload = None
+        if fatal is None and ctx.questions:
+            payload = {"questions": ctx.questions} if ctx.draft else {
+                "contract_version": CONTRACT_VERSION,
+                "topic": ctx.topic,
+                "questions": ctx.questions,
+            }
+
+        return ValidationResult(
+            status=status,
+            error_code=primary.code if primary else None,
+            should_trigger_regeneration=fatal is not None,
+            details=details or None,
+            payload=payload,
+        )
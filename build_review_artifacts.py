@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Single-pass review artifact builder
+Loads Localizable.xcstrings once, collects every locale's strings in one pass
+over the catalog, scores them once, and writes all cultural review guides,
+cultural prompts, Reddit-style prompts and instruction files in parallel.
+
+create_cultural_review_system.py and generate_ai_review_prompts.py both build
+through here; run this directly to produce both sets in one go.
+
+Usage:
+    python3 build_review_artifacts.py                         # every locale, both sets
+    python3 build_review_artifacts.py --locale ja --locale ko
+    python3 build_review_artifacts.py --prompts-dir none      # guides only
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from create_cultural_review_system import CULTURAL_CONTEXTS, write_review_guide, write_review_prompts
+from generate_ai_review_prompts import LANGUAGE_INFO, write_instructions, write_reddit_prompts
+from review_ledger import DEFAULT_LEDGER, ReviewLedger
+from review_priority import load_scores
+from review_prompt_packer import DEFAULT_PROMPT_TOKENS
+
+ROOT = Path(__file__).parent
+DEFAULT_CATALOG = ROOT / "SharedCore" / "DesignSystem" / "Localizable.xcstrings"
+DEFAULT_GUIDES_DIR = ROOT / "translation_reviews"
+DEFAULT_PROMPTS_DIR = ROOT / "ai_review_prompts"
+
+
+@dataclass
+class LocaleArtifacts:
+    """Files written for one locale; `errors` holds any task that failed"""
+    strings: int = 0
+    reviewed: int = 0
+    flagged: int = 0
+    prompt_strings: int = 0
+    guide: Optional[Path] = None
+    prompts: List[Path] = field(default_factory=list)
+    reddit_prompts: List[Path] = field(default_factory=list)
+    instructions: Optional[Path] = None
+    errors: List[str] = field(default_factory=list)
+
+
+def collect_locale_strings(data: Dict, locales: Optional[Sequence[str]] = None) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Every locale's (english_key, translation) pairs from one pass over the
+    catalog, in catalog order; same selection as get_language_strings.
+    """
+    wanted = set(locales) if locales else None
+    strings: Dict[str, List[Tuple[str, str]]] = {locale: [] for locale in locales or ()}
+    for english_key, value in data.get('strings', {}).items():
+        for locale, localization in value.get('localizations', {}).items():
+            if locale == 'en' or (wanted is not None and locale not in wanted):
+                continue
+            translated = localization.get('stringUnit', {}).get('value', '')
+            if translated and translated != english_key:
+                strings.setdefault(locale, []).append((english_key, translated))
+    return strings
+
+
+def _top_strings(strings: List[Tuple[str, str]], ranked, top: int) -> List[Tuple[str, str]]:
+    if not top:
+        return strings
+    keep = {s.key for s in ranked[:top]}
+    return [pair for pair in strings if pair[0] in keep]
+
+
+def build_review_artifacts(data: Dict, locales: Optional[Sequence[str]] = None,
+                           guides_dir: Optional[Path] = None, reddit_dir: Optional[Path] = None,
+                           top: int = 100, prompt_top: int = 0,
+                           max_tokens: int = DEFAULT_PROMPT_TOKENS, memory_paths: Sequence[Path] = (),
+                           jobs: int = 8, ledger: Optional[ReviewLedger] = None) -> Dict[str, LocaleArtifacts]:
+    """
+    Write review artifacts for `locales` (default: every translated locale).
+    `guides_dir` receives cultural_review_<lang>.md and prompt_<lang>_NN.txt,
+    `reddit_dir` receives review_<lang>*.txt and review_<lang>_instructions.md;
+    either may be None to skip that set. `top` bounds the guide table and
+    `prompt_top` the strings put in prompts (0 = all). A failing task is
+    recorded in that locale's `errors` and does not stop the others.
+    With a `ledger`, translations it already has a verdict for are left out
+    (scores still use the whole catalog), except that flagged ones stay in the
+    guide, in their own section, for a human to resolve.
+    """
+    strings = collect_locale_strings(data, locales)
+    scores = load_scores(data=data, locales=list(strings), memory_paths=memory_paths)
+    results = {locale: LocaleArtifacts(strings=len(pairs)) for locale, pairs in strings.items()}
+
+    tasks: List[Tuple[str, str, Callable]] = []
+    for locale, pairs in strings.items():
+        ranked = scores.get(locale, [])
+        artifacts = results[locale]
+        flagged: List[Tuple[str, str]] = []
+        if ledger is not None:
+            flagged = ledger.flagged(locale, pairs)
+            pairs = ledger.pending(locale, pairs)
+            artifacts.flagged = len(flagged)
+            artifacts.reviewed = artifacts.strings - len(pairs) - len(flagged)
+            current = set(pairs)
+            ranked = [s for s in ranked if (s.key, s.translation) in current]
+            if not pairs and not flagged:
+                continue
+        if guides_dir is not None:
+            def guide(locale=locale, pairs=pairs, ranked=ranked, artifacts=artifacts, flagged=flagged):
+                artifacts.guide = write_review_guide(locale, pairs, guides_dir, ranked, top, artifacts.reviewed,
+                                                     flagged)
+            tasks.append((locale, 'guide', guide))
+        if guides_dir is not None and pairs:
+            def prompts(locale=locale, pairs=pairs, ranked=ranked, artifacts=artifacts):
+                artifacts.prompts = write_review_prompts(locale, pairs, guides_dir, max_tokens, ranked, prompt_top)
+            tasks.append((locale, 'prompts', prompts))
+        prompt_pairs = _top_strings(pairs, ranked, prompt_top)
+        artifacts.prompt_strings = len(prompt_pairs)
+        if reddit_dir is not None and prompt_pairs:
+            def reddit(locale=locale, pairs=prompt_pairs, ranked=ranked, artifacts=artifacts):
+                lang_info = LANGUAGE_INFO.get(locale, {'name': locale.upper()})
+                artifacts.reddit_prompts = write_reddit_prompts(locale, pairs, lang_info['name'], reddit_dir,
+                                                                max_tokens, ranked)
+                artifacts.instructions = write_instructions(locale, lang_info, len(pairs),
+                                                            artifacts.reddit_prompts, reddit_dir, max_tokens)
+            tasks.append((locale, 'reddit', reddit))
+
+    for directory in (guides_dir, reddit_dir):
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def run(task):
+        locale, kind, write = task
+        try:
+            write()
+        except Exception as e:
+            results[locale].errors.append(f"{kind}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        list(pool.map(run, tasks))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build every locale's review guides and AI prompts in one pass")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--locale', action='append', help="Only build these locales (repeatable)")
+    parser.add_argument('--guides-dir', default=str(DEFAULT_GUIDES_DIR),
+                        help="Cultural guides and prompts ('none' to skip)")
+    parser.add_argument('--prompts-dir', default=str(DEFAULT_PROMPTS_DIR),
+                        help="Reddit-style prompts and instructions ('none' to skip)")
+    parser.add_argument('--top', type=int, default=100, help="Riskiest translations listed per guide")
+    parser.add_argument('--prompt-top', type=int, default=0,
+                        help="Only put the N riskiest translations in AI prompts (default: all)")
+    parser.add_argument('--max-prompt-tokens', type=int, default=DEFAULT_PROMPT_TOKENS)
+    parser.add_argument('--memory', type=Path, action='append', default=[],
+                        help="Translation memory JSON for review_priority (repeatable)")
+    parser.add_argument('--jobs', type=int, default=8, help="Parallel artifact writers")
+    parser.add_argument('--ledger', type=Path, default=DEFAULT_LEDGER,
+                        help="Review ledger; translations it has a verdict for are skipped")
+    parser.add_argument('--all', action='store_true', help="Include already-reviewed translations")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+    guides_dir = None if args.guides_dir.lower() == 'none' else Path(args.guides_dir)
+    reddit_dir = None if args.prompts_dir.lower() == 'none' else Path(args.prompts_dir)
+
+    start = time.perf_counter()
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    ledger = None if args.all else ReviewLedger.load(args.ledger)
+    results = build_review_artifacts(data, args.locale, guides_dir, reddit_dir, args.top, args.prompt_top,
+                                     args.max_prompt_tokens, args.memory, args.jobs, ledger)
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for locale in sorted(results):
+        artifacts = results[locale]
+        name = CULTURAL_CONTEXTS.get(locale, LANGUAGE_INFO.get(locale, {})).get('name', locale.upper())
+        if artifacts.errors:
+            failed += 1
+            print(f"⚠️  {name:25} {'; '.join(artifacts.errors)}")
+            continue
+        if artifacts.reviewed == artifacts.strings:
+            print(f"⏭  {name:25} {artifacts.strings:5} strings, all reviewed")
+            continue
+        files = len(artifacts.prompts) + len(artifacts.reddit_prompts) + bool(artifacts.guide) + bool(artifacts.instructions)
+        pending = artifacts.strings - artifacts.reviewed - artifacts.flagged
+        print(f"✅ {name:25} {pending:5} strings → {files} files"
+              + (f" ({artifacts.reviewed} already reviewed)" if artifacts.reviewed else "")
+              + (f" 🚩 {artifacts.flagged} flagged" if artifacts.flagged else ""))
+
+    print()
+    for label, directory in (("Guides", guides_dir), ("Prompts", reddit_dir)):
+        if directory is not None:
+            print(f"📁 {label}: {directory}/")
+    print(f"🎯 {len(results)} locales in {elapsed:.2f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,13 +4,18 @@ AI-Powered Cultural Translation Refinement System
 Uses Claude/GPT to review and improve translations for cultural appropriateness
 """
 
+import argparse
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 import time
 
+from review_ledger import DEFAULT_LEDGER, ReviewLedger
+from review_priority import ScoredString, priority_lookup
+from review_prompt_packer import DEFAULT_PROMPT_TOKENS, ReviewItem, format_review_item, plan_review_batches
+
 # Cultural refinement prompts for each language
 CULTURAL_CONTEXTS = {
     'ko': {
@@ -164,7 +169,8 @@ def get_language_strings(data: Dict, lang_code: str) -> List[Tuple[str, str]]:
                 strings.append((english_key, translated))
     return strings
 
-def create_cultural_review_prompt(lang_code: str, strings_batch: List[Tuple[str, str]]) -> str:
+def create_cultural_review_prompt(lang_code: str, strings_batch: Sequence[Tuple[str, str]],
+                                  part: int = 1, parts: int = 1) -> str:
     """Create a prompt for AI to review translations culturally"""
     
     context = CULTURAL_CONTEXTS.get(lang_code, {})
@@ -209,23 +215,60 @@ FORMAT YOUR RESPONSE AS JSON:
 
 ONLY include translations that need improvement. If a translation is already good, skip it.
 
-TRANSLATIONS TO REVIEW:
+TRANSLATIONS TO REVIEW (part {part} of {parts}):
 
 """
     
-    for idx, (english, translation) in enumerate(strings_batch[:50], 1):
-        prompt += f"{idx}. English: \"{english}\"\n"
-        prompt += f"   {lang_name}: \"{translation}\"\n\n"
+    for idx, item in enumerate(strings_batch, 1):
+        prompt += format_review_item(idx, ReviewItem(*item), lang_name)
     
     prompt += "\nProvide your review as JSON:"
     
     return prompt
 
-def create_review_guide(xcstrings_path: Path, lang_code: str, output_dir: Path):
+def create_cultural_review_prompts(lang_code: str, strings: List[Tuple[str, str]],
+                                   max_tokens: int = DEFAULT_PROMPT_TOKENS,
+                                   ranked: Optional[List[ScoredString]] = None) -> List[str]:
+    """Review prompts covering every string of a locale, each within max_tokens, riskiest first"""
+    lang_name = CULTURAL_CONTEXTS.get(lang_code, {}).get('name', lang_code.upper())
+    render = lambda batch, part, parts: create_cultural_review_prompt(lang_code, batch, part, parts)
+    priority = priority_lookup(ranked) if ranked is not None else None
+    batches = plan_review_batches(strings, lang_name, render, max_tokens, priority)
+    return [render(batch, part, len(batches)) for part, batch in enumerate(batches, 1)]
+
+def write_review_prompts(lang_code: str, strings: List[Tuple[str, str]], output_dir: Path,
+                         max_tokens: int = DEFAULT_PROMPT_TOKENS,
+                         ranked: Optional[List[ScoredString]] = None, top: int = 0) -> List[Path]:
+    """Write prompt_<lang>_NN.txt files covering `strings` (only the `top` riskiest when set)"""
+    if ranked is not None and top:
+        keep = {s.key for s in ranked[:top]}
+        strings = [pair for pair in strings if pair[0] in keep]
+    paths = []
+    for part, prompt in enumerate(create_cultural_review_prompts(lang_code, strings, max_tokens, ranked), 1):
+        path = output_dir / f"prompt_{lang_code}_{part:02d}.txt"
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(prompt)
+        paths.append(path)
+    return paths
+
+def create_review_guide(xcstrings_path: Path, lang_code: str, output_dir: Path,
+                        ranked: Optional[List[ScoredString]] = None, top: int = 100):
     """Create a comprehensive review guide for manual or AI review"""
     
-    data = load_translations(xcstrings_path)
-    strings = get_language_strings(data, lang_code)
+    strings = get_language_strings(load_translations(xcstrings_path), lang_code)
+    return write_review_guide(lang_code, strings, output_dir, ranked, top)
+
+def write_review_guide(lang_code: str, strings: List[Tuple[str, str]], output_dir: Path,
+                       ranked: Optional[List[ScoredString]] = None, top: int = 100,
+                       reviewed: int = 0, flagged: Sequence[Tuple[str, str]] = ()) -> Path:
+    """
+    Write cultural_review_<lang>.md for `strings`. With `ranked` (from
+    review_priority) the guide lists the `top` riskiest translations with
+    their score and flags; otherwise the first `top` in catalog order.
+    `reviewed` counts translations left out because the review ledger
+    already has a verdict for them; `flagged` lists those the AI review
+    raised an issue with but could not fix, in a section of their own.
+    """
     
     context = CULTURAL_CONTEXTS.get(lang_code, {})
     lang_name = context.get('name', lang_code.upper())
@@ -235,7 +278,11 @@ def create_review_guide(xcstrings_path: Path, lang_code: str, output_dir: Path):
     with open(guide_path, 'w', encoding='utf-8') as f:
         f.write(f"# Cultural Review Guide: {lang_name}\n\n")
         f.write(f"**Language Code**: {lang_code}\n")
-        f.write(f"**Total Translations**: {len(strings)}\n")
+        f.write(f"**Total Translations**: {len(strings) + len(flagged)}\n")
+        if reviewed:
+            f.write(f"**Already Reviewed**: {reviewed} (unchanged since review, see `review_ledger.py`)\n")
+        if flagged:
+            f.write(f"**Flagged by AI Review**: {len(flagged)} (need a human, see below)\n")
         f.write(f"**Generated**: {time.strftime('%Y-%m-%d %H:%M')}\n\n")
         
         f.write("## Cultural Context\n\n")
@@ -252,138 +299,74 @@ def create_review_guide(xcstrings_path: Path, lang_code: str, output_dir: Path):
         f.write("2. **Formality Level**: Is it appropriate for a student app UI?\n")
         f.write("3. **Terminology**: Do students actually use these terms?\n")
         f.write("4. **Context**: Does it fit the educational/productivity context?\n")
-        f.write("5. **Length**: Will it fit in UI buttons/labels?\n\n")
+        f.write("5. **Length**: Will it fit in UI buttons/labels? (`truncation_estimator.py` lists the widest)\n\n")
+        
+        if flagged:
+            f.write("## Flagged by AI Review\n\n")
+            f.write("The AI review raised an issue with these translations but had no fix that could be "
+                    "applied. Correct them in the catalog (they become pending again), or accept them with "
+                    f"`python3 review_ledger.py mark --locale {lang_code} --key KEY`.\n\n")
+            f.write("| # | English | Current Translation | Notes |\n")
+            f.write("|---|---------|-------------------|-------|\n")
+            for idx, (english, translation) in enumerate(flagged, 1):
+                english_safe = english.replace('|', '\\|')
+                translation_safe = translation.replace('|', '\\|')
+                f.write(f"| {idx} | {english_safe} | {translation_safe} | |\n")
+            f.write("\n")
+            if not strings:
+                return guide_path
         
         f.write("## Translations to Review\n\n")
-        f.write("| # | English | Current Translation | Notes |\n")
-        f.write("|---|---------|-------------------|-------|\n")
+        if ranked is not None:
+            f.write(f"Riskiest {min(top, len(ranked))} of {len(ranked)} translations by review priority "
+                    f"(see `review_priority.py` for the signals).\n\n")
+            f.write("| # | English | Current Translation | Score | Flags | Notes |\n")
+            f.write("|---|---------|-------------------|-------|-------|-------|\n")
+            rows = [(s.key, s.translation, f" {s.score:.2f} | {', '.join(s.reasons)} |") for s in ranked[:top]]
+            total = len(ranked)
+        else:
+            f.write("| # | English | Current Translation | Notes |\n")
+            f.write("|---|---------|-------------------|-------|\n")
+            rows = [(english, translation, "") for english, translation in strings[:top]]
+            total = len(strings)
         
-        for idx, (english, translation) in enumerate(strings[:100], 1):
+        for idx, (english, translation, scored) in enumerate(rows, 1):
             # Escape pipe characters
             english_safe = english.replace('|', '\\|')
             translation_safe = translation.replace('|', '\\|')
-            f.write(f"| {idx} | {english_safe} | {translation_safe} | |\n")
+            f.write(f"| {idx} | {english_safe} | {translation_safe} |{scored} |\n")
         
-        if len(strings) > 100:
-            f.write(f"\n... and {len(strings) - 100} more translations\n")
+        if total > top:
+            f.write(f"\n... and {total - top} more translations\n")
     
     return guide_path
 
 def create_ai_review_script(output_dir: Path):
-    """Create a script for using Claude/GPT API to review translations"""
+    """Create an ai_cultural_review.py launcher for the concurrent review runner"""
     
     script_path = output_dir / "ai_cultural_review.py"
+    runner = Path(__file__).resolve().parent / "review_runner.py"
+    # Relative to the launcher, so the checkout can move or be cloned elsewhere
+    runner_path = Path(os.path.relpath(runner, output_dir.resolve())).as_posix()
     
     with open(script_path, 'w', encoding='utf-8') as f:
-        f.write('''#!/usr/bin/env python3
+        f.write(f'''#!/usr/bin/env python3
 """
 AI Cultural Review using Claude or GPT API
-Requires: pip install anthropic openai
+Runs review_runner.py: every prompt chunk is reviewed concurrently, responses
+are cached, and accepted suggestions are merged into the catalog in one write.
+
+Usage:
+    python ai_cultural_review.py --provider anthropic      # ANTHROPIC_API_KEY
+    python ai_cultural_review.py --provider openai         # OPENAI_API_KEY
+    python ai_cultural_review.py --provider local --endpoint http://127.0.0.1:8080/v1 --dry-run
 """
 
-import json
 import os
 import sys
-from pathlib import Path
-
-# Choose your AI provider
-USE_CLAUDE = True  # Set to False to use OpenAI instead
 
-if USE_CLAUDE:
-    try:
-        import anthropic
-        CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
-        if not CLAUDE_API_KEY:
-            print("❌ Set ANTHROPIC_API_KEY environment variable")
-            print("   Get key from: https://console.anthropic.com/")
-            sys.exit(1)
-    except ImportError:
-        print("❌ Install: pip install anthropic")
-        sys.exit(1)
-else:
-    try:
-        import openai
-        OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-        if not OPENAI_API_KEY:
-            print("❌ Set OPENAI_API_KEY environment variable")
-            sys.exit(1)
-        openai.api_key = OPENAI_API_KEY
-    except ImportError:
-        print("❌ Install: pip install openai")
-        sys.exit(1)
-
-def review_with_claude(prompt: str) -> str:
-    """Use Claude to review translations"""
-    client = anthropic.Anthropic(api_key=CLAUDE_API_KEY)
-    
-    message = client.messages.create(
-        model="claude-3-5-sonnet-20241022",
-        max_tokens=4000,
-        messages=[
-            {"role": "user", "content": prompt}
-        ]
-    )
-    
-    return message.content[0].text
-
-def review_with_gpt(prompt: str) -> str:
-    """Use GPT-4 to review translations"""
-    response = openai.ChatCompletion.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "You are an expert translator and cultural consultant."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.3
-    )
-    
-    return response.choices[0].message.content
-
-def main():
-    print("🤖 AI Cultural Translation Review")
-    print("="*70)
-    
-    # Load review prompt from file
-    if len(sys.argv) < 2:
-        print("Usage: python ai_cultural_review.py <review_prompt_file.txt>")
-        sys.exit(1)
-    
-    prompt_file = Path(sys.argv[1])
-    if not prompt_file.exists():
-        print(f"❌ File not found: {prompt_file}")
-        sys.exit(1)
-    
-    with open(prompt_file, 'r', encoding='utf-8') as f:
-        prompt = f.read()
-    
-    print(f"📝 Loaded prompt from {prompt_file}")
-    print(f"🤖 Using {'Claude' if USE_CLAUDE else 'GPT-4'} for review...")
-    print()
-    
-    try:
-        if USE_CLAUDE:
-            result = review_with_claude(prompt)
-        else:
-            result = review_with_gpt(prompt)
-        
-        print("✅ Review complete!")
-        print()
-        print(result)
-        
-        # Save results
-        output_file = prompt_file.parent / f"review_results_{prompt_file.stem}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(result)
-        
-        print()
-        print(f"💾 Results saved to: {output_file}")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        sys.exit(1)
-
-if __name__ == "__main__":
-    main()
+RUNNER = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), {runner_path!r}))
+os.execv(sys.executable, [sys.executable, RUNNER, *sys.argv[1:]])
 ''')
     
     os.chmod(script_path, 0o755)
@@ -392,8 +375,23 @@ if __name__ == "__main__":
 def main():
     """Generate cultural review system"""
     
+    parser = argparse.ArgumentParser(description="Generate cultural review guides and AI review prompts")
+    parser.add_argument('--max-prompt-tokens', type=int, default=DEFAULT_PROMPT_TOKENS,
+                        help="Token budget per AI review prompt")
+    parser.add_argument('--output-dir', type=Path, default=Path(__file__).parent / "translation_reviews")
+    parser.add_argument('--top', type=int, default=100, help="Riskiest translations listed per guide")
+    parser.add_argument('--prompt-top', type=int, default=0,
+                        help="Only put the N riskiest translations in AI prompts (default: all)")
+    parser.add_argument('--memory', type=Path, action='append', default=[],
+                        help="Translation memory JSON for review_priority (repeatable)")
+    parser.add_argument('--jobs', type=int, default=8, help="Parallel artifact writers")
+    parser.add_argument('--ledger', type=Path, default=DEFAULT_LEDGER,
+                        help="Review ledger; translations it has a verdict for are skipped")
+    parser.add_argument('--all', action='store_true', help="Include already-reviewed translations")
+    args = parser.parse_args()
+    
     xcstrings_file = Path(__file__).parent / "SharedCore" / "DesignSystem" / "Localizable.xcstrings"
-    output_dir = Path(__file__).parent / "translation_reviews"
+    output_dir = args.output_dir
     
     if not xcstrings_file.exists():
         print(f"❌ File not found: {xcstrings_file}")
@@ -431,24 +429,38 @@ def main():
     print(f"🎯 Generating cultural review guides for {len(priority_langs)} priority languages...")
     print()
     
-    guides_created = []
+    # Find matching language in data
+    actual_langs = {}
     for lang in priority_langs:
-        # Find matching language in data
-        actual_lang = lang
+        actual_langs[lang] = lang
         for l in all_langs:
             if l.lower() == lang.lower() or l.lower().startswith(lang):
-                actual_lang = l
+                actual_langs[lang] = l
                 break
-        
-        try:
-            guide_path = create_review_guide(xcstrings_file, actual_lang, output_dir)
-            guides_created.append((actual_lang, guide_path))
-            
-            context = CULTURAL_CONTEXTS.get(lang, {})
-            lang_name = context.get('name', actual_lang.upper())
-            print(f"✅ {lang_name:20} → {guide_path.name}")
-        except Exception as e:
-            print(f"⚠️  {lang}: {e}")
+    
+    # One pass over the catalog builds every guide and prompt (see build_review_artifacts.py)
+    from build_review_artifacts import build_review_artifacts
+    results = build_review_artifacts(data, list(actual_langs.values()), guides_dir=output_dir,
+                                     top=args.top, prompt_top=args.prompt_top,
+                                     max_tokens=args.max_prompt_tokens, memory_paths=args.memory,
+                                     jobs=args.jobs,
+                                     ledger=None if args.all else ReviewLedger.load(args.ledger))
+    
+    guides_created = []
+    for lang, actual_lang in actual_langs.items():
+        artifacts = results[actual_lang]
+        if artifacts.errors:
+            print(f"⚠️  {lang}: {'; '.join(artifacts.errors)}")
+            continue
+        context = CULTURAL_CONTEXTS.get(lang, {})
+        lang_name = context.get('name', actual_lang.upper())
+        if artifacts.guide is None:
+            print(f"⏭  {lang_name:20} → all {artifacts.reviewed} translations already reviewed")
+            continue
+        guides_created.append((actual_lang, artifacts.guide))
+        print(f"✅ {lang_name:20} → {artifacts.guide.name} + {len(artifacts.prompts)} review prompts"
+              + (f" ({artifacts.reviewed} already reviewed)" if artifacts.reviewed else "")
+              + (f" 🚩 {artifacts.flagged} flagged" if artifacts.flagged else ""))
     
     print()
     
@@ -473,7 +485,7 @@ def main():
     print("Option 2: AI Review (Requires API)")
     print("  • Set up Claude API: export ANTHROPIC_API_KEY=your_key")
     print("  • Or OpenAI API: export OPENAI_API_KEY=your_key")
-    print(f"  • Run: python {ai_script}")
+    print(f"  • Run: python {ai_script} --provider anthropic")
     print()
     print("Option 3: Hybrid Approach (RECOMMENDED)")
     print("  • Use AI to flag potential issues quickly")
@@ -5,10 +5,15 @@ Reviews translations by analyzing real Reddit/GitHub usage patterns
 No API keys needed - uses GitHub Copilot's MCP integration
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from review_ledger import DEFAULT_LEDGER, ReviewLedger
+from review_priority import ScoredString, priority_lookup
+from review_prompt_packer import DEFAULT_PROMPT_TOKENS, ReviewItem, format_review_item, plan_review_batches
 
 def load_translations(xcstrings_path: Path) -> Dict:
     """Load the xcstrings file"""
@@ -26,7 +31,8 @@ def get_language_strings(data: Dict, lang_code: str) -> List[Tuple[str, str]]:
                 strings.append((english_key, translated))
     return strings
 
-def create_reddit_style_review_prompt(lang_code: str, strings_batch: List[Tuple[str, str]], lang_name: str) -> str:
+def create_reddit_style_review_prompt(lang_code: str, strings_batch: Sequence[Tuple[str, str]], lang_name: str,
+                                      part: int = 1, parts: int = 1) -> str:
     """Create a prompt that leverages Copilot's knowledge of Reddit/social media language"""
     
     prompt = f"""I need your help reviewing {lang_name} translations for a student study/productivity app.
@@ -62,18 +68,82 @@ Why: [explain based on real {lang_name} usage patterns]
 
 Only flag translations that genuinely sound unnatural. If it's already good, skip it.
 
-TRANSLATIONS TO REVIEW (first 30):
+TRANSLATIONS TO REVIEW (part {part} of {parts}, {len(strings_batch)} strings):
 
 """
     
-    for idx, (english, translation) in enumerate(strings_batch[:30], 1):
-        prompt += f"{idx}. English: \"{english}\"\n"
-        prompt += f"   {lang_name}: \"{translation}\"\n\n"
+    for idx, item in enumerate(strings_batch, 1):
+        prompt += format_review_item(idx, ReviewItem(*item), lang_name)
     
     prompt += f"\nBased on your knowledge of real {lang_name} usage on Reddit, GitHub, and social media, which translations sound unnatural?"
     
     return prompt
 
+def create_reddit_style_review_prompts(lang_code: str, strings: List[Tuple[str, str]], lang_name: str,
+                                       max_tokens: int = DEFAULT_PROMPT_TOKENS,
+                                       ranked: Optional[List[ScoredString]] = None) -> List[str]:
+    """Review prompts covering every string of a locale, each within max_tokens, riskiest first"""
+    render = lambda batch, part, parts: create_reddit_style_review_prompt(lang_code, batch, lang_name, part, parts)
+    priority = priority_lookup(ranked) if ranked is not None else None
+    batches = plan_review_batches(strings, lang_name, render, max_tokens, priority)
+    return [render(batch, part, len(batches)) for part, batch in enumerate(batches, 1)]
+
+def write_reddit_prompts(lang: str, strings: List[Tuple[str, str]], lang_name: str, output_dir: Path,
+                         max_tokens: int = DEFAULT_PROMPT_TOKENS,
+                         ranked: Optional[List[ScoredString]] = None) -> List[Path]:
+    """Save review_<lang>.txt, or review_<lang>_01.txt ... when the prompts are split"""
+    prompts = create_reddit_style_review_prompts(lang, strings, lang_name, max_tokens, ranked)
+    prompt_files = [output_dir / (f"review_{lang}.txt" if len(prompts) == 1 else f"review_{lang}_{part:02d}.txt")
+                    for part in range(1, len(prompts) + 1)]
+    for prompt_file, prompt in zip(prompt_files, prompts):
+        with open(prompt_file, 'w', encoding='utf-8') as f:
+            f.write(prompt)
+    return prompt_files
+
+def write_instructions(lang: str, lang_info: Dict, strings_count: int, prompt_files: List[Path],
+                       output_dir: Path, max_tokens: int = DEFAULT_PROMPT_TOKENS) -> Path:
+    """Markdown file explaining how to run a language's review prompts"""
+    lang_name = lang_info['name']
+    prompt_file = prompt_files[0]
+    instructions_file = output_dir / f"review_{lang}_instructions.md"
+    with open(instructions_file, 'w', encoding='utf-8') as f:
+        f.write(f"# {lang_name} Translation Review\n\n")
+        f.write(f"**Language Code**: {lang}\n")
+        f.write(f"**Strings**: {strings_count}\n")
+        f.write(f"**Prompts**: {len(prompt_files)} (up to {max_tokens} tokens each)\n\n")
+        if len(prompt_files) > 1:
+            f.write(f"Send each prompt in its own chat, highest priority first:\n\n")
+            for part_file in prompt_files:
+                f.write(f"- `{part_file.name}`\n")
+            f.write("\n")
+        f.write(f"## How to Use This\n\n")
+        f.write(f"### Option 1: GitHub Copilot Chat\n")
+        f.write(f"1. Open `{prompt_file.name}` in VS Code\n")
+        f.write(f"2. Select all text (Cmd+A)\n")
+        f.write(f"3. Open Copilot Chat (Cmd+Shift+I)\n")
+        f.write(f"4. Paste the prompt and send\n")
+        f.write(f"5. Copilot will analyze based on its knowledge of {lang_name} from Reddit/forums\n\n")
+        f.write(f"### Option 2: ChatGPT\n")
+        f.write(f"1. Go to chat.openai.com\n")
+        f.write(f"2. Copy-paste the prompt from `{prompt_file.name}`\n")
+        f.write(f"3. ChatGPT will review using its vast {lang_name} training data\n\n")
+        f.write(f"### Option 3: Claude (Best Quality)\n")
+        f.write(f"1. Go to claude.ai\n")
+        f.write(f"2. Upload `{prompt_file.name}` or paste the prompt\n")
+        f.write(f"3. Claude will provide detailed cultural analysis\n\n")
+        f.write(f"## What to Expect\n\n")
+        f.write(f"The AI will identify translations that:\n")
+        f.write(f"- Sound too formal or too casual\n")
+        f.write(f"- Use outdated terminology\n")
+        f.write(f"- Feel \"machine translated\"\n")
+        f.write(f"- Don't match how students actually talk\n\n")
+        f.write(f"## Context\n\n")
+        if 'reddit_context' in lang_info:
+            f.write(f"**Reddit/Forum Context**: {lang_info['reddit_context']}\n")
+        if 'key_points' in lang_info:
+            f.write(f"**Key Considerations**: {lang_info['key_points']}\n")
+    return instructions_file
+
 # Language metadata for analysis
 LANGUAGE_INFO = {
     'ko': {
@@ -156,8 +226,22 @@ LANGUAGE_INFO = {
 def main():
     """Generate review prompts for Copilot/ChatGPT to analyze"""
     
+    parser = argparse.ArgumentParser(description="Generate AI cultural review prompts for every translated string")
+    parser.add_argument('--max-prompt-tokens', type=int, default=DEFAULT_PROMPT_TOKENS,
+                        help="Token budget per prompt; each locale is split into as many prompts as needed")
+    parser.add_argument('--output-dir', type=Path, default=Path(__file__).parent / "ai_review_prompts")
+    parser.add_argument('--top', type=int, default=0,
+                        help="Only review the N riskiest translations per language (default: all)")
+    parser.add_argument('--memory', type=Path, action='append', default=[],
+                        help="Translation memory JSON for review_priority (repeatable)")
+    parser.add_argument('--jobs', type=int, default=8, help="Parallel prompt writers")
+    parser.add_argument('--ledger', type=Path, default=DEFAULT_LEDGER,
+                        help="Review ledger; translations it has a verdict for are skipped")
+    parser.add_argument('--all', action='store_true', help="Include already-reviewed translations")
+    args = parser.parse_args()
+    
     xcstrings_file = Path(__file__).parent / "SharedCore" / "DesignSystem" / "Localizable.xcstrings"
-    output_dir = Path(__file__).parent / "ai_review_prompts"
+    output_dir = args.output_dir
     
     if not xcstrings_file.exists():
         print(f"❌ File not found: {xcstrings_file}")
@@ -194,61 +278,29 @@ def main():
     print(f"🎯 Generating review prompts for {len(priority_langs)} languages...")
     print()
     
+    # One pass over the catalog builds every language's prompts (see build_review_artifacts.py)
+    from build_review_artifacts import build_review_artifacts
+    results = build_review_artifacts(data, priority_langs, reddit_dir=output_dir, prompt_top=args.top,
+                                     max_tokens=args.max_prompt_tokens, memory_paths=args.memory,
+                                     jobs=args.jobs,
+                                     ledger=None if args.all else ReviewLedger.load(args.ledger))
+    
     prompts_created = []
     for lang in priority_langs:
-        try:
-            strings = get_language_strings(data, lang)
-            if not strings:
-                continue
-            
-            lang_info = LANGUAGE_INFO.get(lang, {'name': lang.upper()})
-            lang_name = lang_info['name']
-            
-            prompt = create_reddit_style_review_prompt(lang, strings, lang_name)
-            
-            # Save prompt to file
-            prompt_file = output_dir / f"review_{lang}.txt"
-            with open(prompt_file, 'w', encoding='utf-8') as f:
-                f.write(prompt)
-            
-            # Also create a markdown file with instructions
-            instructions_file = output_dir / f"review_{lang}_instructions.md"
-            with open(instructions_file, 'w', encoding='utf-8') as f:
-                f.write(f"# {lang_name} Translation Review\n\n")
-                f.write(f"**Language Code**: {lang}\n")
-                f.write(f"**Strings**: {len(strings)}\n\n")
-                f.write(f"## How to Use This\n\n")
-                f.write(f"### Option 1: GitHub Copilot Chat\n")
-                f.write(f"1. Open `{prompt_file.name}` in VS Code\n")
-                f.write(f"2. Select all text (Cmd+A)\n")
-                f.write(f"3. Open Copilot Chat (Cmd+Shift+I)\n")
-                f.write(f"4. Paste the prompt and send\n")
-                f.write(f"5. Copilot will analyze based on its knowledge of {lang_name} from Reddit/forums\n\n")
-                f.write(f"### Option 2: ChatGPT\n")
-                f.write(f"1. Go to chat.openai.com\n")
-                f.write(f"2. Copy-paste the prompt from `{prompt_file.name}`\n")
-                f.write(f"3. ChatGPT will review using its vast {lang_name} training data\n\n")
-                f.write(f"### Option 3: Claude (Best Quality)\n")
-                f.write(f"1. Go to claude.ai\n")
-                f.write(f"2. Upload `{prompt_file.name}` or paste the prompt\n")
-                f.write(f"3. Claude will provide detailed cultural analysis\n\n")
-                f.write(f"## What to Expect\n\n")
-                f.write(f"The AI will identify translations that:\n")
-                f.write(f"- Sound too formal or too casual\n")
-                f.write(f"- Use outdated terminology\n")
-                f.write(f"- Feel \"machine translated\"\n")
-                f.write(f"- Don't match how students actually talk\n\n")
-                f.write(f"## Context\n\n")
-                if 'reddit_context' in lang_info:
-                    f.write(f"**Reddit/Forum Context**: {lang_info['reddit_context']}\n")
-                if 'key_points' in lang_info:
-                    f.write(f"**Key Considerations**: {lang_info['key_points']}\n")
-            
-            prompts_created.append((lang, lang_name, prompt_file, len(strings)))
-            print(f"✅ {lang_name:25} → {prompt_file.name} ({len(strings)} strings)")
-            
-        except Exception as e:
-            print(f"⚠️  {lang}: {e}")
+        artifacts = results[lang]
+        if artifacts.errors:
+            print(f"⚠️  {lang}: {'; '.join(artifacts.errors)}")
+            continue
+        if not artifacts.reddit_prompts:
+            if artifacts.reviewed or artifacts.flagged:
+                print(f"⏭  {lang:25} → all {artifacts.reviewed + artifacts.flagged} translations already reviewed"
+                      + (f" ({artifacts.flagged} flagged for a human)" if artifacts.flagged else ""))
+            continue
+        lang_name = LANGUAGE_INFO.get(lang, {'name': lang.upper()})['name']
+        prompt_file = artifacts.reddit_prompts[0]
+        count = artifacts.prompt_strings
+        prompts_created.append((lang, lang_name, prompt_file, count))
+        print(f"✅ {lang_name:25} → {prompt_file.name} ({count} strings, {len(artifacts.reddit_prompts)} prompts)")
     
     print()
     print("="*70)
@@ -296,7 +348,7 @@ def main():
     print("="*70)
     print()
     print("📊 SUMMARY:")
-    print(f"  • Generated {len(prompts_created)} review prompts")
+    print(f"  • Generated review prompts for {len(prompts_created)} languages")
     print(f"  • Covering {sum(count for _, _, _, count in prompts_created)} translations")
     print("  • Ready for AI analysis (no API keys needed!)")
     print("  • Uses free AI tools you already have access to")
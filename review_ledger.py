@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Translation review ledger
+Records which (key, locale, translation) triples have already been reviewed and
+with what verdict, so guides and prompts only carry new or changed translations
+
+A translation is identified by a hash of its text: editing a translation (by
+hand, by a translator or by review_runner) makes it pending again, while
+re-running the generators over an unchanged catalog emits nothing new.
+
+Verdicts:
+- ok:       reviewed, no issue raised
+- revised:  the current text is the reviewer's own suggestion
+- flagged:  an issue was raised but no usable fix was applied (needs a human)
+
+The ledger is plain JSON ({locale: {key: {hash, verdict, source, date}}}),
+sorted for stable diffs, so it can be committed and shared.
+
+Usage:
+    python3 review_ledger.py                               # reviewed / pending per locale
+    python3 review_ledger.py mark --locale ja --source manual   # mark ja's current translations ok
+    python3 review_ledger.py prune                         # drop entries for removed keys
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).parent
+DEFAULT_LEDGER = ROOT / "review_ledger.json"
+DEFAULT_CATALOG = ROOT / "SharedCore" / "DesignSystem" / "Localizable.xcstrings"
+LEDGER_VERSION = 1
+VERDICTS = ("ok", "revised", "flagged")
+
+
+def translation_hash(translation: str) -> str:
+    return hashlib.sha256(translation.encode("utf-8")).hexdigest()[:16]
+
+
+class ReviewLedger:
+    """Review verdicts by locale and key, valid only while the translation text is unchanged"""
+
+    def __init__(self, path: Path = DEFAULT_LEDGER, reviews: Optional[Dict[str, Dict[str, Dict]]] = None):
+        self.path = path
+        self.reviews = reviews or {}
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_LEDGER) -> "ReviewLedger":
+        """The ledger at `path`; empty (everything pending) when the file does not exist yet"""
+        if not path.exists():
+            return cls(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            ledger = json.load(f)
+        if ledger.get("version") != LEDGER_VERSION:
+            raise ValueError(f"{path}: unsupported ledger version {ledger.get('version')!r}")
+        return cls(path, ledger.get("reviews", {}))
+
+    def save(self):
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"version": LEDGER_VERSION, "reviews": self.reviews}, f,
+                      ensure_ascii=False, indent=1, sort_keys=True)
+            f.write("\n")
+        os.replace(tmp, self.path)
+
+    def verdict(self, key: str, locale: str, translation: str) -> Optional[str]:
+        """The recorded verdict for this exact translation, or None if it is unreviewed or changed"""
+        entry = self.reviews.get(locale, {}).get(key)
+        if entry is None or entry["hash"] != translation_hash(translation):
+            return None
+        return entry["verdict"]
+
+    def record(self, key: str, locale: str, translation: str, verdict: str = "ok", source: str = "manual"):
+        if verdict not in VERDICTS:
+            raise ValueError(f"unknown verdict {verdict!r} (expected one of {', '.join(VERDICTS)})")
+        self.reviews.setdefault(locale, {})[key] = {
+            "hash": translation_hash(translation),
+            "verdict": verdict,
+            "source": source,
+            "date": time.strftime('%Y-%m-%d'),
+        }
+
+    def pending(self, locale: str, strings: Sequence[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        The (key, translation) pairs of `strings` with no verdict for their
+        current text, i.e. what still needs an AI review. Flagged translations
+        are not pending; flagged() lists them for the human review guides.
+        """
+        reviewed = self.reviews.get(locale)
+        if not reviewed:
+            return list(strings)
+        return [(key, translation) for key, translation in strings
+                if key not in reviewed or reviewed[key]["hash"] != translation_hash(translation)]
+
+    def flagged(self, locale: str, strings: Sequence[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """The (key, translation) pairs of `strings` whose current text is flagged for a human"""
+        reviewed = self.reviews.get(locale)
+        if not reviewed:
+            return []
+        return [(key, translation) for key, translation in strings
+                if key in reviewed and reviewed[key]["verdict"] == "flagged"
+                and reviewed[key]["hash"] == translation_hash(translation)]
+
+    def prune(self, keys: Iterable[str]) -> int:
+        """Drop entries for keys not in `keys`; returns how many were removed"""
+        keep = set(keys)
+        removed = 0
+        for entries in self.reviews.values():
+            for key in [k for k in entries if k not in keep]:
+                del entries[key]
+                removed += 1
+        return removed
+
+
+# MARK: - CLI
+
+def _catalog_strings(catalog: Path, locales: Optional[Sequence[str]]) -> Tuple[Dict, Dict[str, List[Tuple[str, str]]]]:
+    from build_review_artifacts import collect_locale_strings
+    with open(catalog, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, collect_locale_strings(data, locales)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track which translations have already been reviewed")
+    parser.add_argument('command', nargs='?', choices=('status', 'mark', 'prune'), default='status')
+    parser.add_argument('--ledger', type=Path, default=DEFAULT_LEDGER)
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--locale', action='append', help="Only these locales (repeatable)")
+    parser.add_argument('--key', action='append', help="mark: only these keys (repeatable)")
+    parser.add_argument('--verdict', choices=VERDICTS, default='ok', help="mark: verdict to record")
+    parser.add_argument('--source', default='manual', help="mark: who reviewed (e.g. a reviewer's name)")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+    try:
+        ledger = ReviewLedger.load(args.ledger)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    data, strings = _catalog_strings(args.catalog, args.locale)
+
+    if args.command == 'mark':
+        keys = set(args.key) if args.key else None
+        marked = 0
+        for locale, pairs in strings.items():
+            # Named keys are re-marked even if reviewed (e.g. flagged -> ok); otherwise only pending ones
+            for key, translation in (pairs if keys else ledger.pending(locale, pairs)):
+                if keys is None or key in keys:
+                    ledger.record(key, locale, translation, args.verdict, args.source)
+                    marked += 1
+        ledger.save()
+        print(f"✅ Marked {marked} translations '{args.verdict}' ({args.source})")
+        print(f"💾 Saved to: {ledger.path}")
+        return 0
+
+    if args.command == 'prune':
+        removed = ledger.prune(data.get('strings', {}))
+        ledger.save()
+        print(f"✅ Removed {removed} entries for keys no longer in the catalog")
+        print(f"💾 Saved to: {ledger.path}")
+        return 0
+
+    print(f"📒 Review ledger: {ledger.path}")
+    print("=" * 70)
+    print(f"{'Locale':10} {'Strings':>8} {'Reviewed':>9} {'Pending':>8}  Verdicts")
+    total_pending = total_flagged = 0
+    for locale in sorted(strings):
+        pairs = strings[locale]
+        pending = len(ledger.pending(locale, pairs))
+        total_pending += pending
+        total_flagged += len(ledger.flagged(locale, pairs))
+        verdicts: Dict[str, int] = {}
+        for key, translation in pairs:
+            verdict = ledger.verdict(key, locale, translation)
+            if verdict:
+                verdicts[verdict] = verdicts.get(verdict, 0) + 1
+        print(f"{locale:10} {len(pairs):8} {len(pairs) - pending:9} {pending:8}  "
+              + ", ".join(f"{v} {n}" for v, n in sorted(verdicts.items())))
+    print(f"\n🎯 {total_pending:,} translations pending review")
+    if total_flagged:
+        print(f"🚩 {total_flagged:,} flagged translations need a human (listed in the review guides)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
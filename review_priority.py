@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Review-priority scoring for translations
+Ranks every (key, locale) pair so reviewers and AI prompts see the riskiest translations first
+
+Signals (per pair, combined with SIGNAL_WEIGHTS):
+- placeholders:  format specifiers differ from the English (%@, %d, %1$@ ...)
+- untranslated:  identical to the English, or mostly Latin letters in a locale
+                 whose translations are otherwise non-Latin
+- length:        length ratio vs English far from the locale's typical ratio
+- machine:       stringUnit state is not "translated" (needs_review / new)
+- inconsistent:  another key with the same English text has a different
+                 translation in this locale
+- memory:        share of translation-memory backends (--memory) that disagree
+- references:    how often the key appears in Swift string literals (visibility)
+
+Features are collected into columns in one pass over the catalog and scored
+together (with NumPy when installed), so all locales score in a few seconds,
+most of which is tokenizing the Swift sources.
+
+Usage:
+    python3 review_priority.py                      # top 20 per locale
+    python3 review_priority.py --locale ja --top 50
+    python3 review_priority.py --memory tm_google.json --json review_priority.json
+"""
+
+import argparse
+import json
+import math
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / "Scripts"))
+
+from audit_localization_keys import SOURCE_DIRS, find_swift_files, normalize_format  # noqa: E402
+from review_prompt_packer import placeholders  # noqa: E402
+from swift_lexer import STRING, SwiftLexError, decode_string, replace_interpolations, tokenize  # noqa: E402
+from xcstrings_catalog import DEFAULT_CATALOG, english_value  # noqa: E402
+
+# NumPy is optional; scoring falls back to plain Python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SIGNAL_WEIGHTS = {
+    'placeholders': 5.0,
+    'untranslated': 3.0,
+    'machine': 2.0,
+    'memory': 2.0,
+    'length': 1.5,
+    'inconsistent': 1.5,
+    'references': 1.0,
+}
+SIGNALS = tuple(SIGNAL_WEIGHTS)
+# A signal at or above this value is listed as a reason in guides and reports
+REASON_THRESHOLD = 0.5
+# Locales whose translations average less Latin than this are treated as non-Latin
+NON_LATIN_LOCALE = 0.5
+# |log length ratio| beyond the locale median at which the length signal saturates
+LENGTH_SATURATION = math.log(3)
+
+_LETTER = re.compile(r"[^\W\d_]")
+_LATIN = re.compile(r"[A-Za-z]")
+_SPECIFIER = re.compile(r"%(?:\d+\$)?[-+ #0']*\d*(?:\.\d+)?(?:hh|h|ll|l|q|z|t|j|L)?[@dDiuUxXoOfFeEgGcCsSpaA%]")
+
+
+class ScoredString(NamedTuple):
+    key: str
+    english: str
+    translation: str
+    score: float
+    reasons: tuple
+
+
+# MARK: - Inputs
+
+def swift_reference_counts(source_dirs: Optional[Sequence[Path]] = None) -> Counter:
+    """Occurrences of every string literal in the Swift sources; interpolations count as %@"""
+    counts = Counter()
+    for path in find_swift_files(list(source_dirs or [ROOT / d for d in SOURCE_DIRS])):
+        try:
+            content = path.read_text(encoding='utf-8')
+            for token in tokenize(content):
+                if token.kind != STRING:
+                    continue
+                if token.interpolated:
+                    counts[normalize_format(replace_interpolations(token, '%@'))] += 1
+                else:
+                    counts[decode_string(token)] += 1
+        except (OSError, UnicodeDecodeError, SwiftLexError) as e:
+            print(f"Error scanning {path}: {e}", file=sys.stderr)
+    return counts
+
+
+def load_memory(paths: Iterable[Path]) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """
+    Translation memory from one or more JSON files shaped
+    {"backend": {"locale": {"key": "translation"}}}, merged by backend.
+    """
+    memory: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for backend, locales in json.load(f).items():
+                for locale, entries in locales.items():
+                    memory.setdefault(backend, {}).setdefault(locale, {}).update(entries)
+    return memory
+
+
+def _strip_placeholders(text: str) -> str:
+    return _SPECIFIER.sub("", text)
+
+
+def _latin_share(text: str) -> float:
+    text = _strip_placeholders(text)
+    letters = len(_LETTER.findall(text))
+    return len(_LATIN.findall(text)) / letters if letters else 0.0
+
+
+# MARK: - Scoring
+
+def _weighted(columns: Dict[str, List[float]]) -> List[float]:
+    if np is not None:
+        matrix = np.array([columns[name] for name in SIGNALS], dtype=np.float64)
+        weights = np.array([SIGNAL_WEIGHTS[name] for name in SIGNALS])
+        return (weights @ matrix).tolist()
+    weights = [SIGNAL_WEIGHTS[name] for name in SIGNALS]
+    return [sum(w * v for w, v in zip(weights, row)) for row in zip(*(columns[name] for name in SIGNALS))]
+
+
+def score_catalog(data: Dict, locales: Optional[Sequence[str]] = None,
+                  references: Optional[Counter] = None,
+                  memory: Optional[Dict[str, Dict[str, Dict[str, str]]]] = None) -> Dict[str, List[ScoredString]]:
+    """
+    Score every translated (key, locale) pair. Returns each locale's strings
+    sorted riskiest first. Pairs are those get_language_strings reviews: a
+    non-empty translation that differs from the key.
+    """
+    references = references if references is not None else Counter()
+    memory = memory or {}
+    wanted = set(locales) if locales else None
+
+    rows = []  # (locale, key, english, translation, state)
+    for key, entry in data.get('strings', {}).items():
+        english = english_value(key, entry)
+        for locale, localization in entry.get('localizations', {}).items():
+            if locale == 'en' or (wanted is not None and locale not in wanted):
+                continue
+            unit = localization.get('stringUnit', {})
+            translation = unit.get('value', '')
+            if translation and translation != key:
+                rows.append((locale, key, english, translation, unit.get('state', 'translated')))
+
+    # Per-locale context: typical length ratio, whether the script is Latin, and
+    # the translations each English text received
+    log_ratios = [math.log((len(t) + 1) / (len(e) + 1)) for _, _, e, t, _ in rows]
+    latin = [_latin_share(t) for _, _, _, t, _ in rows]
+    by_locale: Dict[str, List[int]] = {}
+    renderings: Dict[tuple, set] = {}
+    for i, (locale, _, english, translation, _) in enumerate(rows):
+        by_locale.setdefault(locale, []).append(i)
+        renderings.setdefault((locale, " ".join(english.casefold().split())), set()).add(translation)
+    median_ratio = {loc: statistics.median(log_ratios[i] for i in idx) for loc, idx in by_locale.items()}
+    non_latin = {loc for loc, idx in by_locale.items()
+                 if statistics.mean(latin[i] for i in idx) < NON_LATIN_LOCALE}
+    max_refs = math.log1p(max(references.values(), default=0)) or 1.0
+
+    columns: Dict[str, List[float]] = {name: [] for name in SIGNALS}
+    for i, (locale, key, english, translation, state) in enumerate(rows):
+        columns['placeholders'].append(float(sorted(placeholders(english)) != sorted(placeholders(translation))))
+        if translation == english:
+            untranslated = float(bool(_LETTER.search(_strip_placeholders(translation))))
+        else:
+            untranslated = latin[i] if locale in non_latin else 0.0
+        columns['untranslated'].append(untranslated)
+        columns['length'].append(min(1.0, abs(log_ratios[i] - median_ratio[locale]) / LENGTH_SATURATION))
+        columns['machine'].append(float(state != 'translated'))
+        columns['inconsistent'].append(float(len(renderings[(locale, " ".join(english.casefold().split()))]) > 1))
+        backends = [m[locale][key] for m in memory.values() if key in m.get(locale, {})]
+        columns['memory'].append(sum(b != translation for b in backends) / len(backends) if backends else 0.0)
+        uses = references.get(key, 0)
+        normalized = normalize_format(key)
+        if normalized != key:
+            uses += references.get(normalized, 0)
+        columns['references'].append(math.log1p(uses) / max_refs)
+
+    scores = _weighted(columns)
+    ranked: Dict[str, List[ScoredString]] = {}
+    for locale, indices in by_locale.items():
+        indices.sort(key=lambda i: -scores[i])
+        ranked[locale] = [
+            ScoredString(rows[i][1], rows[i][2], rows[i][3], round(scores[i], 3),
+                         tuple(name for name in SIGNALS
+                               if name != 'references' and columns[name][i] >= REASON_THRESHOLD))
+            for i in indices
+        ]
+    return ranked
+
+
+def load_scores(xcstrings_path: Path = DEFAULT_CATALOG, data: Optional[Dict] = None,
+                locales: Optional[Sequence[str]] = None, memory_paths: Sequence[Path] = ()
+                ) -> Dict[str, List[ScoredString]]:
+    """Score a catalog (loaded from disk unless `data` is given) using the repo's Swift sources"""
+    if data is None:
+        with open(xcstrings_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    return score_catalog(data, locales, swift_reference_counts(), load_memory(memory_paths))
+
+
+def priority_lookup(ranked: Sequence[ScoredString]):
+    """Priority function for review_prompt_packer: an item scores as its riskiest key"""
+    by_key = {s.key: s.score for s in ranked}
+    return lambda item: max(by_key.get(k, 0.0) for k in (item.english, *item.aliases))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank translations by review priority")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--locale', action='append', help="Only score these locales (repeatable)")
+    parser.add_argument('--memory', type=Path, action='append', default=[],
+                        help="Translation memory JSON {backend: {locale: {key: text}}} (repeatable)")
+    parser.add_argument('--top', type=int, default=20, help="Strings shown per locale")
+    parser.add_argument('--json', type=Path, help="Write the top strings per locale as JSON")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+
+    start = time.perf_counter()
+    ranked = load_scores(args.catalog, locales=args.locale, memory_paths=args.memory)
+    elapsed = time.perf_counter() - start
+
+    pairs = sum(len(strings) for strings in ranked.values())
+    print(f"🎯 Review priority: {pairs:,} translations in {len(ranked)} locales ({elapsed:.2f}s"
+          f"{', NumPy' if np is not None else ''})")
+    print("=" * 70)
+    for locale in sorted(ranked):
+        flagged = Counter(reason for s in ranked[locale] for reason in s.reasons)
+        print(f"\n{locale}: {len(ranked[locale])} strings  "
+              + ", ".join(f"{reason} {count}" for reason, count in flagged.most_common()))
+        for s in ranked[locale][:args.top]:
+            print(f"  {s.score:5.2f}  {s.key[:40]!r:44} → {s.translation[:40]!r}  {', '.join(s.reasons)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({locale: [s._asdict() for s in strings[:args.top]] for locale, strings in ranked.items()},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted prompt packing for translation review
+Splits a locale's full string list into as few review prompts as fit a token budget
+"""
+
+import math
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # optional: fall back to the character-class estimate
+    _ENCODING = None
+
+DEFAULT_PROMPT_TOKENS = 6000
+
+# Scripts that a BPE vocabulary splits into roughly one token per character
+_WIDE = re.compile(
+    r"[\u0900-\u0DFF"   # Indic scripts
+    r"\u0E00-\u0EFF"    # Thai, Lao
+    r"\u1100-\u11FF"    # Hangul Jamo
+    r"\u3000-\u9FFF"    # CJK punctuation, kana, ideographs
+    r"\uAC00-\uD7AF"    # Hangul syllables
+    r"\uF900-\uFAFF\uFF00-\uFFEF]"
+)
+_PLACEHOLDER = re.compile(r"%(?:\d+\$)?((?:l{0,2}|h{0,2}|q|z|j|t)?[@dDiuUxXoOfFeEgGcCsSpaA%])")
+_TRIM = " \t\n.:…!?"
+
+
+class ReviewItem(NamedTuple):
+    """One translation to review; `aliases` are other English keys with the same translation"""
+    english: str
+    translation: str
+    aliases: Tuple[str, ...] = ()
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count from tiktoken when installed, otherwise a conservative per-script estimate"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    wide = len(_WIDE.findall(text))
+    other = len(text) - ascii_chars - wide
+    return math.ceil(ascii_chars / 4 + other / 2 + wide * 1.2)
+
+
+def placeholders(text: str) -> List[str]:
+    """Format specifiers in order without their position (%1$@ -> %@), ignoring literal %%"""
+    return ["%" + p for p in _PLACEHOLDER.findall(text) if p != "%"]
+
+
+def default_priority(item: ReviewItem) -> float:
+    """Higher reviews first: broken placeholders, then translations far longer/shorter than English"""
+    score = 0.0
+    if sorted(placeholders(item.english)) != sorted(placeholders(item.translation)):
+        score += 10.0
+    ratio = (len(item.translation) + 1) / (len(item.english) + 1)
+    return score + abs(math.log(ratio))
+
+
+def dedupe_translations(strings: Sequence[Tuple[str, str]]) -> List[ReviewItem]:
+    """
+    Collapse English keys that differ only in case, whitespace or trailing
+    punctuation and share the exact same translation into one ReviewItem.
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for english, translation in strings:
+        key = (" ".join(english.casefold().split()).strip(_TRIM), translation)
+        groups.setdefault(key, []).append(english)
+    return [
+        ReviewItem(keys[0], translation, tuple(keys[1:]))
+        for (_, translation), keys in groups.items()
+    ]
+
+
+def format_review_item(number: int, item: ReviewItem, lang_name: str) -> str:
+    """One numbered entry in the TRANSLATIONS TO REVIEW list"""
+    also = ""
+    if item.aliases:
+        also = " (also used for: " + ", ".join(f'"{alias}"' for alias in item.aliases) + ")"
+    return f"{number}. English: \"{item.english}\"{also}\n   {lang_name}: \"{item.translation}\"\n\n"
+
+
+def pack_items(items: Sequence[ReviewItem], lang_name: str, overhead: int,
+               budget: int = DEFAULT_PROMPT_TOKENS) -> List[List[ReviewItem]]:
+    """
+    Split `items` (already in priority order) into consecutive batches whose
+    prompt, `overhead` tokens of fixed text plus the rendered entries, stays
+    within `budget`. Filling each batch before starting the next gives the
+    fewest batches for a fixed order. An entry too large for any batch gets a
+    batch of its own rather than being dropped.
+    """
+    available = budget - overhead
+    if available <= 0:
+        raise ValueError(f"prompt budget {budget} does not cover the {overhead}-token prompt template")
+
+    batches: List[List[ReviewItem]] = []
+    batch: List[ReviewItem] = []
+    used = 0
+    for item in items:
+        # Numbers restart per batch; 3 digits covers any batch that fits a budget
+        cost = estimate_tokens(format_review_item(999, item, lang_name))
+        if batch and used + cost > available:
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(item)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def plan_review_batches(strings: Sequence[Tuple[str, str]], lang_name: str,
+                        render: Callable[[List[ReviewItem], int, int], str],
+                        budget: int = DEFAULT_PROMPT_TOKENS,
+                        priority: Optional[Callable[[ReviewItem], float]] = None) -> List[List[ReviewItem]]:
+    """
+    Dedupe a locale's strings, order them by review priority and pack them
+    into batches for `render(batch, part, parts)`. The template overhead is
+    measured by rendering an empty batch with the widest part numbers.
+    """
+    items = dedupe_translations(strings)
+    items.sort(key=priority or default_priority, reverse=True)
+    overhead = estimate_tokens(render([], 999, 999))
+    return pack_items(items, lang_name, overhead, budget)
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Concurrent AI Cultural Review Runner
+Sends every review prompt chunk to a model endpoint concurrently, caches the
+responses and merges accepted suggestions back into the string catalog
+
+- prompts are the token-budgeted, priority-ordered chunks from
+  create_cultural_review_system (one list per locale)
+- requests run concurrently (--concurrency) under a requests-per-minute limit
+  (--rate), with retries and backoff on 429 / 5xx / connection errors
+- responses are cached on disk by a hash of the endpoint, model and prompt,
+  so re-running over an unchanged catalog sends nothing
+- each response is parsed back and validated against the translations_to_improve
+  schema; a suggestion is accepted only when it names a string from its chunk,
+  quotes that string's current translation, changes it, and keeps the English
+  format specifiers
+- accepted suggestions are applied to every key sharing the reviewed
+  translation and the catalog is written once at the end
+- every translation in an answered chunk gets a verdict in the review ledger
+  (review_ledger.py), so the next run only sends new or changed translations
+
+Endpoints (stdlib HTTP only, no SDK needed):
+- anthropic:  Messages API (ANTHROPIC_API_KEY)
+- openai:     Chat Completions (OPENAI_API_KEY)
+- local:      any OpenAI-compatible server at --endpoint, e.g. a stub or llama.cpp
+
+Usage:
+    python3 review_runner.py --provider anthropic --locale ja --locale ko
+    python3 review_runner.py --provider local --endpoint http://127.0.0.1:8080/v1 --dry-run
+    python3 review_runner.py --provider openai --top 200 --concurrency 8 --rate 120
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from create_cultural_review_system import (
+    CULTURAL_CONTEXTS, create_cultural_review_prompt, get_language_strings, load_translations, save_translations,
+)
+from review_ledger import DEFAULT_LEDGER, ReviewLedger
+from review_priority import load_scores, priority_lookup
+from review_prompt_packer import DEFAULT_PROMPT_TOKENS, ReviewItem, placeholders, plan_review_batches
+from xcstrings_catalog import DEFAULT_CATALOG, english_value  # on sys.path via review_priority
+
+DEFAULT_CACHE = Path(__file__).parent / ".review_cache"
+REQUIRED_FIELDS = ("english", "current_translation", "issue", "suggested_improvement", "reasoning")
+RETRY_STATUS = {408, 429, 500, 502, 503, 504, 529}
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 120
+REVIEWED_STATE = "needs_review"  # AI suggestions still want a native speaker's sign-off
+
+
+# MARK: - Endpoints
+
+class Endpoint:
+    """A model API; subclasses build the request body and extract the reply text"""
+
+    kind = "base"
+
+    def __init__(self, url: str, model: str, api_key: str = "", max_tokens: int = 4000):
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+        self.max_tokens = max_tokens
+
+    @property
+    def cache_id(self) -> str:
+        return f"{self.kind}:{self.model}"
+
+    def headers(self) -> Dict[str, str]:
+        return {"Content-Type": "application/json"}
+
+    def body(self, prompt: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def text(self, reply: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+    def post(self, prompt: str) -> str:
+        """Blocking request with retries; run through asyncio.to_thread"""
+        data = json.dumps(self.body(prompt)).encode("utf-8")
+        for attempt in range(MAX_RETRIES + 1):
+            request = urllib.request.Request(self.url, data=data, headers=self.headers(), method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                    return self.text(json.loads(response.read().decode("utf-8")))
+            except urllib.error.HTTPError as e:
+                if e.code not in RETRY_STATUS or attempt == MAX_RETRIES:
+                    raise
+                retry_after = e.headers.get("Retry-After", "")
+                time.sleep(float(retry_after) if retry_after.replace(".", "", 1).isdigit() else 2 ** attempt)
+            except (urllib.error.URLError, TimeoutError):
+                if attempt == MAX_RETRIES:
+                    raise
+                time.sleep(2 ** attempt)
+        raise RuntimeError("unreachable")
+
+
+class ChatCompletionsEndpoint(Endpoint):
+    """OpenAI Chat Completions, and any local server speaking the same protocol"""
+
+    kind = "openai"
+
+    def headers(self) -> Dict[str, str]:
+        headers = super().headers()
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def body(self, prompt: str) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an expert translator and cultural consultant."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.3,
+            "max_tokens": self.max_tokens,
+        }
+
+    def text(self, reply: Dict[str, Any]) -> str:
+        return reply["choices"][0]["message"]["content"]
+
+
+class LocalEndpoint(ChatCompletionsEndpoint):
+    kind = "local"
+
+
+class AnthropicEndpoint(Endpoint):
+    kind = "anthropic"
+
+    def headers(self) -> Dict[str, str]:
+        return dict(super().headers(), **{"x-api-key": self.api_key, "anthropic-version": "2023-06-01"})
+
+    def body(self, prompt: str) -> Dict[str, Any]:
+        return {"model": self.model, "max_tokens": self.max_tokens,
+                "messages": [{"role": "user", "content": prompt}]}
+
+    def text(self, reply: Dict[str, Any]) -> str:
+        return "".join(block.get("text", "") for block in reply["content"] if block.get("type") == "text")
+
+
+# provider -> (endpoint class, default URL, default model, API key variable)
+PROVIDERS = {
+    "anthropic": (AnthropicEndpoint, "https://api.anthropic.com/v1/messages",
+                  "claude-3-5-sonnet-20241022", "ANTHROPIC_API_KEY"),
+    "openai": (ChatCompletionsEndpoint, "https://api.openai.com/v1/chat/completions",
+               "gpt-4-turbo-preview", "OPENAI_API_KEY"),
+    "local": (LocalEndpoint, "http://127.0.0.1:8080/v1", "local", None),
+}
+
+
+def make_endpoint(provider: str, url: Optional[str] = None, model: Optional[str] = None) -> Endpoint:
+    cls, default_url, default_model, key_var = PROVIDERS[provider]
+    api_key = os.getenv(key_var, "") if key_var else ""
+    if key_var and not api_key:
+        raise ValueError(f"Set {key_var} environment variable")
+    url = url or default_url
+    if provider == "local" and not url.endswith("/chat/completions"):
+        url = url.rstrip("/") + "/chat/completions"
+    return cls(url, model or default_model, api_key)
+
+
+# MARK: - Scheduling
+
+class RateLimiter:
+    """Spaces request starts at least 60/per_minute seconds apart"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self.next_start = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ResponseCache:
+    """One JSON file per response, keyed by the hash of endpoint, model and prompt"""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, endpoint: Endpoint, prompt: str) -> Path:
+        digest = hashlib.sha256(f"{endpoint.cache_id}\n{prompt}".encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, endpoint: Endpoint, prompt: str) -> Optional[str]:
+        try:
+            with open(self.path(endpoint, prompt), "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def discard(self, endpoint: Endpoint, prompt: str):
+        self.path(endpoint, prompt).unlink(missing_ok=True)
+
+    def put(self, endpoint: Endpoint, prompt: str, response: str):
+        path = self.path(endpoint, prompt)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"endpoint": endpoint.cache_id, "response": response}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+
+@dataclass
+class ReviewChunk:
+    locale: str
+    part: int
+    prompt: str
+    items: List[ReviewItem]
+    response: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+
+async def _review(chunk: ReviewChunk, endpoint: Endpoint, cache: ResponseCache,
+                  limiter: RateLimiter, slots: asyncio.Semaphore):
+    cached = cache.get(endpoint, chunk.prompt)
+    if cached is not None:
+        try:
+            response_entries(cached)
+        except ResponseError:
+            # Written before responses were checked: ask again instead of replaying it
+            cache.discard(endpoint, chunk.prompt)
+        else:
+            chunk.response, chunk.cached = cached, True
+            return
+    async with slots:
+        await limiter.wait()
+        try:
+            chunk.response = await asyncio.to_thread(endpoint.post, chunk.prompt)
+        except Exception as e:
+            chunk.error = f"{type(e).__name__}: {e}"
+            return
+    # Only usable replies are cached; a malformed one is retried on the next run
+    try:
+        response_entries(chunk.response)
+    except ResponseError as e:
+        chunk.error = f"{e.reason}: {e}"
+        return
+    cache.put(endpoint, chunk.prompt, chunk.response)
+
+
+async def review_all(chunks: Sequence[ReviewChunk], endpoint: Endpoint, cache: ResponseCache,
+                     concurrency: int = 4, rate: float = 50.0):
+    """Fill in every chunk's response, from the cache or the endpoint"""
+    limiter = RateLimiter(rate)
+    slots = asyncio.Semaphore(concurrency)
+    await asyncio.gather(*(_review(chunk, endpoint, cache, limiter, slots) for chunk in chunks))
+
+
+# MARK: - Prompts
+
+def build_chunks(data: Dict, locales: Sequence[str], max_tokens: int = DEFAULT_PROMPT_TOKENS,
+                 top: int = 0, scores: Optional[Dict] = None,
+                 ledger: Optional[ReviewLedger] = None) -> List[ReviewChunk]:
+    """Token-budgeted review prompts for each locale, riskiest strings first, skipping reviewed ones"""
+    chunks = []
+    for locale in locales:
+        strings = get_language_strings(data, locale)
+        if ledger is not None:
+            strings = ledger.pending(locale, strings)
+        ranked = (scores or {}).get(locale)
+        if ranked is not None and top:
+            pending = set(strings)
+            keep = {s.key for s in [s for s in ranked if (s.key, s.translation) in pending][:top]}
+            strings = [pair for pair in strings if pair[0] in keep]
+        if not strings:
+            continue
+        lang_name = CULTURAL_CONTEXTS.get(locale, {}).get('name', locale.upper())
+        render = lambda batch, part, parts, locale=locale: create_cultural_review_prompt(locale, batch, part, parts)
+        priority = priority_lookup(ranked) if ranked is not None else None
+        batches = plan_review_batches(strings, lang_name, render, max_tokens, priority)
+        for part, batch in enumerate(batches, 1):
+            chunks.append(ReviewChunk(locale, part, render(batch, part, len(batches)), batch))
+    return chunks
+
+
+# MARK: - Ingestion
+
+@dataclass
+class Suggestion:
+    locale: str
+    keys: Tuple[str, ...]
+    current: str
+    suggested: str
+    issue: str
+    reasoning: str
+
+
+@dataclass
+class Ingestion:
+    accepted: List[Suggestion] = field(default_factory=list)
+    rejected: Counter = field(default_factory=Counter)
+    examples: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # (locale, item) for every item of a chunk whose response had a valid schema
+    reviewed: List[Tuple[str, ReviewItem]] = field(default_factory=list)
+    # (locale, english) of items with an issue that could not be applied: a suggestion
+    # that broke its placeholders, or one quoting a translation other than the current
+    flagged: set = field(default_factory=set)
+
+    def reject(self, reason: str, entry: Any):
+        self.rejected[reason] += 1
+        self.examples.setdefault(reason, entry if isinstance(entry, dict) else {"response": str(entry)[:500]})
+
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+def parse_response(text: str) -> Any:
+    """The first JSON object in a reply, ignoring code fences and surrounding prose"""
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("no JSON object in response")
+    value, _ = json.JSONDecoder().raw_decode(text, start)
+    return value
+
+
+class ResponseError(ValueError):
+    """A reply that cannot be ingested; `reason` is its rejection reason"""
+
+    def __init__(self, reason: str, message: str, detail: Any):
+        super().__init__(message)
+        self.reason = reason
+        self.detail = detail
+
+
+def response_entries(text: str) -> List[Any]:
+    """The reply's translations_to_improve list, or ResponseError"""
+    try:
+        payload = parse_response(text)
+    except ValueError as e:
+        raise ResponseError("invalid_json", str(e), str(e)) from None
+    entries = payload.get("translations_to_improve") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        raise ResponseError("invalid_schema", "no translations_to_improve list", payload)
+    return entries
+
+
+def ingest(chunk: ReviewChunk, data: Dict, ingestion: Ingestion):
+    """Validate one chunk's response and collect its acceptable suggestions"""
+    try:
+        entries = response_entries(chunk.response)
+    except ResponseError as e:
+        detail = f"{chunk.locale} part {chunk.part}: {e}" if e.reason == "invalid_json" else e.detail
+        ingestion.reject(e.reason, detail)
+        return
+
+    by_english: Dict[str, ReviewItem] = {}
+    for item in chunk.items:
+        for key in (item.english, *item.aliases):
+            by_english[key] = item
+    strings = data.get('strings', {})
+    ingestion.reviewed.extend((chunk.locale, item) for item in chunk.items)
+
+    for entry in entries:
+        if not isinstance(entry, dict) or not all(isinstance(entry.get(f), str) for f in REQUIRED_FIELDS):
+            ingestion.reject("invalid_entry", entry)
+            continue
+        item = by_english.get(entry["english"])
+        if item is None:
+            ingestion.reject("unknown_string", entry)
+            continue
+        suggested = entry["suggested_improvement"].strip()
+        if entry["current_translation"] != item.translation:
+            # The reviewer raised an issue but mis-quoted the text: keep it for a human
+            ingestion.reject("stale_translation", entry)
+            ingestion.flagged.add((chunk.locale, item.english))
+            continue
+        if not suggested or suggested == item.translation:
+            ingestion.reject("no_change", entry)
+            continue
+        english = english_value(item.english, strings.get(item.english, {}))
+        if sorted(placeholders(suggested)) != sorted(placeholders(english)):
+            ingestion.reject("placeholder_mismatch", entry)
+            ingestion.flagged.add((chunk.locale, item.english))
+            continue
+        ingestion.accepted.append(Suggestion(chunk.locale, (item.english, *item.aliases), item.translation,
+                                             suggested, entry["issue"], entry["reasoning"]))
+
+
+def apply_suggestions(data: Dict, suggestions: Sequence[Suggestion]) -> Tuple[int, int]:
+    """
+    Write accepted suggestions into the catalog data in memory. The first
+    suggestion for a (key, locale) wins; later ones count as conflicts.
+    Returns (translations updated, conflicts).
+    """
+    strings = data.get('strings', {})
+    done = set()
+    updated = conflicts = 0
+    for suggestion in suggestions:
+        for key in suggestion.keys:
+            unit = strings.get(key, {}).get('localizations', {}).get(suggestion.locale, {}).get('stringUnit')
+            if unit is None or unit.get('value') != suggestion.current:
+                continue
+            if (key, suggestion.locale) in done:
+                conflicts += 1
+                continue
+            done.add((key, suggestion.locale))
+            unit['value'] = suggestion.suggested
+            unit['state'] = REVIEWED_STATE
+            updated += 1
+    return updated, conflicts
+
+
+def record_reviews(ledger: ReviewLedger, data: Dict, ingestion: Ingestion, source: str) -> Counter:
+    """
+    Record a verdict for every reviewed translation as it now stands in the
+    catalog: 'revised' where a suggestion was applied, 'flagged' where the
+    reviewer raised an issue that was not applied, 'ok' otherwise.
+    """
+    strings = data.get('strings', {})
+    suggested = {(s.locale, key): s.suggested for s in ingestion.accepted for key in s.keys}
+    verdicts = Counter()
+    for locale, item in ingestion.reviewed:
+        for key in (item.english, *item.aliases):
+            unit = strings.get(key, {}).get('localizations', {}).get(locale, {}).get('stringUnit', {})
+            current = unit.get('value')
+            if not current:
+                continue
+            if (locale, key) in suggested:
+                verdict = "revised" if current == suggested[(locale, key)] else "flagged"
+            elif (locale, item.english) in ingestion.flagged:
+                verdict = "flagged"
+            else:
+                verdict = "ok"
+            ledger.record(key, locale, current, verdict, source)
+            verdicts[verdict] += 1
+    return verdicts
+
+
+# MARK: - CLI
+
+def main():
+    parser = argparse.ArgumentParser(description="Review translations with an AI model, concurrently and cached")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--locale', action='append', help="Locales to review (default: all with cultural context)")
+    parser.add_argument('--provider', choices=list(PROVIDERS), default="anthropic")
+    parser.add_argument('--endpoint', help="Override the provider URL (local: OpenAI-compatible base URL)")
+    parser.add_argument('--model', help="Override the provider's default model")
+    parser.add_argument('--concurrency', type=int, default=4, help="Requests in flight")
+    parser.add_argument('--rate', type=float, default=50.0, help="Requests started per minute")
+    parser.add_argument('--max-prompt-tokens', type=int, default=DEFAULT_PROMPT_TOKENS)
+    parser.add_argument('--top', type=int, default=0, help="Only review the N riskiest strings per locale")
+    parser.add_argument('--cache-dir', type=Path, default=DEFAULT_CACHE)
+    parser.add_argument('--report', type=Path, help="Write accepted and rejected suggestions as JSON")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Validate suggestions without writing the catalog or the ledger")
+    parser.add_argument('--ledger', type=Path, default=DEFAULT_LEDGER,
+                        help="Review ledger; translations it has a verdict for are skipped")
+    parser.add_argument('--all', action='store_true', help="Review already-reviewed translations again")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+    try:
+        endpoint = make_endpoint(args.provider, args.endpoint, args.model)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print("🤖 AI Cultural Translation Review")
+    print("=" * 70)
+    data = load_translations(args.catalog)
+    present = {locale for entry in data.get('strings', {}).values() for locale in entry.get('localizations', {})}
+    locales = [l for l in (args.locale or CULTURAL_CONTEXTS) if l in present and l != 'en']
+    scores = load_scores(args.catalog, data=data, locales=locales)
+    try:
+        ledger = ReviewLedger.load(args.ledger)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    chunks = build_chunks(data, locales, args.max_prompt_tokens, args.top, scores,
+                          None if args.all else ledger)
+    cache = ResponseCache(args.cache_dir)
+    print(f"📝 {len(chunks)} prompts for {len(locales)} locales → {endpoint.kind} ({endpoint.model})")
+
+    start = time.perf_counter()
+    asyncio.run(review_all(chunks, endpoint, cache, args.concurrency, args.rate))
+    elapsed = time.perf_counter() - start
+    cached = sum(c.cached for c in chunks)
+    failed = [c for c in chunks if c.error]
+    print(f"⏱  {len(chunks) - cached - len(failed)} requests, {cached} cached, {len(failed)} failed "
+          f"in {elapsed:.1f}s")
+    for chunk in failed:
+        print(f"   ⚠️  {chunk.locale} part {chunk.part}: {chunk.error}")
+
+    ingestion = Ingestion()
+    for chunk in chunks:
+        if chunk.response is not None:
+            ingest(chunk, data, ingestion)
+    updated, conflicts = apply_suggestions(data, ingestion.accepted)
+
+    print(f"\n✅ Accepted {len(ingestion.accepted)} suggestions → {updated} translations updated"
+          + (f", {conflicts} conflicting duplicates skipped" if conflicts else ""))
+    for reason, count in ingestion.rejected.most_common():
+        print(f"   ❌ {reason:20} {count}")
+    for locale, count in sorted(Counter(s.locale for s in ingestion.accepted).items()):
+        print(f"   {locale:8} {count}")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({
+                "accepted": [s.__dict__ for s in ingestion.accepted],
+                "rejected": dict(ingestion.rejected),
+                "rejected_examples": ingestion.examples,
+                "failed": [{"locale": c.locale, "part": c.part, "error": c.error} for c in failed],
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Report saved to: {args.report}")
+
+    if updated and not args.dry_run:
+        save_translations(args.catalog, data)
+        print(f"💾 Catalog updated: {args.catalog}")
+    elif updated:
+        print("🔍 Dry run: catalog not written")
+
+    if not args.dry_run and ingestion.reviewed:
+        verdicts = record_reviews(ledger, data, ingestion, f"{endpoint.kind}:{endpoint.model}")
+        ledger.save()
+        print(f"📒 Ledger: " + ", ".join(f"{v} {n}" for v, n in sorted(verdicts.items()))
+              + f" → {ledger.path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
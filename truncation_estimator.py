@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+UI Truncation Estimator
+Estimates the rendered width of every translation from font metrics and flags
+the ones much wider than their English, i.e. likely to truncate in buttons and
+labels sized for English
+
+- widths are the sum of per-glyph advances read from the fonts with Pillow;
+  each character is measured once and cached, so the whole catalog (every
+  key in every locale) is a dictionary lookup per character, not a render
+- fonts form a fallback chain (like the system's): each character is
+  measured in the first font that has a glyph for it, so CJK, Arabic and
+  Devanagari get real metrics when such a font is available
+- format specifiers are replaced by the same sample text on both sides
+  (%@ -> "Xxxxxx", %d -> "00"); multi-line strings count their widest line
+- kerning and complex-script shaping are ignored; for Latin text the
+  advance sum is within a few percent of the laid-out width
+- without Pillow (or without any usable font) widths fall back to an em
+  estimate: 1 em for East Asian wide characters, 0.55 em otherwise
+
+A translation is flagged when its width exceeds factor x the English width;
+English narrower than --min-width ems counts as --min-width, so "OK" ->
+"Aceptar" is flagged without every 1-letter key dominating the report.
+
+Usage:
+    python3 truncation_estimator.py                          # all locales, factor 1.3
+    python3 truncation_estimator.py --locale de --locale fi --factor 1.5
+    python3 truncation_estimator.py --font /Library/Fonts/SF-Pro-Text-Regular.otf --json widths.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT / "Scripts"))
+
+from xcstrings_catalog import DEFAULT_CATALOG, english_value  # noqa: E402
+
+# Pillow is optional; widths fall back to the em estimate
+try:
+    from PIL import ImageFont
+except ImportError:
+    ImageFont = None
+
+DEFAULT_FACTOR = 1.3
+DEFAULT_MIN_WIDTH = 3.0   # ems
+DEFAULT_POINT_SIZE = 17   # iOS body text
+# Fonts are measured at this size and scaled; large enough that advances are not rounded
+METRIC_SIZE = 1000
+
+# First existing fonts form the fallback chain: UI Latin first, then wide scripts
+FONT_CANDIDATES = (
+    "/System/Library/Fonts/SFNS.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "/System/Library/Fonts/Hiragino Sans GB.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/System/Library/Fonts/Supplemental/Devanagari Sangam MN.ttc",
+    "/System/Library/Fonts/Supplemental/GeezaPro.ttc",
+    "/System/Library/Fonts/Supplemental/Thonburi.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansDevanagari-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansThai-Regular.ttf",
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/msyh.ttc",
+)
+
+_SPECIFIER = re.compile(r"%(?:\d+\$)?[-+ #0']*\d*(?:\.\d+)?(?:hh|h|ll|l|q|z|t|j|L)?([@dDiuUxXoOfFeEgGcCsSpaA%])")
+_SAMPLES = {'@': "Xxxxxx", 's': "Xxxxxx", 'S': "Xxxxxx", 'c': "X", 'C': "X", '%': "%"}
+# A private-use character no font maps; its glyph is the font's .notdef box
+_UNMAPPED = "\U0010FFFD"
+
+
+class WidthResult(NamedTuple):
+    key: str
+    locale: str
+    english: str
+    translation: str
+    english_width: float   # points at --size
+    width: float
+    ratio: float
+
+
+def sample_text(text: str) -> str:
+    """Replace format specifiers with representative sample text"""
+    return _SPECIFIER.sub(lambda m: _SAMPLES.get(m.group(1), "00"), text)
+
+
+class GlyphWidths(dict):
+    """
+    Advance width in ems per character, measured on first use and cached.
+    `fonts` is the fallback chain; with no fonts every width is the em estimate.
+    """
+
+    def __init__(self, fonts: Sequence = ()):
+        super().__init__()
+        self.fonts = list(fonts)
+        self._small = [ImageFont.truetype(f.path, 32, index=f.index) for f in self.fonts] if self.fonts else []
+        self._notdef = [self._mask(font, _UNMAPPED) for font in self._small]
+
+    @staticmethod
+    def _mask(font, char: str) -> tuple:
+        mask = font.getmask(char)
+        return mask.size, bytes(mask)
+
+    @staticmethod
+    def estimate(char: str) -> float:
+        if unicodedata.combining(char) or unicodedata.category(char) == 'Cf':
+            return 0.0
+        return 1.0 if unicodedata.east_asian_width(char) in ('W', 'F') else 0.55
+
+    def __missing__(self, char: str) -> float:
+        width = None
+        for font, small, notdef in zip(self.fonts, self._small, self._notdef):
+            if char.isspace() or self._mask(small, char) != notdef:
+                width = font.getlength(char) / METRIC_SIZE
+                break
+        if width is None:
+            width = self.estimate(char)
+        self[char] = width
+        return width
+
+    def width(self, text: str) -> float:
+        """Width in ems of the widest line"""
+        return max(sum(map(self.__getitem__, line)) for line in text.split("\n"))
+
+
+def load_fonts(paths: Sequence[Path] = ()) -> list:
+    """The font chain: given paths, else every FONT_CANDIDATES entry that exists"""
+    if ImageFont is None:
+        return []
+    fonts = []
+    for path in (paths or [Path(p) for p in FONT_CANDIDATES]):
+        if not Path(path).exists():
+            if paths:
+                print(f"⚠️  Font not found: {path}")
+            continue
+        try:
+            fonts.append(ImageFont.truetype(str(path), METRIC_SIZE))
+        except OSError as e:
+            print(f"⚠️  Cannot load {path}: {e}")
+    return fonts
+
+
+def measure_catalog(data: Dict, glyphs: GlyphWidths, locales: Optional[Sequence[str]] = None,
+                    point_size: float = DEFAULT_POINT_SIZE,
+                    min_width: float = DEFAULT_MIN_WIDTH) -> Dict[str, List[WidthResult]]:
+    """
+    Width of every translation against its English, per locale, widest ratio
+    first. `ratio` divides by the English width floored at `min_width` ems.
+    """
+    wanted = set(locales) if locales else None
+    results: Dict[str, List[WidthResult]] = {}
+    for key, entry in data.get('strings', {}).items():
+        english = english_value(key, entry)
+        english_width = None
+        for locale, localization in entry.get('localizations', {}).items():
+            if locale == 'en' or (wanted is not None and locale not in wanted):
+                continue
+            translation = localization.get('stringUnit', {}).get('value', '')
+            if not translation:
+                continue
+            if english_width is None:
+                english_width = glyphs.width(sample_text(english))
+            width = glyphs.width(sample_text(translation))
+            results.setdefault(locale, []).append(WidthResult(
+                key, locale, english, translation, round(english_width * point_size, 1),
+                round(width * point_size, 1), round(width / max(english_width, min_width), 3)))
+    for rows in results.values():
+        rows.sort(key=lambda r: -r.ratio)
+    return results
+
+
+def flagged(rows: Sequence[WidthResult], factor: float = DEFAULT_FACTOR) -> List[WidthResult]:
+    return [r for r in rows if r.ratio > factor]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag translations likely to truncate in UI sized for English")
+    parser.add_argument('--catalog', type=Path, default=DEFAULT_CATALOG)
+    parser.add_argument('--locale', action='append', help="Only measure these locales (repeatable)")
+    parser.add_argument('--font', type=Path, action='append', default=[],
+                        help="Font file for the fallback chain, in order (repeatable; default: system fonts)")
+    parser.add_argument('--factor', type=float, default=DEFAULT_FACTOR,
+                        help="Flag translations wider than FACTOR x the English")
+    parser.add_argument('--min-width', type=float, default=DEFAULT_MIN_WIDTH,
+                        help="English narrower than this many ems counts as this wide")
+    parser.add_argument('--size', type=float, default=DEFAULT_POINT_SIZE, help="Point size for reported widths")
+    parser.add_argument('--top', type=int, default=10, help="Flagged strings shown per locale")
+    parser.add_argument('--json', type=Path, help="Write every flagged string as JSON")
+    args = parser.parse_args()
+
+    if not args.catalog.exists():
+        print(f"❌ File not found: {args.catalog}")
+        return 1
+    if ImageFont is None:
+        print("⚠️  Pillow not installed; using the em estimate. Install: pip install Pillow")
+    fonts = load_fonts(args.font)
+    if ImageFont is not None and not fonts:
+        print("⚠️  No usable fonts found; using the em estimate (pass --font)")
+
+    start = time.perf_counter()
+    with open(args.catalog, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    glyphs = GlyphWidths(fonts)
+    results = measure_catalog(data, glyphs, args.locale, args.size, args.min_width)
+    elapsed = time.perf_counter() - start
+
+    measured = sum(len(rows) for rows in results.values())
+    print(f"📏 UI truncation estimate: {measured:,} translations in {len(results)} locales "
+          f"({elapsed:.2f}s, {len(glyphs):,} glyphs cached)")
+    for font in fonts:
+        print(f"   font: {Path(font.path).name}")
+    print(f"   flagging width > {args.factor:g}x English (English floored at {args.min_width:g} em)")
+    print("=" * 70)
+
+    report = {}
+    for locale in sorted(results):
+        rows = flagged(results[locale], args.factor)
+        report[locale] = [r._asdict() for r in rows]
+        print(f"\n{locale}: {len(rows)} of {len(results[locale])} flagged")
+        for r in rows[:args.top]:
+            print(f"  {r.ratio:5.2f}x  {r.english_width:6.1f} → {r.width:6.1f} pt  "
+                  f"{r.english[:30]!r:34} → {r.translation[:30]!r}")
+
+    total = sum(len(rows) for rows in report.values())
+    print(f"\n🎯 {total:,} translations wider than {args.factor:g}x their English")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Saved to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())